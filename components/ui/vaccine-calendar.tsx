@@ -5,6 +5,7 @@ import { Button } from "@/components/ui/button"
 import { Dialog, DialogContent, DialogHeader, DialogTitle } from "@/components/ui/dialog"
 import { ChevronLeft, ChevronRight } from "lucide-react"
 import { cn } from "@/lib/utils"
+import { historicoService } from "@/services/api"
 
 interface HistoricoVacinal {
   id: number
@@ -27,20 +28,15 @@ export function VaccineCalendar({ usuarioId }: { usuarioId: number }) {
   useEffect(() => {
     async function fetchHistorico() {
       try {
-        const res = await fetch(`http://localhost:8000/usuarios/${usuarioId}/historico`)
-        if (!res.ok) {
-          console.error("Erro ao buscar histórico:", res.status)
-          return
-        }
-
-        const data = await res.json()
+        // Mesmo serviço do resto do app: respeita NEXT_PUBLIC_MAIN_API_BASE_URL
+        const data: unknown = await historicoService.listarPorUsuario(usuarioId)
         console.log("📦 Dados recebidos do backend:", data)
 
         // Garante que historico sempre seja array
         if (Array.isArray(data)) {
-          setHistorico(data)
+          setHistorico(data as HistoricoVacinal[])
         } else if (data) {
-          setHistorico([data])
+          setHistorico([data as HistoricoVacinal])
         } else {
           setHistorico([])
         }
@@ -1,7 +1,21 @@
 import type { NextConfig } from "next";
 
+// Build dos testes E2E (tests/selenium/utils/frontend.py): só ele liga o
+// diretório próprio e o proxy da API (proxy.ts). Um `next build` normal
+// sai igual a antes.
+const e2eBuild = process.env.E2E_BUILD === "1";
+
 const nextConfig: NextConfig = {
   /* config options here */
+  ...(e2eBuild
+    ? {
+        distDir: process.env.NEXT_DIST_DIR || ".next",
+        // O proxy.ts repassa a API com a barra final intacta (as rotas do mock terminam em "/")
+        skipTrailingSlashRedirect: true,
+        // Fixado no build: um deploy com E2E_API_URL no ambiente não liga o proxy
+        env: { E2E_PROXY: "1" },
+      }
+    : {}),
 };
 
 export default nextConfig;
@@ -0,0 +1,21 @@
+import { NextResponse, type NextRequest } from "next/server";
+
+// Testes E2E (tests/selenium/utils/frontend.py): o build gerenciado chama a
+// API em /__e2e_api e o `next start` repassa para o mock em E2E_API_URL, lida
+// em tempo de execução. Assim o mesmo build serve para o mock em qualquer porta.
+// E2E_PROXY vem do next.config.ts e é fixado no build: fora do build E2E
+// (E2E_BUILD=1) o proxy não repassa nada, mesmo com E2E_API_URL definido.
+const E2E_API_PREFIX = "/__e2e_api";
+
+export function proxy(request: NextRequest) {
+  const target = process.env.E2E_API_URL;
+  if (process.env.E2E_PROXY !== "1" || !target) {
+    return NextResponse.next();
+  }
+  const path = request.nextUrl.pathname.slice(E2E_API_PREFIX.length);
+  return NextResponse.rewrite(new URL(`${target}${path}${request.nextUrl.search}`));
+}
+
+export const config = {
+  matcher: "/__e2e_api/:path*",
+};
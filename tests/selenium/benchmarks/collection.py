@@ -0,0 +1,123 @@
+"""
+Benchmark: tempo de import e coleta da suíte.
+
+Roda ``python -X importtime -m pytest --collect-only`` algumas vezes e
+mostra o tempo de parede da coleta e os módulos que mais pesam no
+import (tempo cumulativo dos pacotes de topo e próprio dos módulos).
+Com ``--ref`` mede também outra revisão do git (num worktree
+temporário), para comparar antes/depois.
+
+Uso (a partir de tests/selenium):
+    python -m benchmarks.collection --runs 5
+    python -m benchmarks.collection --ref HEAD~1
+"""
+
+import argparse
+import os
+import re
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from pathlib import Path
+
+from config.settings import SUITE_DIR
+
+IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)")
+
+
+def collect_once(suite_dir):
+    """Uma coleta. Retorna (segundos, linhas do -X importtime)."""
+    command = [sys.executable, "-X", "importtime", "-m", "pytest",
+               "--collect-only", "-q", "-p", "no:cacheprovider"]
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE="1")
+    start = time.perf_counter()
+    result = subprocess.run(command, cwd=suite_dir, env=env, capture_output=True, text=True)
+    elapsed = time.perf_counter() - start
+    if result.returncode != 0:
+        raise RuntimeError(f"coleta falhou em {suite_dir}:\n{result.stdout[-2000:]}")
+    return elapsed, result.stderr.splitlines()
+
+
+def parse_importtime(lines):
+    """Tempo próprio por módulo e cumulativo por pacote de topo (ms)."""
+    self_ms = {}
+    top_level_ms = defaultdict(float)
+    for line in lines:
+        match = IMPORTTIME_LINE.match(line)
+        if not match:
+            continue
+        own, cumulative, indent, module = match.groups()
+        self_ms[module] = int(own) / 1000
+        # Nível 1 de indentação = import feito direto pela suíte/pytest
+        if len(indent) == 1:
+            top_level_ms[module.split(".")[0]] += int(cumulative) / 1000
+    return self_ms, dict(top_level_ms)
+
+
+def measure(suite_dir, runs):
+    timings = []
+    last_lines = []
+    for _ in range(runs):
+        elapsed, last_lines = collect_once(suite_dir)
+        timings.append(elapsed)
+    self_ms, top_level_ms = parse_importtime(last_lines)
+    return timings, self_ms, top_level_ms
+
+
+def checkout(ref, target):
+    subprocess.run(["git", "worktree", "add", "--detach", str(target), ref],
+                   cwd=SUITE_DIR, check=True, capture_output=True)
+    return target / SUITE_DIR.relative_to(git_root())
+
+
+def git_root():
+    out = subprocess.run(["git", "rev-parse", "--show-toplevel"], cwd=SUITE_DIR,
+                         check=True, capture_output=True, text=True).stdout.strip()
+    return Path(out)
+
+
+def report(label, timings, self_ms, top_level_ms, top):
+    print(f"\n⏱️  {label}: coleta mediana {statistics.median(timings):.3f}s "
+          f"(mín {min(timings):.3f}s, {len(timings)} execuções)")
+    print(f"   {'pacote (cumulativo)':<34}{'ms':>8}")
+    for name, ms in sorted(top_level_ms.items(), key=lambda kv: -kv[1])[:top]:
+        print(f"   {name:<34}{ms:>8.1f}")
+    print(f"   {'módulo (próprio)':<34}{'ms':>8}")
+    for name, ms in sorted(self_ms.items(), key=lambda kv: -kv[1])[:top]:
+        print(f"   {name:<34}{ms:>8.1f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="Coletas por revisão")
+    parser.add_argument("--top", type=int, default=12, help="Quantos módulos listar")
+    parser.add_argument("--ref", help="Revisão do git para comparar (ex.: HEAD~1)")
+    args = parser.parse_args(argv)
+
+    results = [("atual", measure(SUITE_DIR, args.runs))]
+
+    if args.ref:
+        tmp = Path(tempfile.mkdtemp(prefix="collect-bench-"))
+        worktree = tmp / "tree"
+        try:
+            results.insert(0, (args.ref, measure(checkout(args.ref, worktree), args.runs)))
+        finally:
+            subprocess.run(["git", "worktree", "remove", "--force", str(worktree)],
+                           cwd=SUITE_DIR, capture_output=True)
+            shutil.rmtree(tmp, ignore_errors=True)
+
+    for label, (timings, self_ms, top_level_ms) in results:
+        report(label, timings, self_ms, top_level_ms, args.top)
+
+    if len(results) == 2:
+        before = statistics.median(results[0][1][0])
+        after = statistics.median(results[1][1][0])
+        print(f"\n📉 {args.ref} → atual: {before:.3f}s → {after:.3f}s ({(1 - after / before) * 100:+.0f}%)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""
+Benchmark: folga de concorrência do mock, Flask threaded contra ASGI.
+
+Abre N conexões simultâneas (como vários browsers em paralelo, cada um
+com suas conexões keep-alive) e cada uma faz requisições em sequência
+nas rotas do dashboard durante ``--duration`` segundos. Mede vazão,
+p50/p95/p99 e erros (conexão recusada, reset, timeout) por nível de
+concorrência. Com ``--latency`` o mock segura cada resposta por esse
+tempo (perfil de falhas), como um backend real: é aí que uma thread por
+conexão pesa.
+
+O cliente é asyncio puro (HTTP/1.1 cru) para não virar o gargalo.
+
+Uso (a partir de tests/selenium):
+    python -m benchmarks.mock_concurrency --concurrency 50 200 500 --latency 0.05
+"""
+
+import argparse
+import asyncio
+import time
+
+from mock_api.control import MockControl
+from mock_api.server import create_server
+from utils.metrics import percentile
+
+ROUTES = [
+    "/vacinas/",
+    "/usuarios/1",
+    "/usuarios/1/historico/",
+    "/usuarios/1/historico/estatisticas",
+]
+
+REQUEST_TIMEOUT = 10
+
+
+async def read_response(reader):
+    """Lê uma resposta com Content-Length. Retorna (status, keep-alive).
+
+    O werkzeug responde em HTTP/1.0 e fecha a conexão: aí o cliente
+    reconecta, como o browser faria.
+    """
+    head = await reader.readuntil(b"\r\n\r\n")
+    lines = head.decode("latin-1").split("\r\n")
+    version, status = lines[0].split()[:2]
+    keep_alive = version == "HTTP/1.1"
+    length = 0
+    for line in lines[1:]:
+        name, _, value = line.partition(":")
+        name = name.lower()
+        if name == "content-length":
+            length = int(value)
+        elif name == "connection":
+            keep_alive = value.strip().lower() == "keep-alive"
+    if length:
+        await reader.readexactly(length)
+    return int(status), keep_alive
+
+
+async def connection(port, deadline, index, timings, errors):
+    """Uma conexão keep-alive fazendo requisições em sequência."""
+    reader = writer = None
+    i = index
+    while time.perf_counter() < deadline:
+        route = ROUTES[i % len(ROUTES)]
+        i += 1
+        start = time.perf_counter()
+        try:
+            if writer is None:
+                reader, writer = await asyncio.wait_for(
+                    asyncio.open_connection("127.0.0.1", port), REQUEST_TIMEOUT)
+            writer.write(f"GET {route} HTTP/1.1\r\nHost: localhost\r\n\r\n".encode())
+            status, keep_alive = await asyncio.wait_for(read_response(reader), REQUEST_TIMEOUT)
+            if status >= 500:
+                errors.append(f"HTTP {status}")
+            else:
+                timings.append((time.perf_counter() - start) * 1000)
+            if not keep_alive:
+                writer.close()
+                reader = writer = None
+        except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, ValueError, IndexError) as e:
+            errors.append(type(e).__name__)
+            if writer is not None:
+                writer.close()
+            reader = writer = None
+            await asyncio.sleep(0.05)
+    if writer is not None:
+        writer.close()
+
+
+async def run_level(port, concurrency, duration):
+    timings, errors = [], []
+    deadline = time.perf_counter() + duration
+    await asyncio.gather(*(
+        connection(port, deadline, i, timings, errors) for i in range(concurrency)
+    ))
+    return timings, errors
+
+
+def measure(server_name, concurrency, duration, latency):
+    server = create_server("thread", server=server_name)
+    base_url = server.start()
+    control = MockControl(base_url)
+    try:
+        if latency:
+            control.set_faults({"routes": {"*": {"latency": {"type": "fixed", "value": latency}}}})
+        port = int(base_url.rsplit(":", 1)[1])
+        timings, errors = asyncio.run(run_level(port, concurrency, duration))
+    finally:
+        control.close()
+        server.stop()
+    return timings, errors
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[50, 200, 500],
+                        help="Conexões simultâneas (um ou mais níveis)")
+    parser.add_argument("--duration", type=float, default=5.0, help="Segundos por nível")
+    parser.add_argument("--latency", type=float, default=0.05,
+                        help="Latência injetada em cada resposta (s); 0 desliga")
+    parser.add_argument("--servers", nargs="+", default=["flask", "asgi"], choices=["flask", "asgi"])
+    args = parser.parse_args(argv)
+
+    print(f"{'servidor':<10}{'conexões':>10}{'req/s':>10}{'p50 (ms)':>10}{'p95 (ms)':>10}"
+          f"{'p99 (ms)':>10}{'erros':>8}")
+    for concurrency in args.concurrency:
+        for server_name in args.servers:
+            timings, errors = measure(server_name, concurrency, args.duration, args.latency)
+            if timings:
+                print(f"{server_name:<10}{concurrency:>10}{len(timings) / args.duration:>10.0f}"
+                      f"{percentile(timings, 50):>10.1f}{percentile(timings, 95):>10.1f}"
+                      f"{percentile(timings, 99):>10.1f}{len(errors):>8}")
+            else:
+                print(f"{server_name:<10}{concurrency:>10}{0:>10}{'-':>10}{'-':>10}{'-':>10}{len(errors):>8}")
+
+
+if __name__ == "__main__":
+    main()
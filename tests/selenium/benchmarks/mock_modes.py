@@ -0,0 +1,99 @@
+"""
+Benchmark: latência da API vista pelo browser em cada modo do mock.
+
+Para cada modo (thread, processo, processo com N workers) sobe o mock,
+abre um Chrome headless e faz ``fetch`` em sequência nas rotas usadas
+pelo dashboard, medindo com ``performance.now()`` dentro do browser.
+Enquanto isso uma thread do próprio processo simula o trabalho do
+runner (serialização de JSON, como o cliente do Selenium e o pytest
+fazem), que é justamente o que disputa o GIL com o mock em modo thread.
+
+Uso (a partir de tests/selenium):
+    python -m benchmarks.mock_modes --requests 300 --workers 4
+"""
+
+import argparse
+import json
+import threading
+
+from mock_api.server import create_server
+from utils.browser import create_driver
+from utils.metrics import percentile
+
+ROUTES = [
+    "/vacinas/",
+    "/usuarios/1",
+    "/usuarios/1/historico/",
+    "/usuarios/1/historico/estatisticas",
+]
+
+FETCH_SCRIPT = """
+const [baseUrl, routes, total, done] = [arguments[0], arguments[1], arguments[2], arguments[arguments.length - 1]];
+(async () => {
+    const timings = [];
+    for (let i = 0; i < total; i++) {
+        const start = performance.now();
+        const response = await fetch(baseUrl + routes[i % routes.length]);
+        await response.text();
+        timings.push(performance.now() - start);
+    }
+    done(timings);
+})().catch(e => done({error: String(e)}));
+"""
+
+
+def runner_load(stop):
+    """Simula o trabalho de CPU do processo do pytest."""
+    payload = {"value": [{"id": i, "text": "x" * 50} for i in range(200)]}
+    while not stop.is_set():
+        json.loads(json.dumps(payload))
+
+
+def measure(driver, mode, workers, total, with_load):
+    server = create_server(mode, workers=workers)
+    base_url = server.start()
+    stop = threading.Event()
+    load_thread = threading.Thread(target=runner_load, args=(stop,), daemon=True)
+    if with_load:
+        load_thread.start()
+    try:
+        driver.set_script_timeout(300)
+        # Aquecimento (conexões, JIT do browser)
+        driver.execute_async_script(FETCH_SCRIPT, base_url, ROUTES, 20)
+        timings = driver.execute_async_script(FETCH_SCRIPT, base_url, ROUTES, total)
+    finally:
+        stop.set()
+        server.stop()
+
+    if isinstance(timings, dict):
+        raise RuntimeError(f"fetch falhou no browser: {timings['error']}")
+    return timings
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=300, help="Requisições por modo")
+    parser.add_argument("--workers", type=int, default=4, help="Workers do modo processo com pre-fork")
+    parser.add_argument("--no-runner-load", action="store_true", help="Não simula a carga do runner")
+    args = parser.parse_args(argv)
+
+    modes = [
+        ("thread", 1),
+        ("process", 1),
+        ("process", args.workers),
+    ]
+
+    driver = create_driver(headless=True)
+    driver.get("about:blank")
+    try:
+        print(f"{'modo':<14}{'workers':>8}{'p50 (ms)':>10}{'p95 (ms)':>10}{'p99 (ms)':>10}")
+        for mode, workers in modes:
+            timings = measure(driver, mode, workers, args.requests, not args.no_runner_load)
+            print(f"{mode:<14}{workers:>8}{percentile(timings, 50):>10.2f}"
+                  f"{percentile(timings, 95):>10.2f}{percentile(timings, 99):>10.2f}")
+    finally:
+        driver.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+"""
+Benchmark: requisições/segundo das rotas do mock, handlers antigos
+(``jsonify`` a cada requisição) contra a camada de respostas nova
+(pré-serialização, cache por versão, ETag/304 e gzip).
+
+Cenários por rota:
+- ``full``: GET simples, corpo completo;
+- ``gzip``: GET com ``Accept-Encoding: gzip``;
+- ``304``: GET com ``If-None-Match`` do ETag anterior (só na versão nova,
+  e só nas rotas grandes: corpos pequenos saem sem ETag).
+
+As duas versões rodam com os mesmos hooks de journal e falhas
+(``install_request_hooks``): a diferença medida é só a das respostas.
+
+Por padrão mede o WSGI direto (``test_client``), que isola o custo do
+handler; ``--http`` mede por HTTP de verdade com clientes em threads.
+
+Uso (a partir de tests/selenium):
+    python -m benchmarks.mock_responses --seconds 2 --historico 200
+"""
+
+import argparse
+import threading
+import time
+
+import requests
+from flask import Flask, jsonify
+from flask_cors import CORS
+from werkzeug.serving import make_server
+
+from mock_api.app import create_app, install_request_hooks
+from mock_api.server import quiet_werkzeug
+from mock_api.store import MockStore
+
+ROUTES = [
+    "/vacinas/",
+    "/usuarios/1",
+    "/usuarios/1/historico/",
+    "/usuarios/1/historico/estatisticas",
+]
+
+
+def legacy_app(store):
+    """As rotas de leitura como eram antes: ``jsonify`` de dicts novos."""
+    app = Flask(__name__)
+    CORS(app)
+    install_request_hooks(app, store)
+
+    @app.route('/usuarios/<int:user_id>', methods=['GET'])
+    def get_user(user_id):
+        return jsonify(store.get_user(user_id)), 200
+
+    @app.route('/vacinas/', methods=['GET'])
+    def list_vaccines():
+        return jsonify(store.list_vaccines()), 200
+
+    @app.route('/usuarios/<int:user_id>/historico/', methods=['GET'])
+    def list_historico(user_id):
+        return jsonify(store.list_historico(user_id)), 200
+
+    @app.route('/usuarios/<int:user_id>/historico/estatisticas', methods=['GET'])
+    def get_estatisticas(user_id):
+        return jsonify(store.estatisticas(user_id)), 200
+
+    return app
+
+
+def seeded_store(historico):
+    store = MockStore()
+    for i in range(historico):
+        store.create_historico(1, {
+            "vacina_id": 1 + i % 6,
+            "numero_dose": 1 + i % 3,
+            "status": "aplicada",
+            "data_aplicacao": "2024-01-15",
+            "lote": f"LOTE{i:05d}",
+            "local_aplicacao": "UBS Centro",
+            "profissional": "Enfermeira Maria",
+        })
+    return store
+
+
+def wsgi_rate(app, route, headers, seconds):
+    client = app.test_client()
+    count = 0
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        client.get(route, headers=headers)
+        count += 1
+    return count / seconds
+
+
+def http_rate(app, route, headers, seconds, clients):
+    quiet_werkzeug()
+    server = make_server('127.0.0.1', 0, app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_port}{route}"
+    counts = [0] * clients
+    deadline = time.perf_counter() + seconds
+
+    def client(index):
+        with requests.Session() as session:
+            while time.perf_counter() < deadline:
+                session.get(url, headers=headers)
+                counts[index] += 1
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(clients)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    server.shutdown()
+    return sum(counts) / seconds
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seconds", type=float, default=2.0, help="Duração de cada medição")
+    parser.add_argument("--historico", type=int, default=200, help="Registros de histórico do usuário 1")
+    parser.add_argument("--http", action="store_true", help="Mede por HTTP em vez de WSGI direto")
+    parser.add_argument("--clients", type=int, default=4, help="Clientes simultâneos no modo --http")
+    args = parser.parse_args(argv)
+
+    store = seeded_store(args.historico)
+    apps = {"antigo": legacy_app(store), "novo": create_app(store)}
+
+    def rate(app, route, headers):
+        if args.http:
+            return http_rate(app, route, headers, args.seconds, args.clients)
+        return wsgi_rate(app, route, headers, args.seconds)
+
+    def size(app, route, headers):
+        return len(app.test_client().get(route, headers=headers).data)
+
+    print(f"{'rota':<38}{'cenário':<8}{'antigo req/s':>14}{'novo req/s':>12}{'ganho':>8}"
+          f"{'antigo bytes':>14}{'novo bytes':>12}")
+    for route in ROUTES:
+        etag = apps["novo"].test_client().get(route).headers.get("ETag")
+        scenarios = [
+            ("full", {}, {}),
+            ("gzip", {"Accept-Encoding": "gzip"}, {"Accept-Encoding": "gzip"}),
+        ]
+        if etag:
+            # O handler antigo não tem ETag: revalidar custa um GET completo
+            scenarios.append(("304", {}, {"If-None-Match": etag}))
+        for name, old_headers, new_headers in scenarios:
+            old = rate(apps["antigo"], route, old_headers)
+            new = rate(apps["novo"], route, new_headers)
+            print(f"{route:<38}{name:<8}{old:>14.0f}{new:>12.0f}{new / old:>7.2f}x"
+                  f"{size(apps['antigo'], route, old_headers):>14}{size(apps['novo'], route, new_headers):>12}")
+
+
+if __name__ == "__main__":
+    main()
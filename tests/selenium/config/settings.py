@@ -1,62 +1,131 @@
-"""Configurações centralizadas para testes."""
+"""Configurações centralizadas para testes.
+
+Importar este módulo não lê arquivo nem cria diretório: cada valor é lido
+do ambiente (e dos ``.env``) no primeiro acesso e fica guardado na
+instância. Atribuir (``settings.FRONTEND_URL = ...``) continua valendo.
+"""
 
 import os
 from pathlib import Path
-from dotenv import load_dotenv
 
-# Carrega variáveis do .env.test
-env_path = Path('.') / '.env.test'
-load_dotenv(dotenv_path=env_path)
+SUITE_DIR = Path(__file__).resolve().parent.parent
+
+_env_loaded = False
+
+
+def load_env_files():
+    """Carrega .env.test (diretório atual) e .env da suíte, uma vez só."""
+    global _env_loaded
+    if _env_loaded:
+        return
+    _env_loaded = True
+    from dotenv import load_dotenv
+
+    # Sem override: o ambiente real vale mais, depois .env.test, depois .env
+    load_dotenv(dotenv_path=Path('.') / '.env.test')
+    load_dotenv(dotenv_path=SUITE_DIR / '.env')
+
+
+def as_bool(value):
+    return value.lower() == "true"
+
+
+class env:
+    """Setting lido do ambiente no primeiro acesso e guardado na instância.
+
+    ``default`` pode ser uma função que recebe o settings (para valores
+    que dependem de outro setting).
+    """
+
+    def __init__(self, default, cast=str):
+        self.default = default
+        self.cast = cast
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        load_env_files()
+        default = self.default(instance) if callable(self.default) else self.default
+        value = self.cast(os.getenv(self.name, default))
+        # Próximos acessos vão direto ao __dict__ (descriptor sem __set__)
+        instance.__dict__[self.name] = value
+        return value
 
 
 class Settings:
     """Configurações da aplicação de testes."""
     
     # URLs
-    FRONTEND_URL = os.getenv("FRONTEND_URL", "http://localhost:3000")
-    API_URL = os.getenv("API_URL", "http://localhost:8000")
-    BASE_URL = os.getenv("BASE_URL", "http://localhost:3000")
+    FRONTEND_URL = env("http://localhost:3000")
+    API_URL = env("http://localhost:8000")
+    BASE_URL = env("http://localhost:3000")
+    
+    # Frontend gerenciado pela suíte (build em cache + next start, utils/frontend.py)
+    FRONTEND_MANAGED = env("false", as_bool)
+    FRONTEND_DIR = env(str(SUITE_DIR.parents[1]), Path)
     
     # Browser
-    BROWSER = os.getenv("BROWSER", "chrome").lower()
-    HEADLESS = os.getenv("HEADLESS", "false").lower() == "true"
-    WINDOW_WIDTH = int(os.getenv("WINDOW_WIDTH", "1920"))
-    WINDOW_HEIGHT = int(os.getenv("WINDOW_HEIGHT", "1080"))
+    BROWSER = env("chrome", str.lower)
+    HEADLESS = env("false", as_bool)
+    WINDOW_WIDTH = env("1920", int)
+    WINDOW_HEIGHT = env("1080", int)
+    REUSE_BROWSER = env("false", as_bool)
+    # Um Chrome só, cada teste num browser context isolado (plugins/browser_contexts.py)
+    BROWSER_CONTEXTS = env("false", as_bool)
+    # Perfis de CPU/rede/tela para os testes com browser (plugins/device_profiles.py)
+    DEVICE_PROFILE = env("")
+    # Usa o daemon local (run_daemon.py) quando ele estiver rodando (fora do xdist)
+    USE_DAEMON = env("false", as_bool)
+    # Page objects guardam os elementos já encontrados (pages/base_page.py)
+    ELEMENT_CACHE = env("true", as_bool)
     
     # Timeouts
-    IMPLICIT_WAIT = int(os.getenv("IMPLICIT_WAIT", "10"))
-    EXPLICIT_WAIT = int(os.getenv("EXPLICIT_WAIT", "20"))
-    PAGE_LOAD_TIMEOUT = int(os.getenv("PAGE_LOAD_TIMEOUT", "30"))
+    IMPLICIT_WAIT = env("10", int)
+    EXPLICIT_WAIT = env("20", int)
+    PAGE_LOAD_TIMEOUT = env("30", int)
+    
+    # Reexecução de falhas transitórias (plugins/flaky.py)
+    FLAKY_RERUNS = env("0", int)
+    
+    # Mock do backend
+    MOCK_MODE = env("thread", str.lower)
+    MOCK_WORKERS = env("1", int)
+    MOCK_SERVER = env("flask", str.lower)  # flask | asgi
+    MOCK_SEED_FILE = env("")
+    # 0 = porta livre (o build do frontend gerenciado não depende dela)
+    MOCK_PORT = env("0", int)
     
     # Test User
-    TEST_USER_EMAIL = os.getenv("TEST_USER_EMAIL", "admin@teste.com")
-    TEST_USER_PASSWORD = os.getenv("TEST_USER_PASSWORD", "admin1")
-    TEST_USER_NAME = os.getenv("TEST_USER_NAME", "admin Teste")
+    TEST_USER_EMAIL = env("admin@teste.com")
+    TEST_USER_PASSWORD = env("admin1")
+    TEST_USER_NAME = env("admin Teste")
     
     # Features
-    SCREENSHOT_ON_FAILURE = os.getenv("SCREENSHOT_ON_FAILURE", "true").lower() == "true"
-    VIDEO_RECORDING = os.getenv("VIDEO_RECORDING", "false").lower() == "true"
-    SLOW_MO = int(os.getenv("SLOW_MO", "0"))
+    SCREENSHOT_ON_FAILURE = env("true", as_bool)
+    VIDEO_RECORDING = env("false", as_bool)
+    SLOW_MO = env("0", int)
     
     # Debug
-    DEBUG = os.getenv("DEBUG", "false").lower() == "true"
-    VERBOSE = os.getenv("VERBOSE", "false").lower() == "true"
+    DEBUG = env("false", as_bool)
+    VERBOSE = env("false", as_bool)
     
     # Paths
-    BASE_DIR = Path(__file__).resolve().parent.parent
-    REPORTS_DIR = Path(__file__).resolve().parent.parent / "reports"
+    BASE_DIR = SUITE_DIR
+    REPORTS_DIR = SUITE_DIR / "reports"
     SCREENSHOTS_DIR = REPORTS_DIR / "screenshots"
     VIDEOS_DIR = REPORTS_DIR / "videos"
+    DURATIONS_FILE = REPORTS_DIR / "durations.json"
     
-    @classmethod
-    def setup_directories(cls):
-        """Cria diretórios necessários."""
-        cls.REPORTS_DIR.mkdir(exist_ok=True)
-        cls.SCREENSHOTS_DIR.mkdir(exist_ok=True)
-        cls.VIDEOS_DIR.mkdir(exist_ok=True)
-        if cls.DEBUG:
-            print(f"[DEBUG] Diretórios configurados em {cls.REPORTS_DIR}")
+    def setup_directories(self):
+        """Cria diretórios necessários (chamado no pytest_configure)."""
+        self.REPORTS_DIR.mkdir(exist_ok=True)
+        self.SCREENSHOTS_DIR.mkdir(exist_ok=True)
+        self.VIDEOS_DIR.mkdir(exist_ok=True)
+        if self.DEBUG:
+            print(f"[DEBUG] Diretórios configurados em {self.REPORTS_DIR}")
 
 
-settings = Settings()
-settings.setup_directories()
\ No newline at end of file
+settings = Settings()
\ No newline at end of file
@@ -3,270 +3,360 @@ Configuração do Selenium + Mock do Backend.
 """
 
 import os
-import sys
 import pytest
 from datetime import datetime
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.common.exceptions import NoSuchElementException
-from selenium.webdriver.chrome.service import Service as ChromeService
-from selenium.webdriver.firefox.service import Service as FirefoxService
-from selenium.webdriver.chrome.options import Options as ChromeOptions
-from selenium.webdriver.firefox.options import Options as FirefoxOptions
-from webdriver_manager.chrome import ChromeDriverManager
-from webdriver_manager.firefox import GeckoDriverManager
-from config.settings import settings
-from dotenv import load_dotenv
-import threading
+import json
 import time
-import socket
-from flask import Flask, jsonify, request
-from flask_cors import CORS
+from config.settings import settings
+
+# Selenium, Flask/uvicorn (mock), requests e cia. são importados dentro das
+# fixtures que os usam: importar o conftest (e o --collect-only) fica leve.
+
+# Nome do snapshot restaurado ao fim de cada teste
+MOCK_BASELINE = "baseline"
 
-# Carregar variáveis de ambiente
-load_dotenv()
+# Plugins locais
+pytest_plugins = [
+    "plugins.durations",
+    "plugins.preflight",
+    "plugins.impact",
+    "plugins.flaky",
+    "plugins.webdriver_profile",
+    "plugins.browser_contexts",
+    "plugins.browser_resources",
+    "plugins.device_profiles",
+]
+
+
+def pytest_configure(config):
+    # Settings não mexe no disco ao ser importado
+    settings.setup_directories()
 
 # ============================================================================
 # MOCK BACKEND
 # ============================================================================
+# Rotas e estado ficam em mock_api/. MOCK_MODE=process roda o mock em outro
+# processo (MOCK_WORKERS > 1 faz pre-fork de vários workers).
 
-app = Flask(__name__)
-CORS(app)
-
-# Banco de dados em memória
-mock_db = {
-    "users": {},
-    "vaccines": [
-        {"id": 1, "nome": "Hepatite B", "doses": 3},
-        {"id": 2, "nome": "BCG", "doses": 1},
-        {"id": 3, "nome": "Tríplice Viral (Sarampo, Caxumba, Rubéola)", "doses": 2},
-        {"id": 4, "nome": "Febre Amarela", "doses": 1},
-        {"id": 5, "nome": "dT (Dupla Adulto)", "doses": 1},
-        {"id": 6, "nome": "Influenza (Gripe)", "doses": 1},
-    ],
-    "historico": {},
-    "next_user_id": 1,
-    "next_historico_id": 1
-}
-
-# Usuário padrão
-mock_db["users"][1] = {
-    "id": 1,
-    "nome": "Usuario Teste",
-    "email": "teste@example.com",
-    "senha": "senha123",
-    "is_admin": False
-}
-
-def find_free_port():
-    """Encontra uma porta livre."""
-    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-        s.bind(('', 0))
-        s.listen(1)
-        port = s.getsockname()[1]
-    return port
-
-@app.route('/usuarios/login', methods=['POST'])
-def login():
-    email = request.args.get('email')
-    senha = request.args.get('senha')
-    
-    for user in mock_db["users"].values():
-        if user["email"] == email and senha == "senha123":
-            return jsonify({
-                "id": user["id"],
-                "nome": user["nome"],
-                "email": user["email"],
-                "is_admin": user.get("is_admin", False)
-            }), 200
-    
-    return jsonify({"detail": "Email ou senha incorretos"}), 401
+@pytest.fixture(scope="session")
+def browser_daemon():
+    """Daemon local (run_daemon.py) com mock, frontend e browsers aquecidos, se estiver rodando.
 
-@app.route('/usuarios/', methods=['POST'])
-def create_user():
-    data = request.json
-    
-    for user in mock_db["users"].values():
-        if user["email"] == data["email"]:
-            return jsonify({"detail": f"Usuário com email '{data['email']}' já existe"}), 400
-    
-    user_id = mock_db["next_user_id"]
-    mock_db["next_user_id"] += 1
-    
-    new_user = {
-        "id": user_id,
-        "nome": data["nome"],
-        "email": data["email"],
-        "is_admin": False
-    }
-    mock_db["users"][user_id] = new_user
-    
-    return jsonify(new_user), 201
-
-@app.route('/usuarios/', methods=['GET'])
-def list_users():
-    return jsonify([
-        {"id": u["id"], "nome": u["nome"], "email": u["email"], "is_admin": u.get("is_admin", False)}
-        for u in mock_db["users"].values()
-    ]), 200
-
-@app.route('/usuarios/<int:user_id>', methods=['GET'])
-def get_user(user_id):
-    user = mock_db["users"].get(user_id)
-    if not user:
-        return jsonify({"detail": f"Usuário com ID {user_id} não encontrado"}), 404
-    return jsonify({
-        "id": user["id"],
-        "nome": user["nome"],
-        "email": user["email"],
-        "is_admin": user.get("is_admin", False)
-    }), 200
-
-@app.route('/vacinas/', methods=['GET'])
-def list_vaccines():
-    return jsonify(mock_db["vaccines"]), 200
-
-@app.route('/vacinas/<int:vaccine_id>', methods=['GET'])
-def get_vaccine(vaccine_id):
-    vaccine = next((v for v in mock_db["vaccines"] if v["id"] == vaccine_id), None)
-    if not vaccine:
-        return jsonify({"detail": f"Vacina com ID {vaccine_id} não encontrada"}), 404
-    return jsonify(vaccine), 200
-
-@app.route('/usuarios/<int:user_id>/historico/', methods=['GET'])
-def list_historico(user_id):
-    historico = mock_db["historico"].get(user_id, [])
-    return jsonify(historico), 200
-
-@app.route('/usuarios/<int:user_id>/historico/estatisticas', methods=['GET'])
-def get_estatisticas(user_id):
-    return jsonify({
-        "total_doses": 8,
-        "doses_aplicadas": 8,
-        "doses_pendentes": 2,
-        "doses_atrasadas": 0,
-        "doses_canceladas": 0,
-        "vacinas_completas": 3,
-        "vacinas_incompletas": 1,
-        "proximas_doses": []
-    }), 200
-
-@app.route('/usuarios/<int:user_id>/historico/', methods=['POST'])
-def create_historico(user_id):
-    data = request.json
-    
-    historico_id = mock_db["next_historico_id"]
-    mock_db["next_historico_id"] += 1
-    
-    new_registro = {
-        "id": historico_id,
-        "usuario_id": user_id,
-        "vacina_id": data["vacina_id"],
-        "vacina_nome": "Hepatite B",
-        "numero_dose": data["numero_dose"],
-        "status": data.get("status", "pendente"),
-        "data_aplicacao": data.get("data_aplicacao"),
-        "data_prevista": data.get("data_prevista"),
-        "lote": data.get("lote"),
-        "local_aplicacao": data.get("local_aplicacao"),
-        "profissional": data.get("profissional"),
-        "observacoes": data.get("observacoes")
-    }
-    
-    if user_id not in mock_db["historico"]:
-        mock_db["historico"][user_id] = []
-    
-    mock_db["historico"][user_id].append(new_registro)
-    
-    return jsonify(new_registro), 201
-
-def start_mock_server():
-    """Inicia servidor mock."""
-    port = int(os.getenv("MOCK_API_PORT", "8000"))
-    # Suprimir logs do Flask
-    import logging
-    log = logging.getLogger('werkzeug')
-    log.setLevel(logging.ERROR)
-    
-    app.run(host='0.0.0.0', port=port, debug=False, use_reloader=False, threaded=True)
+    Opcional (USE_DAEMON=true). O daemon tem um mock só, então ele fica de
+    fora com o xdist e quando outra execução do pytest já está usando ele:
+    o snapshot/restore de uma apagaria o estado dos testes da outra.
+    """
+    if not settings.USE_DAEMON or os.getenv("PYTEST_XDIST_WORKER"):
+        yield None
+        return
+    import fcntl
+    from utils.daemon import find_daemon
+
+    client = find_daemon()
+    if client is None:
+        yield None
+        return
+
+    settings.REPORTS_DIR.mkdir(parents=True, exist_ok=True)
+    with open(settings.REPORTS_DIR / "daemon.session.lock", "w") as lock:
+        try:
+            fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            print("\n⚠️  Daemon local ocupado por outra execução; usando mock e browsers próprios")
+            yield None
+            return
+        print(f"\n♻️  Usando o daemon local (pid {client.info['pid']})")
+        yield client
 
-# ============================================================================
-# FIXTURES DO SELENIUM
-# ============================================================================
 
 @pytest.fixture(scope="session", autouse=True)
-def mock_backend():
+def mock_backend(browser_daemon):
     """Inicia mock do backend (uma vez por sessão)."""
+    if browser_daemon is not None:
+        yield browser_daemon.info["mock_url"]
+        return
 
-    port = find_free_port()
-    base_url = f"http://localhost:{port}"
-    print(f"\n🚀 Mock backend iniciando em {base_url}...")
-    
-    def run_server():
-        try:
-            app.run(host='0.0.0.0', port=port, debug=False, 
-                   use_reloader=False, threaded=True)
-        except Exception as e:
-            print(f"❌ Erro no mock server: {e}")
-    
-    server_thread = threading.Thread(target=run_server, daemon=True)
-    server_thread.start()
-    time.sleep(2)  # Aguardar inicialização
+    from mock_api.server import create_server
+
+    port = settings.MOCK_PORT
+    if port:
+        # Cada worker do xdist com seu mock (gw0 → porta base, gw1 → +1...)
+        port += int(os.getenv("PYTEST_XDIST_WORKER", "gw0")[2:])
+    server = create_server(settings.MOCK_MODE, workers=settings.MOCK_WORKERS,
+                           server=settings.MOCK_SERVER, port=port,
+                           log_path=settings.REPORTS_DIR / "mock.log")
+    print(f"\n🚀 Mock backend iniciando (modo {settings.MOCK_MODE}, {settings.MOCK_SERVER})...")
+
+    try:
+        base_url = server.start()
+    except RuntimeError as e:
+        pytest.exit(f"❌ {e}", returncode=3)
     
-    print(f"✅ Mock backend rodando!")
+    print(f"✅ Mock backend rodando em {base_url}!")
     
     yield base_url
     
     print("\n🛑 Encerrando mock backend...")
+    server.stop()
 
 
-def get_browser_options(browser):
-    """Configura opções do browser."""
-    headless = os.getenv("HEADLESS", "false").lower() == "true"
-    
-    if browser == "chrome":
-        options = ChromeOptions()
-        options.add_argument("--no-sandbox")
-        options.add_argument("--disable-dev-shm-usage")
-        options.add_argument("--disable-gpu")
-        options.add_argument("--window-size=1920,1080")
-        options.add_argument("--disable-logging")
-        options.add_argument("--log-level=3")
-        options.add_experimental_option('excludeSwitches', ['enable-logging'])
-        return options
-    
-    elif browser == "firefox":
-        options = FirefoxOptions()
-        if headless:
-            options.add_argument("--headless")
-        options.add_argument("--width=1920")
-        options.add_argument("--height=1080")
-        return options
-    
-    else:
-        raise ValueError(f"Browser '{browser}' não suportado")
+@pytest.fixture(scope="session", autouse=True)
+def frontend(mock_backend, browser_daemon):
+    """
+    URL do frontend. Com FRONTEND_MANAGED=true a suíte builda (com cache),
+    sobe o next start apontando para o mock e aquece as rotas; senão usa
+    o FRONTEND_URL já em execução.
+    """
+    if browser_daemon is not None:
+        settings.FRONTEND_URL = settings.BASE_URL = browser_daemon.info["frontend_url"]
+        yield settings.FRONTEND_URL
+        return
+
+    if not settings.FRONTEND_MANAGED:
+        yield settings.FRONTEND_URL
+        return
+
+    from utils.frontend import ManagedFrontend
+
+    server = ManagedFrontend(
+        settings.FRONTEND_DIR,
+        api_url=mock_backend,
+        log_path=settings.REPORTS_DIR / "frontend.log",
+    )
+    print(f"\n🏗️  Frontend gerenciado (build {server.key})...")
+    start = time.perf_counter()
+    try:
+        url = server.start()
+    except RuntimeError as e:
+        pytest.exit(f"❌ {e}", returncode=3)
+    print(f"✅ Frontend em {url} ({time.perf_counter() - start:.1f}s, rotas aquecidas)")
+
+    settings.FRONTEND_URL = settings.BASE_URL = url
+    yield url
+
+    print("\n🛑 Encerrando frontend...")
+    server.stop()
+
+
+@pytest.fixture(scope="session")
+def mock_control(mock_backend):
+    """Canal de controle do mock: seed, estado e reset."""
+    from mock_api.control import MockControl
+
+    control = MockControl(mock_backend)
+    yield control
+    control.close()
+
+
+@pytest.fixture(scope="session")
+def mock_baseline(mock_control):
+    """
+    Snapshot do mock depois do seed da sessão: o usuário de teste (TEST_USER_*,
+    para o login do frontend gerenciado) e o MOCK_SEED_FILE, se houver.
+    """
+    mock_control.ensure_user(settings.TEST_USER_NAME, settings.TEST_USER_EMAIL, settings.TEST_USER_PASSWORD)
+    if settings.MOCK_SEED_FILE:
+        with open(settings.MOCK_SEED_FILE, encoding="utf-8") as f:
+            seed = json.load(f)
+        mock_control.seed(seed.get("users", []), seed.get("historico", []))
+    mock_control.snapshot(MOCK_BASELINE)
+    return MOCK_BASELINE
+
+
+@pytest.fixture(autouse=True)
+def mock_state(mock_control, mock_baseline):
+    """
+    Isola o estado do mock por teste.
+    O teste enxerga o baseline e escreve numa camada própria, descartada
+    em O(1) no final; a ordem dos testes não altera o resultado.
+    """
+    yield mock_control
+    mock_control.restore(mock_baseline)
+
+
+@pytest.fixture(scope="session")
+def frontend_uses_mock(frontend, browser_daemon):
+    """
+    True quando o frontend conversa com o mock: só o frontend gerenciado
+    (pela suíte ou pelo daemon) aponta para ele. Com um FRONTEND_URL
+    externo, o que o teste semeia no mock não chega na tela e as
+    requisições do browser não passam pelo journal.
+    """
+    if browser_daemon is not None:
+        return browser_daemon.info.get("frontend_managed", False)
+    return settings.FRONTEND_MANAGED
 
 
 @pytest.fixture
-def driver(mock_backend):
-    """Fixture do driver do Chrome."""
-    options = ChromeOptions()
-    options.add_argument('--no-sandbox')
-    options.add_argument('--disable-dev-shm-usage')
-    options.add_argument('--disable-gpu')
-    options.add_argument('--window-size=1920,1080')
-    
-    # Usar ChromeDriver do sistema (mais confiável)
-    service = ChromeService(executable_path='/usr/bin/chromedriver')
-    driver_instance = webdriver.Chrome(service=service, options=options)
+def frontend_on_mock(frontend_uses_mock):
+    """Pula o teste quando o frontend não conversa com o mock."""
+    if not frontend_uses_mock:
+        pytest.skip("frontend não usa o mock: rode com FRONTEND_MANAGED=true")
 
-    driver_instance.base_url = mock_backend
-    
+
+@pytest.fixture
+def mock_journal(request, mock_control):
+    """
+    Requisições que chegaram ao mock durante o teste.
+    Ex.: mock_journal.assert_request("POST", "/usuarios/*/historico/", payload={...})
+    O número de requisições e o tempo no servidor vão para user_properties.
+    """
+    from mock_api.control import JournalView
+
+    view = JournalView(mock_control)
+    yield view
+
+    entries = view.entries()
+    request.node.user_properties.append(("mock_requests", len(entries)))
+    request.node.user_properties.append(
+        ("mock_server_time_ms", round(sum(e["duration_ms"] for e in entries), 1))
+    )
+
+
+@pytest.fixture(autouse=True)
+def mock_faults(request, mock_control):
+    """
+    Perfil de latência/falhas do mock para o teste.
+    Pelo marker: @pytest.mark.mock_faults("slow_historico") ou com um dict;
+    ou dentro do teste: mock_faults("long_tail").
+    Os atrasos aplicados vão para user_properties do relatório.
+    """
+    used = False
+
+    def apply(profile):
+        nonlocal used
+        used = True
+        mock_control.set_faults(profile)
+
+    marker = request.node.get_closest_marker("mock_faults")
+    if marker:
+        apply(marker.args[0] if marker.args else dict(marker.kwargs))
+
+    yield apply
+
+    if not used:
+        return
+    applied = mock_control.applied_faults(clear=True)
+    mock_control.clear_faults()
+    backend_delay = sum(a["latency"] + a["bandwidth_delay"] for a in applied)
+    request.node.user_properties.append(("mock_backend_delay_s", round(backend_delay, 3)))
+    request.node.user_properties.append(("mock_injected_errors", sum(bool(a["error_status"]) for a in applied)))
+    request.node.user_properties.append(("mock_injected_timeouts", sum(bool(a["timeout"]) for a in applied)))
+
+
+# ============================================================================
+# FIXTURES DO SELENIUM
+# ============================================================================
+
+@pytest.fixture(scope="session")
+def shared_driver(mock_backend):
+    """Browser único e aquecido, reaproveitado quando REUSE_BROWSER=true."""
+    from utils.browser import create_driver
+
+    driver_instance = create_driver(mock_backend, headless=settings.HEADLESS)
     yield driver_instance
+    driver_instance.quit()
+
+
+@pytest.fixture(scope="session")
+def context_browser(request, mock_backend):
+    """Chromedriver conectado ao Chrome compartilhado (BROWSER_CONTEXTS=true)."""
+    from utils.browser_contexts import ContextBrowser
+
+    plugin = request.config.pluginmanager.get_plugin("browser-contexts")
+    browser = ContextBrowser(plugin.shared_info(), mock_backend)
+    yield browser
+    plugin.samples.extend(browser.samples)
+    browser.close()
+
+
+@pytest.fixture
+def device_profile(request):
+    """
+    Perfil de dispositivo do teste (nome em utils/device_profiles.py) ou None.
+    Vem do marker `device` ou de DEVICE_PROFILE (plugins/device_profiles.py).
+    """
+    return getattr(request, "param", None)
+
+
+@pytest.fixture
+def driver(request, mock_backend, browser_daemon, device_profile):
+    """Fixture do driver do Chrome, já com o perfil de dispositivo aplicado."""
+    from utils.browser import create_driver, reset_browser_state
+    from utils.device_profiles import emulated
+
+    # Reexecuções do plugin flaky sempre usam um browser novo
+    retrying = getattr(request.node, "flaky_attempt", 0) > 0
+    if browser_daemon is not None and not retrying:
+        # Browser emprestado do daemon; já logado se o teste usa authenticated_driver
+        from utils.daemon import attach_driver
+
+        kind = "auth" if "authenticated_driver" in request.fixturenames else "fresh"
+        lease = browser_daemon.acquire(kind)
+        driver_instance = attach_driver(lease)
+        with emulated(driver_instance, device_profile):
+            yield driver_instance
+        driver_instance.quit()
+        browser_daemon.release(lease["lease"])
+        return
+
+    if settings.BROWSER_CONTEXTS and not retrying:
+        # Context novo por teste: cookies/storage isolados sem abrir outro Chrome
+        with request.getfixturevalue("context_browser").context() as driver_instance:
+            with emulated(driver_instance, device_profile):
+                yield driver_instance
+        return
+
+    if settings.REUSE_BROWSER and not retrying:
+        driver_instance = request.getfixturevalue("shared_driver")
+        with emulated(driver_instance, device_profile):
+            yield driver_instance
+        reset_browser_state(driver_instance)
+        return
+
+    driver_instance = create_driver(mock_backend, headless=settings.HEADLESS)
+    
+    with emulated(driver_instance, device_profile):
+        yield driver_instance
     
     driver_instance.quit()
 
 
+@pytest.fixture
+def device_timings(request, driver, device_profile):
+    """
+    Tempos dos fluxos do teste no perfil de dispositivo (utils/device_profiles.py).
+    device_timings.route_load("login") depois de uma carga completa;
+    `with device_timings.measure("login.entrar"):` para interações.
+    Vão para user_properties e para o resumo por perfil.
+    """
+    from utils.device_profiles import DeviceTimings
+
+    timings = DeviceTimings(driver, device_profile or "desktop")
+    yield timings
+    request.node.user_properties.extend(timings.user_properties())
+
+
+@pytest.fixture
+def clock(request, driver, mock_control):
+    """
+    Relógio virtual do teste, o mesmo no browser e no mock (utils/clock.py).
+    @pytest.mark.clock("2025-06-02T10:00:00") congela nessa data antes do
+    teste; peça `clock` antes de `authenticated_driver` para o login já
+    acontecer com a data congelada.
+    """
+    from utils.clock import VirtualClock
+
+    virtual_clock = VirtualClock(driver, mock_control)
+    marker = request.node.get_closest_marker("clock")
+    if marker:
+        virtual_clock.freeze(marker.args[0] if marker.args else None)
+
+    yield virtual_clock
+
+    virtual_clock.restore()
+
+
 @pytest.hookimpl(tryfirst=True, hookwrapper=True)
 def pytest_runtest_makereport(item, call):
     """Hook para capturar resultado do teste."""
@@ -292,7 +382,7 @@ def take_screenshot(driver, test_name):
 @pytest.fixture
 def base_url():
     """URL base do frontend."""
-    url = os.getenv("BASE_URL", "http://localhost:3000")
+    url = settings.BASE_URL
     print(f"\\n🌍 URL base: {url}")
     return url
 
@@ -302,8 +392,15 @@ def authenticated_driver(driver):
     Driver com usuário já autenticado.
     Realiza login automático antes dos testes.
     """
+    if getattr(driver, "daemon_kind", None) == "auth":
+        # O daemon já entrega o browser logado, no dashboard
+        yield driver
+        return
+
     print("\n🔐 Fazendo login automático...")
 
+    from selenium.common.exceptions import NoSuchElementException
+    from selenium.webdriver.common.by import By
     from pages.login_page import LoginPage
     login_page = LoginPage(driver)
 
@@ -326,6 +423,5 @@ def authenticated_driver(driver):
     else:
         print("⚠️ Timeout: não foi possível confirmar login")
 
-    yield driver
-
-    driver.quit()
\ No newline at end of file
+    # O encerramento do browser fica com a fixture `driver`
+    yield driver
\ No newline at end of file
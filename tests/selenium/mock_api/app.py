@@ -0,0 +1,352 @@
+"""
+Rotas do mock do backend (Flask).
+
+``create_app(store)`` monta a aplicação sobre um ``MockStore`` (ou um
+proxy dele, quando o mock roda em vários processos). As rotas em
+``/__mock__/`` são o canal de controle usado pelas fixtures para
+semear e inspecionar o estado.
+"""
+
+import time
+
+from flask import Flask, g, jsonify, request
+from flask_cors import CORS
+
+from mock_api.faults import fault_record, server_timing
+from mock_api.journal import BACKGROUND_HEADER, journal_entry, raw_body
+from mock_api.pagination import PaginationError, page_args, page_body, wants_page, wants_stream
+from mock_api.responses import CatalogPayloads, PayloadCache, json_response, ndjson_response
+from mock_api.store import MockStore, historico_filters
+
+
+def install_request_hooks(app, store):
+    """Journal e injeção de falhas em todas as rotas que não são de controle."""
+    def untracked():
+        return (request.path.startswith("/__mock__/") or request.method == "OPTIONS"
+                or BACKGROUND_HEADER in request.headers)
+
+    # Journal primeiro: o tempo medido inclui a latência injetada e, como
+    # os after_request rodam na ordem inversa, o registro é o último passo
+    @app.before_request
+    def start_journal():
+        g.journal_start = (time.time(), time.perf_counter())
+
+    @app.after_request
+    def record_journal(response):
+        if untracked():
+            return response
+        started_at, start = g.journal_start
+        readable = not (response.is_streamed or response.direct_passthrough
+                        or response.headers.get("Content-Encoding"))
+        store.record_request(journal_entry(
+            request.method,
+            request.path,
+            request.query_string.decode("latin-1"),
+            raw_body(request.get_data(cache=True), request.content_type),
+            response.status_code,
+            raw_body(response.get_data(), response.content_type) if readable else None,
+            started_at,
+            time.perf_counter() - start,
+        ))
+        return response
+
+    @app.before_request
+    def inject_faults():
+        """Aplica latência, erro ou timeout do perfil configurado."""
+        if untracked():
+            return None
+        plan = store.plan_fault(request.method, request.path)
+        g.fault_plan = plan
+        if not plan:
+            return None
+
+        if plan["timeout"]:
+            time.sleep(plan["timeout"])
+            return jsonify({"detail": "Timeout injetado pelo mock"}), 504
+        if plan["latency"]:
+            time.sleep(plan["latency"])
+        if plan["error_status"]:
+            return jsonify({"detail": "Falha injetada pelo mock"}), plan["error_status"]
+        return None
+
+    @app.after_request
+    def throttle_and_record(response):
+        """Limita a banda e registra o atraso aplicado (header Server-Timing)."""
+        plan = g.get("fault_plan")
+        if not plan:
+            return response
+
+        bandwidth_delay = 0.0
+        # Respostas em stream não são lidas aqui (consumiria o gerador)
+        if plan["bandwidth"] and not (response.direct_passthrough or response.is_streamed):
+            bandwidth_delay = len(response.get_data()) / float(plan["bandwidth"])
+            time.sleep(bandwidth_delay)
+
+        response.headers["Server-Timing"] = server_timing(plan, bandwidth_delay)
+        response.headers["Timing-Allow-Origin"] = "*"
+        store.record_fault(fault_record(request.method, request.path, response.status_code, plan, bandwidth_delay))
+        return response
+
+
+def create_app(store=None):
+    """Cria a aplicação Flask do mock."""
+    store = store if store is not None else MockStore()
+
+    app = Flask(__name__)
+    CORS(app)
+    app.config["MOCK_STORE"] = store
+
+    # Vacinas: serializadas de novo só quando o catálogo muda
+    vaccines = CatalogPayloads()
+
+    def vaccine_catalog():
+        version = store.vaccines_version()
+        if not vaccines.is_current(version):
+            vaccines.load(version, store.list_vaccines())
+        return vaccines
+
+    # Dinâmicos: serializados de novo só quando o store muda
+    cache = PayloadCache()
+
+    def cached(key, build):
+        return cache.get(key, store.data_version(), build)
+
+    def collection_response(key, fetch_all, fetch_page):
+        """Lista completa, página por cursor ou stream NDJSON."""
+        if wants_stream(request.args, request.headers.get("Accept")):
+            return ndjson_response(fetch_page)
+        if wants_page(request.args):
+            position, limit = page_args(request.args)
+            return json_response(page_body(*fetch_page(position, limit)))
+        return json_response(cached(key, fetch_all))
+
+    @app.errorhandler(PaginationError)
+    def pagination_error(e):
+        return jsonify({"detail": str(e)}), 400
+
+    install_request_hooks(app, store)
+
+    @app.route('/usuarios/login', methods=['POST'])
+    def login():
+        email = request.args.get('email')
+        senha = request.args.get('senha')
+
+        user = store.find_user_by_email(email)
+        if user and senha == "senha123":
+            return json_response(user)
+
+        return jsonify({"detail": "Email ou senha incorretos"}), 401
+
+    @app.route('/auth/login', methods=['POST'])
+    def auth_login():
+        data = request.get_json(silent=True) or {}
+        user = store.authenticate(data.get("email"), data.get("senha"))
+        if user is None:
+            return jsonify({"detail": "Email ou senha incorretos"}), 401
+        return json_response(user)
+
+    @app.route('/auth/register', methods=['POST'])
+    @app.route('/usuarios/', methods=['POST'])
+    def create_user():
+        data = request.json
+
+        new_user = store.create_user(data["nome"], data["email"], data.get("senha"))
+        if new_user is None:
+            return jsonify({"detail": f"Usuário com email '{data['email']}' já existe"}), 400
+
+        return json_response(new_user, status=201)
+
+    @app.route('/usuarios/', methods=['GET'])
+    def list_users():
+        return collection_response("users", store.list_users, store.users_page)
+
+    @app.route('/usuarios/<int:user_id>', methods=['GET'])
+    def get_user(user_id):
+        user = store.get_user(user_id)
+        if not user:
+            return jsonify({"detail": f"Usuário com ID {user_id} não encontrado"}), 404
+        return json_response(user)
+
+    @app.route('/usuarios/<int:user_id>', methods=['PUT'])
+    def update_user(user_id):
+        try:
+            user = store.update_user(user_id, request.get_json(silent=True) or {})
+        except ValueError as e:
+            return jsonify({"detail": str(e)}), 400
+        if user is None:
+            return jsonify({"detail": f"Usuário com ID {user_id} não encontrado"}), 404
+        return json_response(user)
+
+    @app.route('/usuarios/<int:user_id>', methods=['DELETE'])
+    def delete_user(user_id):
+        if not store.delete_user(user_id):
+            return jsonify({"detail": f"Usuário com ID {user_id} não encontrado"}), 404
+        return "", 204
+
+    @app.route('/vacinas/', methods=['GET'])
+    def list_vaccines():
+        return json_response(vaccine_catalog().listing())
+
+    @app.route('/vacinas/<int:vaccine_id>', methods=['GET'])
+    def get_vaccine(vaccine_id):
+        payload = vaccine_catalog().item(vaccine_id)
+        if payload is None:
+            return jsonify({"detail": f"Vacina com ID {vaccine_id} não encontrada"}), 404
+        return json_response(payload)
+
+    @app.route('/vacinas/', methods=['POST'])
+    def create_vaccine():
+        data = request.get_json(silent=True) or {}
+        if "nome" not in data or "doses" not in data:
+            return jsonify({"detail": "nome e doses são obrigatórios"}), 422
+        return json_response(store.create_vaccine(data), status=201)
+
+    @app.route('/vacinas/<int:vaccine_id>', methods=['PUT'])
+    def update_vaccine(vaccine_id):
+        vaccine = store.update_vaccine(vaccine_id, request.get_json(silent=True) or {})
+        if vaccine is None:
+            return jsonify({"detail": f"Vacina com ID {vaccine_id} não encontrada"}), 404
+        return json_response(vaccine)
+
+    @app.route('/vacinas/<int:vaccine_id>', methods=['DELETE'])
+    def delete_vaccine(vaccine_id):
+        if not store.delete_vaccine(vaccine_id):
+            return jsonify({"detail": f"Vacina com ID {vaccine_id} não encontrada"}), 404
+        return "", 204
+
+    @app.route('/usuarios/<int:user_id>/historico/', methods=['GET'])
+    def list_historico(user_id):
+        try:
+            filtros = historico_filters(request.args)
+        except ValueError:
+            return jsonify({"detail": "Filtro inválido: ano, mes e vacina_id são números"}), 422
+        return collection_response(
+            ("historico", user_id, tuple(sorted(filtros.items()))),
+            lambda: store.list_historico(user_id, filtros),
+            lambda after_id, limit: store.historico_page(user_id, after_id, limit, filtros),
+        )
+
+    @app.route('/usuarios/<int:user_id>/historico/estatisticas', methods=['GET'])
+    def get_estatisticas(user_id):
+        # Depende do relógio do mock: sem cache por versão
+        return json_response(store.estatisticas(user_id))
+
+    @app.route('/usuarios/<int:user_id>/historico/', methods=['POST'])
+    def create_historico(user_id):
+        return json_response(store.create_historico(user_id, request.json), status=201)
+
+    def historico_not_found(historico_id):
+        return jsonify({"detail": f"Registro {historico_id} não encontrado"}), 404
+
+    @app.route('/usuarios/<int:user_id>/historico/<int:historico_id>', methods=['GET'])
+    def get_historico(user_id, historico_id):
+        registro = store.get_historico(user_id, historico_id)
+        return json_response(registro) if registro else historico_not_found(historico_id)
+
+    @app.route('/usuarios/<int:user_id>/historico/<int:historico_id>', methods=['PUT'])
+    def update_historico(user_id, historico_id):
+        registro = store.update_historico(user_id, historico_id, request.get_json(silent=True) or {})
+        return json_response(registro) if registro else historico_not_found(historico_id)
+
+    @app.route('/usuarios/<int:user_id>/historico/<int:historico_id>/aplicar', methods=['PATCH'])
+    def apply_historico(user_id, historico_id):
+        registro = store.apply_historico(user_id, historico_id, request.get_json(silent=True) or {})
+        return json_response(registro) if registro else historico_not_found(historico_id)
+
+    @app.route('/usuarios/<int:user_id>/historico/<int:historico_id>', methods=['DELETE'])
+    def delete_historico(user_id, historico_id):
+        if not store.delete_historico(user_id, historico_id):
+            return historico_not_found(historico_id)
+        return "", 204
+
+    # ------------------------------------------------------------------
+    # Canal de controle
+    # ------------------------------------------------------------------
+
+    @app.route('/__mock__/health', methods=['GET'])
+    def control_health():
+        return jsonify({"status": "ok"}), 200
+
+    @app.route('/__mock__/state', methods=['GET'])
+    def control_state():
+        return jsonify(store.dump()), 200
+
+    @app.route('/__mock__/seed', methods=['POST'])
+    def control_seed():
+        data = request.get_json(silent=True) or {}
+        return jsonify(store.seed(data.get("users", []), data.get("historico", []))), 201
+
+    @app.route('/__mock__/snapshots/<name>', methods=['POST'])
+    def control_snapshot(name):
+        store.snapshot(name)
+        return jsonify({"snapshot": name}), 201
+
+    @app.route('/__mock__/snapshots/<name>/restore', methods=['POST'])
+    def control_restore(name):
+        try:
+            store.restore(name)
+        except KeyError:
+            return jsonify({"detail": f"Snapshot '{name}' não existe"}), 404
+        return jsonify({"snapshot": name}), 200
+
+    @app.route('/__mock__/snapshots/<name>', methods=['DELETE'])
+    def control_drop_snapshot(name):
+        store.drop_snapshot(name)
+        return jsonify({"snapshot": name}), 200
+
+    @app.route('/__mock__/faults', methods=['PUT'])
+    def control_set_faults():
+        data = request.get_json(silent=True) or {}
+        try:
+            store.set_fault_profile(data.get("name") or data.get("profile"))
+        except ValueError as e:
+            return jsonify({"detail": str(e)}), 400
+        return jsonify({"status": "ok"}), 200
+
+    @app.route('/__mock__/faults', methods=['DELETE'])
+    def control_clear_faults():
+        store.set_fault_profile(None)
+        return jsonify({"status": "ok"}), 200
+
+    @app.route('/__mock__/faults/applied', methods=['GET'])
+    def control_applied_faults():
+        clear = request.args.get("clear", "false").lower() == "true"
+        return jsonify(store.applied_faults(clear=clear)), 200
+
+    @app.route('/__mock__/clock', methods=['GET'])
+    def control_clock():
+        return jsonify(store.clock_state()), 200
+
+    @app.route('/__mock__/clock', methods=['PUT'])
+    def control_set_clock():
+        data = request.get_json(silent=True) or {}
+        return jsonify(store.set_clock(data.get("frozen_at"), data.get("offset", 0))), 200
+
+    @app.route('/__mock__/clock/advance', methods=['POST'])
+    def control_advance_clock():
+        data = request.get_json(silent=True) or {}
+        return jsonify(store.advance_clock(float(data.get("seconds", 0)))), 200
+
+    @app.route('/__mock__/clock', methods=['DELETE'])
+    def control_reset_clock():
+        return jsonify(store.set_clock()), 200
+
+    @app.route('/__mock__/journal', methods=['GET'])
+    def control_journal():
+        since = request.args.get("since", 0, type=int)
+        return jsonify({
+            "position": store.journal_position(),
+            "entries": store.journal_entries(since, request.args.get("method"), request.args.get("path")),
+        }), 200
+
+    @app.route('/__mock__/journal', methods=['DELETE'])
+    def control_clear_journal():
+        store.clear_journal()
+        return jsonify({"status": "ok"}), 200
+
+    @app.route('/__mock__/reset', methods=['POST'])
+    def control_reset():
+        store.reset()
+        return jsonify({"status": "ok"}), 200
+
+    return app
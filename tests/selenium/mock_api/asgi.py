@@ -0,0 +1,492 @@
+"""
+Versão assíncrona (ASGI, Starlette) do mock do backend.
+
+Mesmas rotas, mesmo ``MockStore`` e mesmo canal de controle
+``/__mock__/`` da versão Flask (``mock_api.app``), mas atendidas por um
+event loop: centenas de conexões simultâneas não viram centenas de
+threads, e a latência injetada (``mock_api.faults``) é um
+``asyncio.sleep`` que não segura nenhum worker.
+
+Escolhida com ``MOCK_SERVER=asgi`` (ver ``mock_api.server``).
+"""
+
+import asyncio
+import time
+from multiprocessing.managers import BaseProxy
+
+from starlette.applications import Starlette
+from starlette.concurrency import run_in_threadpool
+from starlette.middleware import Middleware
+from starlette.middleware.cors import CORSMiddleware
+from starlette.responses import JSONResponse, Response, StreamingResponse
+from starlette.routing import Route
+
+from mock_api.faults import fault_record, server_timing
+from mock_api.journal import BACKGROUND_HEADER, BODY_LIMIT, journal_entry, raw_body
+from mock_api.pagination import (
+    NDJSON_MIMETYPE,
+    PaginationError,
+    page_args,
+    page_body,
+    wants_page,
+    wants_stream,
+)
+from mock_api.responses import (
+    CACHE_REVALIDATE,
+    CatalogPayloads,
+    PayloadCache,
+    ndjson_lines,
+    negotiate,
+)
+from mock_api.store import MockStore, historico_filters
+
+
+def store_caller(store):
+    """Chamada ao store sem travar o event loop.
+
+    O store local responde em microssegundos e é chamado direto; o proxy
+    do manager (vários workers) faz IO de socket e vai para o threadpool.
+    """
+    if isinstance(store, BaseProxy):
+        async def call(method, *args):
+            return await run_in_threadpool(method, *args)
+    else:
+        async def call(method, *args):
+            return method(*args)
+    return call
+
+
+def json_response(request, data, status=200, cache_control=CACHE_REVALIDATE):
+    """Resposta JSON com ETag, 304 condicional e gzip."""
+    status, body, headers = negotiate(
+        data, status, cache_control,
+        request.headers.get("if-none-match"),
+        request.headers.get("accept-encoding"),
+    )
+    if status == 304:
+        return Response(status_code=304, headers=headers)
+    return Response(body, status_code=status, headers=headers, media_type="application/json")
+
+
+def detail(message, status):
+    return JSONResponse({"detail": message}, status_code=status)
+
+
+async def read_json(request):
+    body = await request.body()
+    return await request.json() if body else {}
+
+
+# Headers do ASGI vêm em minúsculas e em bytes
+BACKGROUND_HEADER_KEY = BACKGROUND_HEADER.lower().encode("latin-1")
+
+
+def untracked(scope):
+    """Rota de controle, preflight ou requisição de fundo do daemon: sem journal nem falhas."""
+    if scope["type"] != "http" or scope["path"].startswith("/__mock__/") or scope["method"] == "OPTIONS":
+        return True
+    return any(name == BACKGROUND_HEADER_KEY for name, _ in scope["headers"])
+
+
+class FaultMiddleware:
+    """Latência, erros, timeouts e limite de banda do perfil configurado."""
+
+    def __init__(self, app, store):
+        self.app = app
+        self.store = store
+        self.call = store_caller(store)
+
+    async def __call__(self, scope, receive, send):
+        if untracked(scope):
+            await self.app(scope, receive, send)
+            return
+
+        plan = await self.call(self.store.plan_fault, scope["method"], scope["path"])
+        if not plan:
+            await self.app(scope, receive, send)
+            return
+
+        state = {"status": None, "bandwidth_delay": 0.0, "throttled": False}
+
+        async def send_with_faults(message):
+            if message["type"] == "http.response.start":
+                state["status"] = message["status"]
+                headers = dict((k.lower(), v) for k, v in message["headers"])
+                length = headers.get(b"content-length")
+                # Stream (sem Content-Length) não sofre limite de banda
+                if plan["bandwidth"] and length:
+                    state["bandwidth_delay"] = int(length) / float(plan["bandwidth"])
+                message["headers"] = list(message["headers"]) + [
+                    (b"server-timing", server_timing(plan, state["bandwidth_delay"]).encode()),
+                    (b"timing-allow-origin", b"*"),
+                ]
+            elif message["type"] == "http.response.body" and not state["throttled"]:
+                state["throttled"] = True
+                if state["bandwidth_delay"]:
+                    await asyncio.sleep(state["bandwidth_delay"])
+            await send(message)
+
+        if plan["timeout"]:
+            await asyncio.sleep(plan["timeout"])
+            response = detail("Timeout injetado pelo mock", 504)
+        else:
+            if plan["latency"]:
+                await asyncio.sleep(plan["latency"])
+            response = detail("Falha injetada pelo mock", plan["error_status"]) if plan["error_status"] else None
+
+        if response is not None:
+            await response(scope, receive, send_with_faults)
+        else:
+            await self.app(scope, receive, send_with_faults)
+
+        await self.call(self.store.record_fault, fault_record(
+            scope["method"], scope["path"], state["status"], plan, state["bandwidth_delay"],
+        ))
+
+
+class JournalMiddleware:
+    """Grava cada requisição/resposta no journal do store."""
+
+    def __init__(self, app, store):
+        self.app = app
+        self.store = store
+        self.call = store_caller(store)
+
+    async def __call__(self, scope, receive, send):
+        if untracked(scope):
+            await self.app(scope, receive, send)
+            return
+
+        started_at, start = time.time(), time.perf_counter()
+        request_body = bytearray()
+        response = {"status": None, "headers": {}, "body": bytearray(), "streamed": False}
+
+        async def receive_and_keep():
+            message = await receive()
+            if message["type"] == "http.request" and len(request_body) <= BODY_LIMIT:
+                request_body.extend(message.get("body", b""))
+            return message
+
+        async def send_and_keep(message):
+            if message["type"] == "http.response.start":
+                response["status"] = message["status"]
+                response["headers"] = {k.lower(): v.decode("latin-1") for k, v in message["headers"]}
+            elif message["type"] == "http.response.body":
+                response["streamed"] |= message.get("more_body", False)
+                if len(response["body"]) <= BODY_LIMIT:
+                    response["body"].extend(message.get("body", b""))
+            await send(message)
+
+        await self.app(scope, receive_and_keep, send_and_keep)
+
+        headers = response["headers"]
+        readable = not (response["streamed"] or headers.get("content-encoding"))
+        await self.call(self.store.record_request, journal_entry(
+            scope["method"],
+            scope["path"],
+            scope["query_string"].decode("latin-1"),
+            raw_body(request_body, dict(scope["headers"]).get(b"content-type", b"").decode("latin-1")),
+            response["status"],
+            raw_body(response["body"], headers.get("content-type")) if readable else None,
+            started_at,
+            time.perf_counter() - start,
+        ))
+
+
+def create_asgi_app(store=None):
+    """Cria a aplicação ASGI do mock."""
+    store = store if store is not None else MockStore()
+    call = store_caller(store)
+
+    # Vacinas: serializadas de novo só quando o catálogo muda
+    vaccines = CatalogPayloads()
+
+    async def vaccine_catalog():
+        version = await call(store.vaccines_version)
+        if not vaccines.is_current(version):
+            vaccines.load(version, await call(store.list_vaccines))
+        return vaccines
+
+    # Dinâmicos: serializados de novo só quando o store muda
+    cache = PayloadCache()
+
+    async def cached(key, build):
+        version = await call(store.data_version)
+        payload = cache.lookup(key, version)
+        if payload is None:
+            payload = cache.put(key, version, await call(build))
+        return payload
+
+    async def collection_response(request, key, fetch_all, fetch_page):
+        """Lista completa, página por cursor ou stream NDJSON."""
+        if wants_stream(request.query_params, request.headers.get("accept")):
+            return StreamingResponse(ndjson_lines(fetch_page), media_type=NDJSON_MIMETYPE,
+                                     headers={"Cache-Control": CACHE_REVALIDATE})
+        if wants_page(request.query_params):
+            position, limit = page_args(request.query_params)
+            return json_response(request, page_body(*await call(fetch_page, position, limit)))
+        return json_response(request, await cached(key, fetch_all))
+
+    async def login(request):
+        email = request.query_params.get('email')
+        senha = request.query_params.get('senha')
+
+        user = await call(store.find_user_by_email, email)
+        if user and senha == "senha123":
+            return json_response(request, user)
+
+        return detail("Email ou senha incorretos", 401)
+
+    async def auth_login(request):
+        data = await read_json(request)
+        user = await call(store.authenticate, data.get("email"), data.get("senha"))
+        if user is None:
+            return detail("Email ou senha incorretos", 401)
+        return json_response(request, user)
+
+    async def create_user(request):
+        data = await read_json(request)
+
+        new_user = await call(store.create_user, data["nome"], data["email"], data.get("senha"))
+        if new_user is None:
+            return detail(f"Usuário com email '{data['email']}' já existe", 400)
+
+        return json_response(request, new_user, status=201)
+
+    async def list_users(request):
+        return await collection_response(request, "users", store.list_users, store.users_page)
+
+    async def get_user(request):
+        user_id = request.path_params["user_id"]
+        user = await call(store.get_user, user_id)
+        if not user:
+            return detail(f"Usuário com ID {user_id} não encontrado", 404)
+        return json_response(request, user)
+
+    async def update_user(request):
+        user_id = request.path_params["user_id"]
+        try:
+            user = await call(store.update_user, user_id, await read_json(request))
+        except ValueError as e:
+            return detail(str(e), 400)
+        if user is None:
+            return detail(f"Usuário com ID {user_id} não encontrado", 404)
+        return json_response(request, user)
+
+    async def delete_user(request):
+        user_id = request.path_params["user_id"]
+        if not await call(store.delete_user, user_id):
+            return detail(f"Usuário com ID {user_id} não encontrado", 404)
+        return Response(status_code=204)
+
+    async def list_vaccines(request):
+        return json_response(request, (await vaccine_catalog()).listing())
+
+    async def get_vaccine(request):
+        vaccine_id = request.path_params["vaccine_id"]
+        payload = (await vaccine_catalog()).item(vaccine_id)
+        if payload is None:
+            return detail(f"Vacina com ID {vaccine_id} não encontrada", 404)
+        return json_response(request, payload)
+
+    async def create_vaccine(request):
+        data = await read_json(request)
+        if "nome" not in data or "doses" not in data:
+            return detail("nome e doses são obrigatórios", 422)
+        return json_response(request, await call(store.create_vaccine, data), status=201)
+
+    async def update_vaccine(request):
+        vaccine_id = request.path_params["vaccine_id"]
+        vaccine = await call(store.update_vaccine, vaccine_id, await read_json(request))
+        if vaccine is None:
+            return detail(f"Vacina com ID {vaccine_id} não encontrada", 404)
+        return json_response(request, vaccine)
+
+    async def delete_vaccine(request):
+        vaccine_id = request.path_params["vaccine_id"]
+        if not await call(store.delete_vaccine, vaccine_id):
+            return detail(f"Vacina com ID {vaccine_id} não encontrada", 404)
+        return Response(status_code=204)
+
+    async def list_historico(request):
+        user_id = request.path_params["user_id"]
+        try:
+            filtros = historico_filters(request.query_params)
+        except ValueError:
+            return detail("Filtro inválido: ano, mes e vacina_id são números", 422)
+        return await collection_response(
+            request,
+            ("historico", user_id, tuple(sorted(filtros.items()))),
+            lambda: store.list_historico(user_id, filtros),
+            lambda after_id, limit: store.historico_page(user_id, after_id, limit, filtros),
+        )
+
+    async def get_estatisticas(request):
+        # Depende do relógio do mock: sem cache por versão
+        return json_response(request, await call(store.estatisticas, request.path_params["user_id"]))
+
+    async def create_historico(request):
+        user_id = request.path_params["user_id"]
+        registro = await call(store.create_historico, user_id, await read_json(request))
+        return json_response(request, registro, status=201)
+
+    def historico_response(request, registro):
+        if registro is None:
+            return detail(f"Registro {request.path_params['historico_id']} não encontrado", 404)
+        return json_response(request, registro)
+
+    async def get_historico(request):
+        p = request.path_params
+        return historico_response(request, await call(store.get_historico, p["user_id"], p["historico_id"]))
+
+    async def update_historico(request):
+        p = request.path_params
+        data = await read_json(request)
+        return historico_response(request, await call(store.update_historico, p["user_id"], p["historico_id"], data))
+
+    async def apply_historico(request):
+        p = request.path_params
+        data = await read_json(request)
+        return historico_response(request, await call(store.apply_historico, p["user_id"], p["historico_id"], data))
+
+    async def delete_historico(request):
+        p = request.path_params
+        if not await call(store.delete_historico, p["user_id"], p["historico_id"]):
+            return historico_response(request, None)
+        return Response(status_code=204)
+
+    # ------------------------------------------------------------------
+    # Canal de controle
+    # ------------------------------------------------------------------
+
+    async def control_health(request):
+        return JSONResponse({"status": "ok"})
+
+    async def control_state(request):
+        return JSONResponse(await call(store.dump))
+
+    async def control_seed(request):
+        data = await read_json(request)
+        created = await call(store.seed, data.get("users", []), data.get("historico", []))
+        return JSONResponse(created, status_code=201)
+
+    async def control_snapshot(request):
+        name = request.path_params["name"]
+        await call(store.snapshot, name)
+        return JSONResponse({"snapshot": name}, status_code=201)
+
+    async def control_restore(request):
+        name = request.path_params["name"]
+        try:
+            await call(store.restore, name)
+        except KeyError:
+            return detail(f"Snapshot '{name}' não existe", 404)
+        return JSONResponse({"snapshot": name})
+
+    async def control_drop_snapshot(request):
+        name = request.path_params["name"]
+        await call(store.drop_snapshot, name)
+        return JSONResponse({"snapshot": name})
+
+    async def control_set_faults(request):
+        data = await read_json(request)
+        try:
+            await call(store.set_fault_profile, data.get("name") or data.get("profile"))
+        except ValueError as e:
+            return detail(str(e), 400)
+        return JSONResponse({"status": "ok"})
+
+    async def control_clear_faults(request):
+        await call(store.set_fault_profile, None)
+        return JSONResponse({"status": "ok"})
+
+    async def control_applied_faults(request):
+        clear = request.query_params.get("clear", "false").lower() == "true"
+        return JSONResponse(await call(store.applied_faults, clear))
+
+    async def control_clock(request):
+        return JSONResponse(await call(store.clock_state))
+
+    async def control_set_clock(request):
+        data = await read_json(request)
+        return JSONResponse(await call(store.set_clock, data.get("frozen_at"), data.get("offset", 0)))
+
+    async def control_advance_clock(request):
+        data = await read_json(request)
+        return JSONResponse(await call(store.advance_clock, float(data.get("seconds", 0))))
+
+    async def control_reset_clock(request):
+        return JSONResponse(await call(store.set_clock))
+
+    async def control_journal(request):
+        try:
+            since = int(request.query_params.get("since", 0))
+        except ValueError:
+            since = 0
+        position = await call(store.journal_position)
+        entries = await call(store.journal_entries, since,
+                             request.query_params.get("method"), request.query_params.get("path"))
+        return JSONResponse({"position": position, "entries": entries})
+
+    async def control_clear_journal(request):
+        await call(store.clear_journal)
+        return JSONResponse({"status": "ok"})
+
+    async def control_reset(request):
+        await call(store.reset)
+        return JSONResponse({"status": "ok"})
+
+    async def pagination_error(request, exc):
+        return detail(str(exc), 400)
+
+    routes = [
+        Route('/usuarios/login', login, methods=['POST']),
+        Route('/auth/login', auth_login, methods=['POST']),
+        Route('/auth/register', create_user, methods=['POST']),
+        Route('/usuarios/', create_user, methods=['POST']),
+        Route('/usuarios/', list_users, methods=['GET']),
+        Route('/usuarios/{user_id:int}', get_user, methods=['GET']),
+        Route('/usuarios/{user_id:int}', update_user, methods=['PUT']),
+        Route('/usuarios/{user_id:int}', delete_user, methods=['DELETE']),
+        Route('/vacinas/', list_vaccines, methods=['GET']),
+        Route('/vacinas/{vaccine_id:int}', get_vaccine, methods=['GET']),
+        Route('/vacinas/', create_vaccine, methods=['POST']),
+        Route('/vacinas/{vaccine_id:int}', update_vaccine, methods=['PUT']),
+        Route('/vacinas/{vaccine_id:int}', delete_vaccine, methods=['DELETE']),
+        Route('/usuarios/{user_id:int}/historico/', list_historico, methods=['GET']),
+        Route('/usuarios/{user_id:int}/historico/estatisticas', get_estatisticas, methods=['GET']),
+        Route('/usuarios/{user_id:int}/historico/', create_historico, methods=['POST']),
+        Route('/usuarios/{user_id:int}/historico/{historico_id:int}', get_historico, methods=['GET']),
+        Route('/usuarios/{user_id:int}/historico/{historico_id:int}', update_historico, methods=['PUT']),
+        Route('/usuarios/{user_id:int}/historico/{historico_id:int}/aplicar', apply_historico, methods=['PATCH']),
+        Route('/usuarios/{user_id:int}/historico/{historico_id:int}', delete_historico, methods=['DELETE']),
+        Route('/__mock__/health', control_health, methods=['GET']),
+        Route('/__mock__/state', control_state, methods=['GET']),
+        Route('/__mock__/seed', control_seed, methods=['POST']),
+        Route('/__mock__/snapshots/{name}', control_snapshot, methods=['POST']),
+        Route('/__mock__/snapshots/{name}/restore', control_restore, methods=['POST']),
+        Route('/__mock__/snapshots/{name}', control_drop_snapshot, methods=['DELETE']),
+        Route('/__mock__/faults', control_set_faults, methods=['PUT']),
+        Route('/__mock__/faults', control_clear_faults, methods=['DELETE']),
+        Route('/__mock__/faults/applied', control_applied_faults, methods=['GET']),
+        Route('/__mock__/clock', control_clock, methods=['GET']),
+        Route('/__mock__/clock', control_set_clock, methods=['PUT']),
+        Route('/__mock__/clock/advance', control_advance_clock, methods=['POST']),
+        Route('/__mock__/clock', control_reset_clock, methods=['DELETE']),
+        Route('/__mock__/journal', control_journal, methods=['GET']),
+        Route('/__mock__/journal', control_clear_journal, methods=['DELETE']),
+        Route('/__mock__/reset', control_reset, methods=['POST']),
+    ]
+
+    app = Starlette(
+        routes=routes,
+        middleware=[
+            # CORS por fora: respostas de falha injetada também levam os headers
+            Middleware(CORSMiddleware, allow_origins=["*"], allow_methods=["*"], allow_headers=["*"]),
+            Middleware(JournalMiddleware, store=store),
+            Middleware(FaultMiddleware, store=store),
+        ],
+        exception_handlers={PaginationError: pagination_error},
+    )
+    app.state.mock_store = store
+    return app
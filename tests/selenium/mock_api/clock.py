@@ -0,0 +1,64 @@
+"""
+Relógio do mock.
+
+Tudo que no mock depende da data (ex.: doses atrasadas nas estatísticas)
+pergunta a hora para o ``MockClock`` do store, que pode estar congelado
+num instante ou deslocado do relógio real. A fixture ``clock``
+(``utils/clock.py``) acerta este relógio e o do browser juntos.
+"""
+
+import time
+from datetime import date, datetime
+
+
+def parse_date(value):
+    """Data de um campo do histórico (ISO ou dd/mm/aaaa); None se não der."""
+    if not value:
+        return None
+    text = str(value).strip()
+    try:
+        return datetime.fromisoformat(text.replace("Z", "+00:00")).date()
+    except ValueError:
+        pass
+    try:
+        return datetime.strptime(text, "%d/%m/%Y").date()
+    except ValueError:
+        return None
+
+
+def is_overdue(registro, today):
+    """Dose pendente com data prevista antes de hoje."""
+    prevista = parse_date(registro.get("data_prevista"))
+    return registro.get("status") == "pendente" and prevista is not None and prevista < today
+
+
+class MockClock:
+    """Hora real, congelada (``frozen_at``) ou deslocada (``offset``), em segundos."""
+
+    def __init__(self):
+        self.frozen_at = None
+        self.offset = 0.0
+
+    def now(self):
+        if self.frozen_at is not None:
+            return self.frozen_at
+        return time.time() + self.offset
+
+    def today(self):
+        return date.fromtimestamp(self.now())
+
+    def set(self, frozen_at=None, offset=0.0):
+        self.frozen_at = None if frozen_at is None else float(frozen_at)
+        self.offset = float(offset or 0)
+
+    def advance(self, seconds):
+        if self.frozen_at is not None:
+            self.frozen_at += seconds
+        else:
+            self.offset += seconds
+
+    def reset(self):
+        self.set()
+
+    def state(self):
+        return {"frozen_at": self.frozen_at, "offset": self.offset, "now": self.now()}
@@ -0,0 +1,186 @@
+"""
+Cliente do canal de controle do mock (rotas ``/__mock__/``).
+
+Funciona igual nos modos thread e processo, já que fala HTTP com o mock.
+"""
+
+import time
+
+import requests
+
+
+class MockControl:
+    """Semeia, inspeciona e reseta o estado do mock."""
+
+    def __init__(self, base_url, timeout=5):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.session = requests.Session()
+
+    def _url(self, path):
+        return f"{self.base_url}/__mock__/{path}"
+
+    def health(self):
+        response = self.session.get(self._url("health"), timeout=self.timeout)
+        return response.ok
+
+    def state(self):
+        """Estado completo do mock."""
+        response = self.session.get(self._url("state"), timeout=self.timeout)
+        response.raise_for_status()
+        return response.json()
+
+    def seed(self, users=(), historico=()):
+        """Cria usuários/registros e retorna o que foi criado (com IDs)."""
+        response = self.session.post(
+            self._url("seed"),
+            json={"users": list(users), "historico": list(historico)},
+            timeout=self.timeout,
+        )
+        response.raise_for_status()
+        return response.json()
+
+    def ensure_user(self, nome, email, senha):
+        """Cria o usuário se o email ainda não existe; retorna o usuário (com ID)."""
+        self.seed(users=[{"nome": nome, "email": email, "senha": senha}])
+        return next(u for u in self.state()["users"].values() if u["email"] == email)
+
+    def snapshot(self, name):
+        """Congela o estado atual do mock com o nome dado."""
+        response = self.session.post(self._url(f"snapshots/{name}"), timeout=self.timeout)
+        response.raise_for_status()
+
+    def restore(self, name):
+        """Volta o mock ao snapshot (O(1) no servidor)."""
+        response = self.session.post(self._url(f"snapshots/{name}/restore"), timeout=self.timeout)
+        response.raise_for_status()
+
+    def drop_snapshot(self, name):
+        response = self.session.delete(self._url(f"snapshots/{name}"), timeout=self.timeout)
+        response.raise_for_status()
+
+    def set_faults(self, profile):
+        """Aplica um perfil de latência/falhas (nome pronto ou dict)."""
+        payload = {"name": profile} if isinstance(profile, str) else {"profile": profile}
+        response = self.session.put(self._url("faults"), json=payload, timeout=self.timeout)
+        response.raise_for_status()
+
+    def clear_faults(self):
+        response = self.session.delete(self._url("faults"), timeout=self.timeout)
+        response.raise_for_status()
+
+    def applied_faults(self, clear=False):
+        """Atrasos/falhas aplicados; ``clear=True`` zera o registro."""
+        response = self.session.get(
+            self._url("faults/applied"),
+            params={"clear": str(clear).lower()},
+            timeout=self.timeout,
+        )
+        response.raise_for_status()
+        return response.json()
+
+    def clock(self):
+        """Estado do relógio do mock (``frozen_at``, ``offset``, ``now``)."""
+        response = self.session.get(self._url("clock"), timeout=self.timeout)
+        response.raise_for_status()
+        return response.json()
+
+    def set_clock(self, frozen_at=None, offset=0.0):
+        """Congela o relógio em ``frozen_at`` (epoch) ou desloca ``offset`` s do real."""
+        response = self.session.put(
+            self._url("clock"), json={"frozen_at": frozen_at, "offset": offset}, timeout=self.timeout
+        )
+        response.raise_for_status()
+        return response.json()
+
+    def advance_clock(self, seconds):
+        response = self.session.post(self._url("clock/advance"), json={"seconds": seconds}, timeout=self.timeout)
+        response.raise_for_status()
+        return response.json()
+
+    def reset_clock(self):
+        response = self.session.delete(self._url("clock"), timeout=self.timeout)
+        response.raise_for_status()
+
+    def journal(self, since=0, method=None, path=None):
+        """Requisições registradas depois da sequência ``since``.
+
+        Retorna ``{"position": ..., "entries": [...]}``; ``path`` aceita
+        padrão do fnmatch (ex.: ``/usuarios/*/historico/``).
+        """
+        params = {"since": since}
+        if method:
+            params["method"] = method
+        if path:
+            params["path"] = path
+        response = self.session.get(self._url("journal"), params=params, timeout=self.timeout)
+        response.raise_for_status()
+        return response.json()
+
+    def journal_position(self):
+        """Sequência da última requisição registrada."""
+        # since acima de qualquer sequência: só a posição, sem entradas
+        return self.journal(since=2 ** 62)["position"]
+
+    def clear_journal(self):
+        response = self.session.delete(self._url("journal"), timeout=self.timeout)
+        response.raise_for_status()
+
+    def reset(self):
+        response = self.session.post(self._url("reset"), timeout=self.timeout)
+        response.raise_for_status()
+
+    def close(self):
+        self.session.close()
+
+
+class JournalView:
+    """Requisições que chegaram ao mock a partir de um ponto (início do teste).
+
+    Permite esperar e verificar chamadas à API direto no mock, sem depender
+    de mensagem na tela::
+
+        entry = mock_journal.assert_request(
+            "POST", "/usuarios/*/historico/",
+            payload={"vacina_id": 2, "status": "pendente"}, status=201,
+        )
+    """
+
+    POLL_INTERVAL = 0.05
+
+    def __init__(self, control, since=None):
+        self.control = control
+        self.since = control.journal_position() if since is None else since
+
+    def entries(self, method=None, path=None):
+        return self.control.journal(self.since, method, path)["entries"]
+
+    def wait_for(self, method, path, where=None, timeout=5, count=1):
+        """Espera a ``count``-ésima requisição que casa e a retorna."""
+        deadline = time.monotonic() + timeout
+        while True:
+            matches = [e for e in self.entries(method, path) if where is None or where(e)]
+            if len(matches) >= count:
+                return matches[count - 1]
+            if time.monotonic() >= deadline:
+                received = [f"{e['method']} {e['path']} -> {e['status']}" for e in self.entries()]
+                raise AssertionError(
+                    f"{method} {path} não chegou ao mock em {timeout}s. Recebidas: {received}"
+                )
+            time.sleep(self.POLL_INTERVAL)
+
+    def assert_request(self, method, path, payload=None, status=None, timeout=5):
+        """Espera a requisição e confere o corpo enviado (subconjunto) e o status."""
+        entry = self.wait_for(method, path, timeout=timeout)
+        if payload is not None:
+            sent = entry["request"] if isinstance(entry["request"], dict) else {}
+            diff = {k: (v, sent.get(k)) for k, v in payload.items() if sent.get(k) != v}
+            assert not diff, f"Payload de {method} {entry['path']} diferente (esperado, enviado): {diff}"
+        if status is not None:
+            assert entry["status"] == status, \
+                f"{method} {entry['path']} respondeu {entry['status']}, esperado {status}"
+        return entry
+
+    def assert_no_request(self, method, path):
+        found = self.entries(method, path)
+        assert not found, f"{method} {path} não deveria ter sido chamado: {len(found)} chamada(s)"
@@ -0,0 +1,156 @@
+"""
+Perfis de latência e falhas do mock.
+
+Um perfil é um dict com regras por rota (padrão do ``fnmatch``, com o
+método opcional na frente)::
+
+    {
+        "seed": 42,
+        "routes": {
+            "GET /usuarios/*/historico/": {
+                "latency": {"type": "percentiles", "p50": 0.1, "p95": 0.8, "p99": 2.0},
+                "bandwidth": 50000,        # bytes/s
+                "error_rate": 0.05,        # responde error_status
+                "error_status": 503,
+                "timeout_rate": 0.01,      # segura a resposta por `timeout` s
+                "timeout": 30,
+            },
+            "/usuarios/*/historico/estatisticas": {
+                "latency": {"type": "uniform", "min": 0.2, "max": 0.6},
+            },
+        },
+    }
+
+Tipos de latência: ``fixed`` (``value``), ``uniform`` (``min``/``max``) e
+``percentiles`` (cauda longa: pontos ``p50``, ``p95``, ``p99``... com
+interpolação linear entre eles; ``min`` e ``max`` opcionais).
+
+Cada atraso aplicado vai para o header ``Server-Timing`` da resposta
+(visível no Resource Timing do browser) e para o registro do store.
+"""
+
+import fnmatch
+import random
+import time
+
+# Perfis prontos, usados pelo nome no marker/fixture
+PROFILES = {
+    "slow_historico": {
+        "routes": {
+            "GET /usuarios/*/historico/": {"latency": {"type": "fixed", "value": 1.5}},
+            "GET /usuarios/*/historico/estatisticas": {"latency": {"type": "fixed", "value": 1.5}},
+        },
+    },
+    "long_tail": {
+        "routes": {
+            "*": {"latency": {"type": "percentiles", "p50": 0.05, "p95": 0.5, "p99": 2.0, "max": 4.0}},
+        },
+    },
+    "flaky_api": {
+        "routes": {
+            "*": {"error_rate": 0.1, "error_status": 503},
+        },
+    },
+    "slow_network": {
+        "routes": {
+            "*": {"latency": {"type": "uniform", "min": 0.1, "max": 0.3}, "bandwidth": 50_000},
+        },
+    },
+}
+
+
+def resolve_profile(profile):
+    """Aceita o nome de um perfil pronto ou o dict do perfil."""
+    if isinstance(profile, str):
+        if profile not in PROFILES:
+            raise ValueError(f"Perfil '{profile}' não existe (opções: {', '.join(PROFILES)})")
+        return PROFILES[profile]
+    return profile or {}
+
+
+def sample_latency(spec, rng):
+    """Sorteia a latência (segundos) de acordo com a distribuição."""
+    if not spec:
+        return 0.0
+    kind = spec.get("type", "fixed")
+    if kind == "fixed":
+        return float(spec.get("value", 0))
+    if kind == "uniform":
+        return rng.uniform(float(spec.get("min", 0)), float(spec["max"]))
+    if kind == "percentiles":
+        points = sorted(
+            (float(key[1:]) / 100, float(value))
+            for key, value in spec.items()
+            if key.startswith("p") and key[1:].replace(".", "", 1).isdigit()
+        )
+        points = [(0.0, float(spec.get("min", 0)))] + points
+        points.append((1.0, float(spec.get("max", points[-1][1]))))
+        u = rng.random()
+        for (q0, v0), (q1, v1) in zip(points, points[1:]):
+            if u <= q1:
+                return v0 + (v1 - v0) * ((u - q0) / (q1 - q0) if q1 > q0 else 0)
+        return points[-1][1]
+    raise ValueError(f"Tipo de latência desconhecido: {kind}")
+
+
+def match_rule(profile, method, path):
+    """Primeira regra cujo padrão casa com ``MÉTODO caminho`` ou só o caminho."""
+    for pattern, rule in (profile or {}).get("routes", {}).items():
+        target = f"{method} {path}" if " " in pattern else path
+        if fnmatch.fnmatch(target, pattern):
+            return rule
+    return None
+
+
+class FaultInjector:
+    """Decide, por requisição, o atraso e a falha a aplicar."""
+
+    def __init__(self, profile=None):
+        self.profile = {}
+        self.rng = random.Random()
+        self.configure(profile)
+
+    def configure(self, profile):
+        self.profile = resolve_profile(profile)
+        self.rng = random.Random(self.profile.get("seed"))
+
+    def plan(self, method, path):
+        """Retorna o plano de falha da requisição, ou None sem regra."""
+        rule = match_rule(self.profile, method, path)
+        if not rule:
+            return None
+
+        plan = {
+            "latency": sample_latency(rule.get("latency"), self.rng),
+            "bandwidth": rule.get("bandwidth"),
+            "error_status": None,
+            "timeout": None,
+        }
+        if self.rng.random() < float(rule.get("timeout_rate", 0)):
+            plan["timeout"] = float(rule.get("timeout", 30))
+        elif self.rng.random() < float(rule.get("error_rate", 0)):
+            plan["error_status"] = int(rule.get("error_status", 500))
+        return plan
+
+
+def server_timing(plan, bandwidth_delay):
+    """Valor do header ``Server-Timing`` com os atrasos aplicados."""
+    latency = plan["timeout"] or plan["latency"]
+    return (
+        f"mock-latency;dur={latency * 1000:.1f}, "
+        f"mock-bandwidth;dur={bandwidth_delay * 1000:.1f}"
+    )
+
+
+def fault_record(method, path, status, plan, bandwidth_delay):
+    """Registro de um atraso/falha aplicado (vai para o store)."""
+    return {
+        "method": method,
+        "path": path,
+        "status": status,
+        "latency": plan["timeout"] or plan["latency"],
+        "bandwidth_delay": bandwidth_delay,
+        "error_status": plan["error_status"],
+        "timeout": plan["timeout"],
+        "at": time.time(),
+    }
@@ -0,0 +1,109 @@
+"""
+Registro (journal) das requisições atendidas pelo mock.
+
+Ring buffer limitado: cada requisição vira uma entrada com método,
+caminho, query, corpo enviado, status, corpo da resposta e tempos. As
+entradas levam um número de sequência crescente; quem consulta guarda a
+última sequência vista e pede só o que veio depois (``since``), sem
+precisar limpar o buffer entre testes.
+
+Os corpos ficam em bytes, como vieram: o JSON só é decodificado na
+consulta (``query``), fora do caminho de cada requisição, e só para as
+entradas que alguém pediu.
+
+Sem lock: ``deque.append`` com ``maxlen`` e ``next()`` de um
+``itertools.count`` são atômicos no CPython, então as threads do
+servidor gravam sem se bloquear. Na leitura o deque é copiado de uma vez
+(``list(deque)``) e filtrado fora.
+"""
+
+import fnmatch
+import itertools
+import json
+from collections import deque
+
+JOURNAL_LIMIT = 5000
+# Requisições com este header (os browsers do daemon se preparando em
+# segundo plano, utils/daemon.py) não entram no journal nem sofrem falhas
+BACKGROUND_HEADER = "X-Mock-Background"
+# Corpos maiores que isso não são guardados (só o tamanho)
+BODY_LIMIT = 16 * 1024
+
+
+def raw_body(raw, content_type=""):
+    """Corpo guardado no journal: ``(bytes, content type)``, ou None se vazio ou grande."""
+    if not raw or len(raw) > BODY_LIMIT:
+        return None
+    return bytes(raw), content_type or ""
+
+
+def decode_body(raw, content_type=""):
+    """Corpo como JSON (se der) ou texto; None se grande ou binário."""
+    if not raw or len(raw) > BODY_LIMIT:
+        return None
+    try:
+        text = raw.decode("utf-8")
+    except UnicodeDecodeError:
+        return None
+    if "json" in (content_type or "") or text[:1] in "[{":
+        try:
+            return json.loads(text)
+        except ValueError:
+            pass
+    return text
+
+
+class RequestJournal:
+    """Últimas ``limit`` requisições, numeradas em sequência."""
+
+    def __init__(self, limit=JOURNAL_LIMIT):
+        self.entries = deque(maxlen=limit)
+        self.sequence = itertools.count(1)
+        self.last = 0
+
+    def record(self, entry):
+        seq = next(self.sequence)
+        entry["seq"] = seq
+        self.entries.append(entry)
+        self.last = seq
+        return seq
+
+    def position(self):
+        """Sequência da última entrada gravada (0 se nenhuma)."""
+        return self.last
+
+    def query(self, since=0, method=None, path=None):
+        """Entradas depois de ``since`` (corpos decodificados); ``path`` aceita padrão do fnmatch."""
+        method = method.upper() if method else None
+        return [
+            decoded_entry(entry) for entry in list(self.entries)
+            if entry["seq"] > since
+            and (method is None or entry["method"] == method)
+            and (path is None or fnmatch.fnmatch(entry["path"], path))
+        ]
+
+    def clear(self):
+        self.entries.clear()
+
+
+def journal_entry(method, path, query, request_body, status, response_body, started_at, duration):
+    """Entrada do journal (comum às versões Flask e ASGI); corpos vêm de ``raw_body``."""
+    return {
+        "method": method,
+        "path": path,
+        "query": query,
+        "request": request_body,
+        "status": status,
+        "response": response_body,
+        "started_at": started_at,
+        "duration_ms": round(duration * 1000, 2),
+    }
+
+
+def decoded_entry(entry):
+    """Cópia da entrada com os corpos como JSON (se der) ou texto."""
+    decoded = dict(entry)
+    for key in ("request", "response"):
+        body = entry[key]
+        decoded[key] = decode_body(*body) if body else None
+    return decoded
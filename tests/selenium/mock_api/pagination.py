@@ -0,0 +1,85 @@
+"""
+Paginação por cursor e streaming NDJSON das listas do mock.
+
+Sem ``limit``/``cursor``/``format`` as rotas continuam devolvendo o array
+completo (é o que o frontend espera). Com eles:
+
+- ``?limit=100`` → ``{"items": [...], "next_cursor": "..."}``; a próxima
+  página vem com ``?limit=100&cursor=<next_cursor>``. ``next_cursor`` é
+  ``null`` na última página.
+- ``?format=ndjson`` (ou ``Accept: application/x-ndjson``) → um registro
+  JSON por linha, gerado em blocos de ``STREAM_CHUNK`` sem montar a
+  lista inteira.
+
+O cursor é opaco para o cliente; por dentro é o ID do último item
+examinado (usuário ou registro do histórico). A próxima página começa no
+ID seguinte, então criar ou apagar registros entre páginas não faz pular
+nem repetir nada.
+"""
+
+import base64
+import binascii
+import json
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+STREAM_CHUNK = 500
+
+NDJSON_MIMETYPE = "application/x-ndjson"
+
+
+class PaginationError(ValueError):
+    """Parâmetros de paginação inválidos (vira 400)."""
+
+
+def encode_cursor(position):
+    raw = json.dumps({"after": position}).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor):
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        position = json.loads(base64.urlsafe_b64decode(padded))["after"]
+    except (binascii.Error, ValueError, KeyError, TypeError):
+        raise PaginationError(f"Cursor inválido: {cursor!r}")
+    if not isinstance(position, int) or position < 0:
+        raise PaginationError(f"Cursor inválido: {cursor!r}")
+    return position
+
+
+def wants_stream(args, accept=""):
+    """``args`` é a query string (qualquer mapping); ``accept`` o header Accept."""
+    return args.get("format") == "ndjson" or (accept or "").startswith(NDJSON_MIMETYPE)
+
+
+def wants_page(args):
+    return "limit" in args or "cursor" in args
+
+
+def page_args(args):
+    """Lê ``limit`` e ``cursor`` da query string. Retorna (posição, limite)."""
+    try:
+        limit = int(args.get("limit", DEFAULT_PAGE_SIZE))
+    except ValueError:
+        raise PaginationError("limit deve ser um inteiro")
+    if not 1 <= limit <= MAX_PAGE_SIZE:
+        raise PaginationError(f"limit deve estar entre 1 e {MAX_PAGE_SIZE}")
+
+    cursor = args.get("cursor")
+    position = decode_cursor(cursor) if cursor else 0
+    return position, limit
+
+
+def page_body(items, next_position):
+    return {
+        "items": items,
+        "next_cursor": encode_cursor(next_position) if next_position is not None else None,
+    }
+
+
+def iter_pages(fetch, position=0, chunk=STREAM_CHUNK):
+    """Percorre ``fetch(posição, limite)`` bloco a bloco, item a item."""
+    while position is not None:
+        items, position = fetch(position, chunk)
+        yield from items
@@ -0,0 +1,184 @@
+"""
+Respostas JSON do mock.
+
+- As vacinas (quase nunca escritas) são serializadas uma vez por versão
+  do catálogo (``CatalogPayloads``).
+- Os demais são serializados com o encoder mais rápido disponível
+  (``orjson`` se estiver instalado, senão um ``JSONEncoder`` compacto
+  reaproveitado). Listas são guardadas por versão do store: enquanto
+  nada for escrito, a mesma rota devolve os mesmos bytes sem serializar
+  de novo. As estatísticas dependem do relógio do mock e são montadas a
+  cada requisição.
+- Corpos grandes (histórico) levam ``ETag`` (``If-None-Match`` igual
+  devolve 304) e vão com gzip quando o cliente aceita. Os pequenos vão
+  direto: revalidar um corpo que cabe num pacote custa o mesmo que
+  mandá-lo de novo.
+"""
+
+import gzip
+import hashlib
+import json
+
+from flask import Response, request
+
+from mock_api.pagination import NDJSON_MIMETYPE, iter_pages
+
+try:
+    import orjson
+except ImportError:  # opcional
+    orjson = None
+
+# Abaixo disso nem ETag nem gzip compensam (cabe num pacote)
+SMALL_BODY_BYTES = 1400
+GZIP_LEVEL = 5
+
+# Tudo pode ser escrito pela API: o browser sempre revalida
+CACHE_REVALIDATE = "no-cache"
+
+_encoder = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"))
+
+
+def dumps(data):
+    """Serializa para bytes UTF-8."""
+    if orjson is not None:
+        return orjson.dumps(data)
+    return _encoder.encode(data).encode("utf-8")
+
+
+class Payload:
+    """Corpo JSON já serializado, com ETag e versão gzip (calculados uma vez, se pedidos)."""
+
+    __slots__ = ("body", "_etag", "_gzipped")
+
+    def __init__(self, body):
+        self.body = body
+        self._etag = None
+        self._gzipped = None
+
+    @property
+    def etag(self):
+        if self._etag is None:
+            self._etag = hashlib.blake2b(self.body, digest_size=8).hexdigest()
+        return self._etag
+
+    @classmethod
+    def from_data(cls, data):
+        return cls(dumps(data))
+
+    def gzipped(self):
+        if self._gzipped is None:
+            self._gzipped = gzip.compress(self.body, compresslevel=GZIP_LEVEL, mtime=0)
+        return self._gzipped
+
+
+class PayloadCache:
+    """Payloads por chave de rota, válidos enquanto a versão do store não muda."""
+
+    def __init__(self, max_entries=1024):
+        self.max_entries = max_entries
+        self.entries = {}
+
+    def lookup(self, key, version):
+        entry = self.entries.get(key)
+        if entry is not None and entry[0] == version:
+            return entry[1]
+        return None
+
+    def put(self, key, version, data):
+        if len(self.entries) >= self.max_entries:
+            self.entries.clear()
+        payload = Payload.from_data(data)
+        self.entries[key] = (version, payload)
+        return payload
+
+    def get(self, key, version, build):
+        payload = self.lookup(key, version)
+        return payload if payload is not None else self.put(key, version, build())
+
+
+class CatalogPayloads:
+    """Lista e itens (por ID) de um catálogo, serializados uma vez por versão.
+
+    A troca de versão é uma atribuição só: quem está lendo vê o catálogo
+    antigo inteiro ou o novo inteiro.
+    """
+
+    def __init__(self):
+        self.current = (None, None, {})
+
+    def is_current(self, version):
+        return self.current[0] == version
+
+    def load(self, version, items):
+        self.current = (version, Payload.from_data(items), {i["id"]: Payload.from_data(i) for i in items})
+
+    def listing(self):
+        return self.current[1]
+
+    def item(self, item_id):
+        return self.current[2].get(item_id)
+
+
+def etag_matches(if_none_match, etag):
+    """``If-None-Match`` casa com o ETag (aceita ``*`` e ETags fracos)."""
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/").strip('"') == etag:
+            return True
+    return False
+
+
+def negotiate(data, status, cache_control, if_none_match, accept_encoding):
+    """Decide status, corpo e headers da resposta JSON.
+
+    Comum às versões Flask e ASGI do mock. Retorna ``(status, corpo,
+    headers)``; com ``If-None-Match`` igual ao ETag o status é 304 e o
+    corpo vazio. Corpos pequenos saem sem ETag nem gzip.
+    """
+    payload = data if isinstance(data, Payload) else Payload.from_data(data)
+    if len(payload.body) < SMALL_BODY_BYTES:
+        return status, payload.body, {"Cache-Control": cache_control}
+
+    headers = {
+        "ETag": f'"{payload.etag}"',
+        "Cache-Control": cache_control,
+        "Vary": "Accept-Encoding",
+    }
+
+    if status == 200 and etag_matches(if_none_match, payload.etag):
+        return 304, b"", headers
+
+    body = payload.body
+    if "gzip" in (accept_encoding or ""):
+        body = payload.gzipped()
+        headers["Content-Encoding"] = "gzip"
+    return status, body, headers
+
+
+def json_response(data, status=200, cache_control=CACHE_REVALIDATE):
+    """Resposta JSON (Flask) com ETag, 304 condicional e gzip."""
+    status, body, headers = negotiate(
+        data, status, cache_control,
+        request.headers.get("If-None-Match"),
+        request.headers.get("Accept-Encoding"),
+    )
+    if status == 304:
+        return Response(status=304, headers=headers)
+    return Response(body, status=status, headers=headers, mimetype="application/json")
+
+
+def ndjson_lines(fetch):
+    """Linhas NDJSON das páginas de ``fetch(posição, limite)``.
+
+    Só um bloco fica em memória por vez, qualquer que seja o tamanho da
+    coleção.
+    """
+    for item in iter_pages(fetch):
+        yield dumps(item) + b"\n"
+
+
+def ndjson_response(fetch):
+    """Stream NDJSON (Flask)."""
+    return Response(ndjson_lines(fetch), mimetype=NDJSON_MIMETYPE, headers={"Cache-Control": CACHE_REVALIDATE})
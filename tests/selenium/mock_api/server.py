@@ -0,0 +1,294 @@
+"""
+Execução do mock do backend.
+
+Dois modos, escolhidos por ``MOCK_MODE``:
+
+- ``thread`` (padrão): o servidor roda numa thread do próprio pytest.
+- ``process``: o servidor roda em outro processo (``python -m
+  mock_api.server``), sem disputar o GIL com o Selenium e o pytest.
+  Com ``MOCK_WORKERS`` > 1 o processo abre o socket e faz pre-fork de N
+  workers que aceitam conexões no mesmo socket; o estado fica num
+  ``multiprocessing`` manager compartilhado por todos.
+
+A implementação é escolhida por ``MOCK_SERVER``: ``flask`` (padrão,
+servidor threaded do werkzeug, uma thread por conexão) ou ``asgi``
+(``mock_api.asgi`` no uvicorn, um event loop que aguenta centenas de
+conexões simultâneas). Vale para os dois modos.
+
+Em todos os casos as fixtures controlam o estado pelas rotas
+``/__mock__/`` (ver ``mock_api.control``).
+"""
+
+import argparse
+import logging
+import multiprocessing
+import os
+import select
+import signal
+import socket
+import subprocess
+import sys
+import threading
+import time
+from multiprocessing.managers import BaseManager
+
+from mock_api.store import MockStore
+from utils.net import wait_for_port
+
+SUITE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+READY_PREFIX = "READY"
+STARTUP_TIMEOUT = 10
+
+SERVERS = ("flask", "asgi")
+# Fila de conexões do socket (o padrão do werkzeug é 128)
+LISTEN_BACKLOG = 2048
+
+
+def bind_socket(port=0):
+    """Socket TCP em escuta, herdável pelos workers."""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    # Herdado pelas conexões aceitas: headers e corpo saem em writes
+    # separados e o Nagle + ACK atrasado somaria ~40 ms por resposta
+    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    sock.bind(('0.0.0.0', port))
+    sock.listen(LISTEN_BACKLOG)
+    sock.set_inheritable(True)
+    return sock
+
+
+def uvicorn_server(store):
+    # Só o modo asgi paga o import do uvicorn/starlette
+    import uvicorn
+
+    from mock_api.asgi import create_asgi_app
+
+    config = uvicorn.Config(
+        create_asgi_app(store),
+        loop="asyncio",
+        lifespan="off",
+        log_level="error",
+        access_log=False,
+    )
+    return uvicorn.Server(config)
+
+
+def quiet_werkzeug():
+    # Suprimir logs do Flask
+    logging.getLogger('werkzeug').setLevel(logging.ERROR)
+
+
+# ============================================================================
+# MODO THREAD
+# ============================================================================
+
+class ThreadedMockServer:
+    """Mock numa thread daemon do processo atual."""
+
+    def __init__(self, store=None, port=0):
+        self.store = store if store is not None else MockStore()
+        self.port = port
+        self.server = None
+
+    def start(self):
+        from werkzeug.serving import make_server
+
+        from mock_api.app import create_app
+
+        quiet_werkzeug()
+        self.server = make_server('0.0.0.0', self.port, create_app(self.store), threaded=True)
+        self.port = self.server.server_port
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+        if not wait_for_port(self.port):
+            raise RuntimeError(f"Mock backend não respondeu na porta {self.port}")
+        return f"http://localhost:{self.port}"
+
+    def stop(self):
+        if self.server is not None:
+            self.server.shutdown()
+
+
+class AsgiMockServer:
+    """Mock ASGI (uvicorn) num event loop em thread daemon do processo atual."""
+
+    def __init__(self, store=None, port=0):
+        self.store = store if store is not None else MockStore()
+        self.port = port
+        self.server = None
+        self.thread = None
+
+    def start(self):
+        sock = bind_socket(self.port)
+        self.port = sock.getsockname()[1]
+        self.server = uvicorn_server(self.store)
+        self.thread = threading.Thread(target=self.server.run, kwargs={"sockets": [sock]}, daemon=True)
+        self.thread.start()
+
+        deadline = time.monotonic() + STARTUP_TIMEOUT
+        while not self.server.started and self.thread.is_alive() and time.monotonic() < deadline:
+            time.sleep(0.02)
+        if not self.server.started:
+            raise RuntimeError(f"Mock backend (asgi) não subiu na porta {self.port}")
+        return f"http://localhost:{self.port}"
+
+    def stop(self):
+        if self.server is not None:
+            self.server.should_exit = True
+            self.thread.join(timeout=5)
+
+
+# ============================================================================
+# MODO PROCESSO
+# ============================================================================
+
+class ProcessMockServer:
+    """Mock em outro processo, opcionalmente com vários workers."""
+
+    def __init__(self, workers=1, port=0, server="flask", log_path=None):
+        self.workers = workers
+        self.port = port
+        self.server = server
+        self.log_path = log_path
+        self.process = None
+        self.drain = None
+
+    def start(self):
+        self.process = subprocess.Popen(
+            [sys.executable, "-m", "mock_api.server",
+             "--port", str(self.port), "--workers", str(self.workers), "--server", self.server],
+            cwd=SUITE_DIR,
+            stdout=subprocess.PIPE,
+            text=True,
+        )
+        self.port = self._read_ready_port()
+        # Depois do READY o pipe continua sendo lido: com o buffer cheio, um
+        # print no processo do mock travaria o servidor
+        self.drain = threading.Thread(target=self._drain_output, name="mock-output", daemon=True)
+        self.drain.start()
+
+        if not wait_for_port(self.port):
+            self.stop()
+            raise RuntimeError(f"Mock backend não respondeu na porta {self.port}")
+        return f"http://localhost:{self.port}"
+
+    def _read_ready_port(self):
+        """Lê a linha ``READY <porta>`` que o processo escreve ao subir."""
+        ready, _, _ = select.select([self.process.stdout], [], [], STARTUP_TIMEOUT)
+        line = self.process.stdout.readline().strip() if ready else ""
+        if not line.startswith(READY_PREFIX):
+            self.stop()
+            raise RuntimeError(f"Mock backend não sinalizou prontidão (saída: {line!r})")
+        return int(line.split()[1])
+
+    def _drain_output(self):
+        """Copia a saída do processo para ``log_path`` (ou descarta) até ele terminar."""
+        if self.log_path is None:
+            for _ in self.process.stdout:
+                pass
+            return
+        with open(self.log_path, "a", encoding="utf-8") as log:
+            for line in self.process.stdout:
+                log.write(line)
+                log.flush()
+
+    def stop(self):
+        if self.process is None or self.process.poll() is not None:
+            return
+        self.process.terminate()
+        try:
+            self.process.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+        if self.drain is not None:
+            self.drain.join(timeout=1)
+
+
+class StoreManager(BaseManager):
+    """Manager que expõe um único MockStore para os workers."""
+
+
+def _serve(fd, store, server="flask"):
+    if server == "asgi":
+        sock = socket.socket(fileno=fd)
+        uvicorn_server(store).run(sockets=[sock])
+        return
+    from werkzeug.serving import make_server
+
+    from mock_api.app import create_app
+
+    quiet_werkzeug()
+    wsgi_server = make_server('0.0.0.0', 0, create_app(store), threaded=True, fd=fd)
+    wsgi_server.serve_forever()
+
+
+def _worker(fd, manager_address, authkey, server):
+    signal.signal(signal.SIGTERM, lambda *_: os._exit(0))
+    manager = StoreManager(address=manager_address, authkey=authkey)
+    manager.connect()
+    _serve(fd, manager.get_store(), server)
+
+
+def serve(port=0, workers=1, server="flask"):
+    """Abre o socket, sobe os workers e avisa a prontidão no stdout."""
+    sock = bind_socket(port)
+    port = sock.getsockname()[1]
+
+    if workers <= 1:
+        print(f"{READY_PREFIX} {port}", flush=True)
+        _serve(sock.fileno(), MockStore(), server)
+        return
+
+    shared_store = MockStore()
+    StoreManager.register("get_store", callable=lambda: shared_store)
+    ctx = multiprocessing.get_context("fork")
+    authkey = os.urandom(16)
+    manager = StoreManager(authkey=authkey, ctx=ctx)
+    manager.start()
+
+    processes = [
+        ctx.Process(target=_worker, args=(sock.fileno(), manager.address, authkey, server), daemon=True)
+        for _ in range(workers)
+    ]
+    for process in processes:
+        process.start()
+
+    def shutdown(*_):
+        for process in processes:
+            process.terminate()
+        manager.shutdown()
+        sys.exit(0)
+
+    signal.signal(signal.SIGTERM, shutdown)
+    print(f"{READY_PREFIX} {port}", flush=True)
+    for process in processes:
+        process.join()
+
+
+def create_server(mode="thread", workers=1, server="flask", port=0, log_path=None):
+    """Cria o servidor do mock para o modo e a implementação pedidos.
+
+    ``port=0`` escolhe uma porta livre. ``log_path`` recebe o stdout do
+    processo do mock (modo ``process``); sem ele a saída é descartada.
+    """
+    if server not in SERVERS:
+        raise ValueError(f"MOCK_SERVER '{server}' não suportado (use 'flask' ou 'asgi')")
+    if mode == "process":
+        return ProcessMockServer(workers=workers, port=port, server=server, log_path=log_path)
+    if mode == "thread":
+        return AsgiMockServer(port=port) if server == "asgi" else ThreadedMockServer(port=port)
+    raise ValueError(f"MOCK_MODE '{mode}' não suportado (use 'thread' ou 'process')")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Mock do backend fora do processo do pytest")
+    parser.add_argument("--port", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--server", choices=SERVERS, default="flask")
+    args = parser.parse_args(argv)
+    serve(args.port, args.workers, args.server)
+
+
+if __name__ == "__main__":
+    main()
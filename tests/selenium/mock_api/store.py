@@ -0,0 +1,509 @@
+"""
+Estado em memória do mock do backend.
+
+Toda leitura e escrita passa pelos métodos de ``MockStore``; assim o
+mesmo código serve tanto para o mock rodando numa thread do pytest
+quanto para vários processos compartilhando o store por um
+``multiprocessing`` manager. Snapshots nomeados permitem voltar a um
+estado conhecido ao fim de cada teste.
+"""
+
+import copy
+import threading
+from bisect import bisect_right
+from collections import ChainMap, deque
+from operator import itemgetter
+
+from mock_api.clock import MockClock, is_overdue, parse_date
+from mock_api.faults import FaultInjector
+from mock_api.journal import RequestJournal
+
+VACCINES = [
+    {"id": 1, "nome": "Hepatite B", "doses": 3},
+    {"id": 2, "nome": "BCG", "doses": 1},
+    {"id": 3, "nome": "Tríplice Viral (Sarampo, Caxumba, Rubéola)", "doses": 2},
+    {"id": 4, "nome": "Febre Amarela", "doses": 1},
+    {"id": 5, "nome": "dT (Dupla Adulto)", "doses": 1},
+    {"id": 6, "nome": "Influenza (Gripe)", "doses": 1},
+]
+
+# Usuário padrão
+DEFAULT_USER = {
+    "id": 1,
+    "nome": "Usuario Teste",
+    "email": "teste@example.com",
+    "senha": "senha123",
+    "is_admin": False
+}
+
+
+ESTATISTICAS = {
+    "total_doses": 8,
+    "doses_aplicadas": 8,
+    "doses_pendentes": 2,
+    "doses_atrasadas": 0,
+    "doses_canceladas": 0,
+    "vacinas_completas": 3,
+    "vacinas_incompletas": 1,
+    "proximas_doses": []
+}
+
+APPLIED_FAULTS_LIMIT = 10_000
+
+# Filtros do GET /usuarios/{id}/historico/ (historicoService.listarPorUsuario)
+HISTORICO_FILTERS = {"ano": int, "mes": int, "vacina_id": int, "status": str}
+# Campos que PUT /usuarios/{id}, PUT /vacinas/{id} e PUT .../historico/{id} podem alterar
+USER_FIELDS = ("nome", "email", "senha", "is_admin")
+VACCINE_FIELDS = ("nome", "doses")
+HISTORICO_FIELDS = (
+    "vacina_id", "numero_dose", "status", "data_aplicacao", "data_prevista",
+    "lote", "local_aplicacao", "profissional", "observacoes",
+)
+
+
+def initial_data():
+    """Banco de dados em memória no estado inicial."""
+    return {
+        "users": {DEFAULT_USER["id"]: dict(DEFAULT_USER)},
+        "vaccines": copy.deepcopy(VACCINES),
+        "historico": {},
+        "next_user_id": DEFAULT_USER["id"] + 1,
+        "next_vaccine_id": max(v["id"] for v in VACCINES) + 1,
+        "next_historico_id": 1
+    }
+
+
+def public_user(user):
+    """Usuário sem a senha, como a API devolve."""
+    return {
+        "id": user["id"],
+        "nome": user["nome"],
+        "email": user["email"],
+        "is_admin": user.get("is_admin", False)
+    }
+
+
+def historico_filters(args):
+    """Filtros presentes na query string, já convertidos.
+
+    Levanta ValueError se um filtro numérico não for número.
+    """
+    filtros = {}
+    for name, cast in HISTORICO_FILTERS.items():
+        value = args.get(name)
+        if value not in (None, ""):
+            filtros[name] = cast(value)
+    return filtros
+
+
+def matches_filters(registro, filtros):
+    """Registro passa nos filtros? Ano/mês valem pela data de aplicação ou, sem ela, a prevista."""
+    if "vacina_id" in filtros and registro.get("vacina_id") != filtros["vacina_id"]:
+        return False
+    if "status" in filtros and registro.get("status") != filtros["status"]:
+        return False
+    if "ano" in filtros or "mes" in filtros:
+        date = parse_date(registro.get("data_aplicacao") or registro.get("data_prevista"))
+        if date is None:
+            return False
+        if "ano" in filtros and date.year != filtros["ano"]:
+            return False
+        if "mes" in filtros and date.month != filtros["mes"]:
+            return False
+    return True
+
+
+class MockStore:
+    """Usuários, vacinas e histórico do mock.
+
+    Usuários e histórico são ``ChainMap``: escritas vão só para a camada
+    de cima e a de baixo é um snapshot congelado. Assim ``restore()``
+    volta a um snapshot em O(1) (descarta a camada de cima) e a memória
+    não cresce com o número de testes. Usuário removido vira ``None`` na
+    camada de cima (não dá para apagar da camada congelada).
+
+    As vacinas quase nunca mudam: cada escrita troca a lista inteira
+    (copy-on-write) e incrementa ``vaccines_version``, que é a chave com
+    que as rotas guardam a lista já serializada.
+    """
+
+    def __init__(self):
+        # Rotas rodam em várias threads (servidor threaded ou manager)
+        self.lock = threading.RLock()
+        self.snapshots = {}
+        self.faults = FaultInjector()
+        # Atrasos/falhas aplicados (limitado para não crescer sem fim)
+        self.applied = deque(maxlen=APPLIED_FAULTS_LIMIT)
+        self.journal = RequestJournal()
+        self.clock = MockClock()
+        # Muda a cada escrita; as respostas em cache são válidas por versão
+        self.version = 0
+        self.vaccines = None
+        self.vaccine_version = 0
+        self._load(initial_data())
+
+    def _load(self, data):
+        self.users = ChainMap({}, data["users"])
+        self.historico = ChainMap({}, data["historico"])
+        self._set_vaccines(data["vaccines"])
+        self.counters = {
+            "next_user_id": data["next_user_id"],
+            "next_vaccine_id": data["next_vaccine_id"],
+            "next_historico_id": data["next_historico_id"],
+        }
+
+    def _touch(self):
+        self.version += 1
+
+    def data_version(self):
+        """Versão atual dos dados (não volta atrás num restore)."""
+        return self.version
+
+    def vaccines_version(self):
+        """Versão do catálogo de vacinas (só muda quando a lista muda)."""
+        return self.vaccine_version
+
+    def _set_vaccines(self, vaccines):
+        if vaccines is not self.vaccines:
+            self.vaccines = vaccines
+            self.vaccine_version += 1
+
+    def _next_id(self, counter):
+        with self.lock:
+            value = self.counters[counter]
+            self.counters[counter] += 1
+            return value
+
+    # Usuários ----------------------------------------------------------
+
+    def find_user_by_email(self, email):
+        for user in self.users.values():
+            if user and user["email"] == email:
+                return public_user(user)
+        return None
+
+    def authenticate(self, email, senha):
+        """Usuário (com token) se email e senha conferem, senão None."""
+        for user in self.users.values():
+            if user and user["email"] == email and user.get("senha") == senha:
+                return {**public_user(user), "token": f"mock-token-{user['id']}"}
+        return None
+
+    def create_user(self, nome, email, senha=None):
+        """Cria usuário. Retorna None se o email já existir."""
+        with self.lock:
+            if self.find_user_by_email(email):
+                return None
+
+            user_id = self._next_id("next_user_id")
+            self.users[user_id] = {
+                "id": user_id,
+                "nome": nome,
+                "email": email,
+                "senha": senha,
+                "is_admin": False
+            }
+            self._touch()
+            return public_user(self.users[user_id])
+
+    def list_users(self):
+        return [public_user(u) for u in self.users.values() if u]
+
+    def users_page(self, after_id, limit):
+        """Até ``limit`` usuários com ID > ``after_id``, em ordem de ID.
+
+        Retorna ``(usuários, próximo after_id)``; o próximo é None no fim.
+        Os IDs saem de um contador, então basta andar a faixa de IDs sem
+        montar a lista inteira.
+        """
+        with self.lock:
+            last_id = self.counters["next_user_id"] - 1
+            items = []
+            user_id = after_id
+            while user_id < last_id and len(items) < limit:
+                user_id += 1
+                user = self.users.get(user_id)
+                if user:
+                    items.append(public_user(user))
+            return items, (user_id if user_id < last_id else None)
+
+    def get_user(self, user_id):
+        user = self.users.get(user_id)
+        return public_user(user) if user else None
+
+    def update_user(self, user_id, data):
+        """Atualiza os campos enviados. None se o usuário não existe.
+
+        Levanta ValueError se o novo email já for de outro usuário.
+        """
+        with self.lock:
+            user = self.users.get(user_id)
+            if not user:
+                return None
+            other = self.find_user_by_email(data.get("email"))
+            if other and other["id"] != user_id:
+                raise ValueError(f"Usuário com email '{data['email']}' já existe")
+            # Dict novo: o antigo pode estar na camada congelada
+            self.users[user_id] = {**user, **{k: data[k] for k in USER_FIELDS if k in data}}
+            self._touch()
+            return public_user(self.users[user_id])
+
+    def delete_user(self, user_id):
+        """Remove o usuário e o histórico dele; False se não existia."""
+        with self.lock:
+            if not self.users.get(user_id):
+                return False
+            self.users[user_id] = None
+            self.historico[user_id] = []
+            self._touch()
+            return True
+
+    # Vacinas -----------------------------------------------------------
+
+    def list_vaccines(self):
+        return self.vaccines
+
+    def get_vaccine(self, vaccine_id):
+        return next((v for v in self.vaccines if v["id"] == vaccine_id), None)
+
+    def create_vaccine(self, data):
+        with self.lock:
+            vaccine = {"id": self._next_id("next_vaccine_id"), "nome": data["nome"], "doses": data["doses"]}
+            self._set_vaccines([*self.vaccines, vaccine])
+            self._touch()
+            return vaccine
+
+    def update_vaccine(self, vaccine_id, data):
+        """Atualiza ``nome``/``doses``. None se a vacina não existe."""
+        changes = {k: data[k] for k in VACCINE_FIELDS if k in data}
+        with self.lock:
+            vaccine = self.get_vaccine(vaccine_id)
+            if vaccine is None:
+                return None
+            updated = {**vaccine, **changes}
+            self._set_vaccines([updated if v["id"] == vaccine_id else v for v in self.vaccines])
+            self._touch()
+            return updated
+
+    def delete_vaccine(self, vaccine_id):
+        with self.lock:
+            if self.get_vaccine(vaccine_id) is None:
+                return False
+            self._set_vaccines([v for v in self.vaccines if v["id"] != vaccine_id])
+            self._touch()
+            return True
+
+    # Histórico ---------------------------------------------------------
+
+    def list_historico(self, user_id, filtros=None):
+        registros = self.historico.get(user_id, [])
+        if filtros:
+            return [r for r in registros if matches_filters(r, filtros)]
+        return registros
+
+    def historico_page(self, user_id, after_id, limit, filtros=None):
+        """Até ``limit`` registros com ID > ``after_id``: ``(registros, próximo after_id)``.
+
+        O histórico de cada usuário fica em ordem de ID (registro novo entra
+        no fim), então o começo da página sai de uma busca binária e um
+        DELETE entre páginas não faz pular registro. Com filtros, anda a
+        lista até juntar ``limit`` registros (sem montar a lista filtrada):
+        um stream ou paginação filtrada percorre o histórico uma vez só.
+        """
+        with self.lock:
+            registros = self.historico.get(user_id, [])
+            index = bisect_right(registros, after_id, key=itemgetter("id"))
+            if not filtros:
+                end = min(index + limit, len(registros))
+                items = registros[index:end]
+            else:
+                items = []
+                end = index
+                while end < len(registros) and len(items) < limit:
+                    registro = registros[end]
+                    end += 1
+                    if matches_filters(registro, filtros):
+                        items.append(registro)
+            return items, (registros[end - 1]["id"] if end < len(registros) else None)
+
+    def get_historico(self, user_id, historico_id):
+        return next((r for r in self.historico.get(user_id, []) if r["id"] == historico_id), None)
+
+    def _replace_historico(self, user_id, historico_id, build):
+        """Troca o registro por ``build(registro)`` (None remove). Retorna o antigo ou None."""
+        with self.lock:
+            registros = self.historico.get(user_id, [])
+            for index, registro in enumerate(registros):
+                if registro["id"] == historico_id:
+                    break
+            else:
+                return None
+            # Copy-on-write: lista e registro do snapshot ficam intactos
+            novos = list(registros)
+            novo = build(registro)
+            if novo is None:
+                del novos[index]
+            else:
+                novos[index] = novo
+            self.historico.maps[0][user_id] = novos
+            self._touch()
+            return registro
+
+    def update_historico(self, user_id, historico_id, data):
+        changes = {k: data[k] for k in HISTORICO_FIELDS if k in data}
+        if self._replace_historico(user_id, historico_id, lambda r: {**r, **changes}) is None:
+            return None
+        return self.get_historico(user_id, historico_id)
+
+    def apply_historico(self, user_id, historico_id, data):
+        """Marca a dose como aplicada (PATCH .../aplicar)."""
+        changes = {k: data[k] for k in ("data_aplicacao", "lote", "local_aplicacao", "profissional") if k in data}
+        return self.update_historico(user_id, historico_id, {**changes, "status": "aplicada"})
+
+    def delete_historico(self, user_id, historico_id):
+        return self._replace_historico(user_id, historico_id, lambda r: None) is not None
+
+    def create_historico(self, user_id, data):
+        new_registro = {
+            "id": self._next_id("next_historico_id"),
+            "usuario_id": user_id,
+            "vacina_id": data["vacina_id"],
+            "vacina_nome": "Hepatite B",
+            "numero_dose": data["numero_dose"],
+            "status": data.get("status", "pendente"),
+            "data_aplicacao": data.get("data_aplicacao"),
+            "data_prevista": data.get("data_prevista"),
+            "lote": data.get("lote"),
+            "local_aplicacao": data.get("local_aplicacao"),
+            "profissional": data.get("profissional"),
+            "observacoes": data.get("observacoes")
+        }
+        with self.lock:
+            top = self.historico.maps[0]
+            if user_id not in top:
+                # Copy-on-write: a lista do snapshot nunca é alterada
+                top[user_id] = list(self.historico.get(user_id, []))
+            top[user_id].append(new_registro)
+            self._touch()
+        return new_registro
+
+    def estatisticas(self, user_id):
+        """Estatísticas do usuário; as atrasadas seguem o relógio do mock."""
+        today = self.clock.today()
+        with self.lock:
+            registros = list(self.historico.get(user_id, []))
+        stats = dict(ESTATISTICAS)
+        stats["doses_atrasadas"] = sum(1 for r in registros if is_overdue(r, today))
+        return stats
+
+    # Controle (fixtures) -----------------------------------------------
+
+    def dump(self):
+        """Cópia do estado atual (chaves numéricas viram string no JSON)."""
+        with self.lock:
+            return copy.deepcopy({
+                "users": {k: v for k, v in self.users.items() if v},
+                "vaccines": self.vaccines,
+                "historico": dict(self.historico),
+                **self.counters,
+            })
+
+    def seed(self, users=(), historico=()):
+        """Insere usuários e registros de histórico; retorna os criados."""
+        created = {"users": [], "historico": []}
+        for user in users:
+            new_user = self.create_user(user["nome"], user["email"], user.get("senha"))
+            if new_user:
+                created["users"].append(new_user)
+        for registro in historico:
+            created["historico"].append(
+                self.create_historico(int(registro["usuario_id"]), registro)
+            )
+        return created
+
+    def snapshot(self, name):
+        """Congela o estado atual com um nome (O(n), feito raramente)."""
+        with self.lock:
+            users = dict(self.users)
+            historico = dict(self.historico)
+            self.snapshots[name] = (users, historico, self.vaccines, dict(self.counters))
+            # Escritas seguintes não podem alterar o snapshot
+            self.users = ChainMap({}, users)
+            self.historico = ChainMap({}, historico)
+
+    def restore(self, name):
+        """Volta ao snapshot em O(1). Levanta KeyError se não existir."""
+        with self.lock:
+            users, historico, vaccines, counters = self.snapshots[name]
+            self.users = ChainMap({}, users)
+            self.historico = ChainMap({}, historico)
+            self._set_vaccines(vaccines)
+            self.counters = dict(counters)
+            self._touch()
+
+    def drop_snapshot(self, name):
+        with self.lock:
+            self.snapshots.pop(name, None)
+
+    # Latência e falhas -------------------------------------------------
+
+    def set_fault_profile(self, profile):
+        """Perfil de latência/falhas (nome de perfil pronto ou dict)."""
+        with self.lock:
+            self.faults.configure(profile)
+
+    def plan_fault(self, method, path):
+        if not self.faults.profile:
+            return None
+        with self.lock:
+            return self.faults.plan(method, path)
+
+    def record_fault(self, entry):
+        self.applied.append(entry)
+
+    def applied_faults(self, clear=False):
+        """Atrasos e falhas aplicados desde a última limpeza."""
+        with self.lock:
+            entries = list(self.applied)
+            if clear:
+                self.applied.clear()
+            return entries
+
+    # Relógio ------------------------------------------------------------
+
+    def clock_state(self):
+        return self.clock.state()
+
+    def set_clock(self, frozen_at=None, offset=0.0):
+        """Congela o relógio em ``frozen_at`` (epoch) ou desloca do real."""
+        with self.lock:
+            self.clock.set(frozen_at, offset)
+            return self.clock.state()
+
+    def advance_clock(self, seconds):
+        with self.lock:
+            self.clock.advance(seconds)
+            return self.clock.state()
+
+    # Journal de requisições ---------------------------------------------
+
+    def record_request(self, entry):
+        return self.journal.record(entry)
+
+    def journal_position(self):
+        return self.journal.position()
+
+    def journal_entries(self, since=0, method=None, path=None):
+        return self.journal.query(since, method, path)
+
+    def clear_journal(self):
+        self.journal.clear()
+
+    def reset(self):
+        """Volta ao estado inicial (snapshots são mantidos)."""
+        with self.lock:
+            self._load(initial_data())
+            self._touch()
+            self.faults.configure(None)
+            self.applied.clear()
+            self.clock.reset()
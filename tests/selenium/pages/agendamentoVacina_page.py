@@ -26,9 +26,9 @@ class VaccineSchedulePage(BasePage):
     SUCCESS_MESSAGE = (By.XPATH, "//*[contains(text(), 'Vacina agendada com sucesso!')]")
     ERROR_MESSAGE = (By.XPATH, "//*[contains(@class, 'text-destructive')]")
 
-    def is_on_schedule_page(self):
+    def is_on_schedule_page(self, timeout=5):
         """Verifica se está na página de agendamento."""
-        return self.is_visible(self.PAGE_TITLE, timeout=5)
+        return self.is_visible(self.PAGE_TITLE, timeout=timeout)
 
     def select_vaccine(self, vaccine_text):
         """
@@ -49,9 +49,10 @@ class VaccineSchedulePage(BasePage):
 
     def select_dose(self, dose_number):
         """Seleciona o número da dose."""
-        select_element = self.find_element(self.DOSE_SELECT)
-        select = Select(select_element)
-        select.select_by_value(str(dose_number))
+        self._with_element(
+            self.DOSE_SELECT,
+            lambda element: Select(element).select_by_value(str(dose_number)),
+        )
 
     def set_date(self, date_str):
         """Define a data (formato: YYYY-MM-DD)."""
@@ -88,6 +89,7 @@ class VaccineSchedulePage(BasePage):
 
     def get_available_vaccines(self):
         """Retorna lista de vacinas disponíveis no select."""
-        select_element = self.find_element(self.VACCINE_SELECT)
-        select = Select(select_element)
-        return [option.text for option in select.options if option.text]
+        return self._with_element(
+            self.VACCINE_SELECT,
+            lambda element: [option.text for option in Select(element).options if option.text],
+        )
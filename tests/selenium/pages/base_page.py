@@ -1,4 +1,16 @@
-"""Classe base para todos os Page Objects."""
+"""Classe base para todos os Page Objects.
+
+Os elementos encontrados ficam num cache por página (chave: o localizador).
+Buscar de novo o mesmo localizador devolve o ``WebElement`` guardado, sem
+ida ao driver; se ele tiver saído do DOM (``StaleElementReferenceException``)
+a ação busca de novo e repete. Navegação e cliques limpam o cache, já que
+podem trocar a página inteira. ``ELEMENT_CACHE=false`` desliga.
+
+Páginas com formulário declaram ``FORM_FIELDS`` (nome -> localizador) e
+``VALID_FORM`` (valores que passam na validação) para usar
+``validate_form``: vários conjuntos de valores validados na mesma página,
+sem recarregar.
+"""
 
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
@@ -12,18 +24,83 @@ from selenium.common.exceptions import (
 )
 from config.settings import settings
 
+# Para cada caso: limpa e preenche os campos como se fosse o usuário
+# (execCommand gera eventos input de verdade, que o React recebe, e conta
+# como edição do usuário, sem a qual minLength nunca reprova) e lê a
+# validação nativa de todos os campos. No fim deixa o formulário vazio.
+VALIDATE_FORM_SCRIPT = """
+const [fields, cases] = arguments;
+const entries = Object.entries(fields);
+const fill = (el, value) => {
+  el.focus();
+  el.select();
+  const done = value ? document.execCommand('insertText', false, value)
+                     : (el.value === '' || document.execCommand('delete'));
+  if (!done || el.value !== value) {
+    const setter = Object.getOwnPropertyDescriptor(Object.getPrototypeOf(el), 'value').set;
+    setter.call(el, value);
+    el.dispatchEvent(new Event('input', {bubbles: true}));
+  }
+};
+const results = cases.map(values => {
+  for (const [name, el] of entries) fill(el, values[name] ?? '');
+  const result = {};
+  for (const [name, el] of entries) {
+    result[name] = {valid: el.checkValidity(), message: el.validationMessage};
+  }
+  return result;
+});
+for (const [, el] of entries) fill(el, '');
+if (document.activeElement) document.activeElement.blur();
+return results;
+"""
+
 
 class BasePage:
     """Classe base para Page Objects."""
     
+    # Rota da página, se ela tiver uma (usada por navigate() e pelo
+    # --preflight-locators, que confere os localizadores sem browser)
+    PATH = None
+    # False: o servidor não renderiza o conteúdo (depende do estado do cliente)
+    SERVER_RENDERED = True
+    # Localizadores que só existem depois de uma ação (mensagens, modais)
+    ON_DEMAND_LOCATORS = ()
+    
+    FORM_FIELDS = {}
+    VALID_FORM = {}
+    
     def __init__(self, driver):
         self.driver = driver
         self.wait = WebDriverWait(driver, settings.EXPLICIT_WAIT)
         self.actions = ActionChains(driver)
+        self._elements = {}
+    
+    def invalidate(self, locator=None):
+        """Esquece um elemento do cache (ou todos, sem localizador)."""
+        if locator is None:
+            self._elements.clear()
+        else:
+            self._elements.pop(locator, None)
+    
+    def _remember(self, locator, element):
+        if settings.ELEMENT_CACHE:
+            self._elements[locator] = element
+        return element
+    
+    def _with_element(self, locator, action, timeout=None):
+        """Executa ``action(elemento)``; se o elemento ficou stale, busca de novo e repete."""
+        element = self.find_element(locator, timeout)
+        try:
+            return action(element)
+        except StaleElementReferenceException:
+            self.invalidate(locator)
+            return action(self.find_element(locator, timeout))
     
     def navigate(self, path=""):
         """Navega para uma URL."""
         url = f"{settings.FRONTEND_URL}{path}"
+        self.invalidate()
         self.driver.get(url)
         self.wait_for_page_load()
     
@@ -34,10 +111,17 @@ class BasePage:
         )
     
     def find_element(self, locator, timeout=None):
-        """Encontra elemento com espera."""
+        """Encontra elemento com espera (ou devolve o do cache).
+
+        O elemento do cache não é revalidado aqui (seria uma ida ao
+        driver); quem usa trata o stale, como faz ``_with_element``.
+        """
+        element = self._elements.get(locator)
+        if element is not None:
+            return element
         wait_time = timeout or settings.EXPLICIT_WAIT
         wait = WebDriverWait(self.driver, wait_time)
-        return wait.until(EC.presence_of_element_located(locator))
+        return self._remember(locator, wait.until(EC.presence_of_element_located(locator)))
     
     def find_elements(self, locator, timeout=None):
         """Encontra múltiplos elementos."""
@@ -49,48 +133,79 @@ class BasePage:
         """Clica em elemento."""
         wait_time = timeout or settings.EXPLICIT_WAIT
         wait = WebDriverWait(self.driver, wait_time)
-        element = wait.until(EC.element_to_be_clickable(locator))
         
-        self.scroll_to_element(locator)
+        def wait_clickable(element):
+            return wait.until(EC.element_to_be_clickable(element))
+        
+        cached = locator in self._elements
+        try:
+            element = self._with_element(locator, wait_clickable, timeout)
+        except TimeoutException:
+            if not cached:
+                raise
+            # O elemento do cache pode ter sido trocado por outro no DOM
+            self.invalidate(locator)
+            element = wait.until(EC.element_to_be_clickable(locator))
+        
+        self.driver.execute_script(
+            "arguments[0].scrollIntoView({behavior: 'smooth', block: 'center'});",
+            element
+        )
         
         try:
             element.click()
         except Exception:
             self.driver.execute_script("arguments[0].click();", element)
+        finally:
+            # O clique pode navegar ou re-renderizar a página
+            self.invalidate()
     
     def type_text(self, locator, text, clear_first=True):
         """Digita texto em campo."""
-        element = self.find_element(locator)
-        
-        if clear_first:
-            element.clear()
+        def type_into(element):
+            if clear_first:
+                element.clear()
+            element.send_keys(text)
         
-        element.send_keys(text)
+        self._with_element(locator, type_into)
     
     def get_text(self, locator):
         """Obtém texto de elemento."""
-        element = self.find_element(locator)
-        return element.text
+        return self._with_element(locator, lambda element: element.text)
     
     def get_attribute(self, locator, attribute):
         """Obtém atributo de elemento."""
-        element = self.find_element(locator)
-        return element.get_attribute(attribute)
+        return self._with_element(locator, lambda element: element.get_attribute(attribute))
     
     def is_visible(self, locator, timeout=5):
         """Verifica se elemento está visível."""
+        element = self._elements.get(locator)
+        if element is not None:
+            try:
+                if element.is_displayed():
+                    return True
+            except StaleElementReferenceException:
+                self.invalidate(locator)
         try:
             wait = WebDriverWait(self.driver, timeout)
-            wait.until(EC.visibility_of_element_located(locator))
+            self._remember(locator, wait.until(EC.visibility_of_element_located(locator)))
             return True
         except TimeoutException:
             return False
     
     def is_present(self, locator, timeout=5):
         """Verifica se elemento está presente no DOM."""
+        element = self._elements.get(locator)
+        if element is not None:
+            try:
+                # Qualquer comando no elemento falha se ele saiu do DOM
+                element.is_enabled()
+                return True
+            except StaleElementReferenceException:
+                self.invalidate(locator)
         try:
             wait = WebDriverWait(self.driver, timeout)
-            wait.until(EC.presence_of_element_located(locator))
+            self._remember(locator, wait.until(EC.presence_of_element_located(locator)))
             return True
         except TimeoutException:
             return False
@@ -103,17 +218,17 @@ class BasePage:
     
     def wait_for_element_to_disappear(self, locator, timeout=None):
         """Espera elemento desaparecer."""
+        self.invalidate(locator)
         wait_time = timeout or settings.EXPLICIT_WAIT
         wait = WebDriverWait(self.driver, wait_time)
         wait.until(EC.invisibility_of_element_located(locator))
     
     def scroll_to_element(self, locator):
         """Scroll até elemento."""
-        element = self.find_element(locator)
-        self.driver.execute_script(
+        self._with_element(locator, lambda element: self.driver.execute_script(
             "arguments[0].scrollIntoView({behavior: 'smooth', block: 'center'});",
             element
-        )
+        ))
     
     def scroll_to_top(self):
         """Scroll para topo da página."""
@@ -129,11 +244,13 @@ class BasePage:
     
     def refresh(self):
         """Atualiza página."""
+        self.invalidate()
         self.driver.refresh()
         self.wait_for_page_load()
     
     def go_back(self):
         """Volta para página anterior."""
+        self.invalidate()
         self.driver.back()
         self.wait_for_page_load()
     
@@ -141,15 +258,33 @@ class BasePage:
         """Executa JavaScript."""
         return self.driver.execute_script(script, *args)
     
+    def validate_form(self, cases):
+        """Valida vários preenchimentos do formulário numa chamada só.
+
+        Cada caso é um dict com os campos que mudam em relação a
+        ``VALID_FORM``. Devolve, por caso, ``{campo: {"valid", "message"}}``
+        com ``checkValidity()``/``validationMessage`` de todos os campos.
+        Nada é submetido; a página precisa estar aberta.
+        """
+        values = [{**self.VALID_FORM, **case} for case in cases]
+        
+        def run():
+            fields = {name: self.find_element(locator) for name, locator in self.FORM_FIELDS.items()}
+            return self.driver.execute_script(VALIDATE_FORM_SCRIPT, fields, values)
+        
+        try:
+            return run()
+        except StaleElementReferenceException:
+            self.invalidate()
+            return run()
+    
     def hover_over(self, locator):
         """Passa mouse sobre elemento."""
-        element = self.find_element(locator)
-        self.actions.move_to_element(element).perform()
+        self._with_element(locator, lambda element: self.actions.move_to_element(element).perform())
     
     def press_key(self, locator, key):
         """Pressiona tecla em elemento."""
-        element = self.find_element(locator)
-        element.send_keys(key)
+        self._with_element(locator, lambda element: element.send_keys(key))
     
     def wait_for_react_to_load(self, timeout=10):
         """
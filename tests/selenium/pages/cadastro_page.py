@@ -21,9 +21,25 @@ class CadastroPage(BasePage):
     ERROR_MESSAGE = (By.XPATH, "//*[contains(@class, 'destructive')]")
     LOGIN_LINK = (By.CSS_SELECTOR, 'a[href="/login"]')
     
+    PATH = "/cadastro"
+    ON_DEMAND_LOCATORS = ("SUCCESS_MESSAGE", "ERROR_MESSAGE")
+    
+    FORM_FIELDS = {
+        "name": NAME_INPUT,
+        "email": EMAIL_INPUT,
+        "password": PASSWORD_INPUT,
+        "confirm_password": CONFIRM_PASSWORD_INPUT,
+    }
+    VALID_FORM = {
+        "name": "Teste",
+        "email": "teste@example.com",
+        "password": "senha123",
+        "confirm_password": "senha123",
+    }
+    
     def navigate(self):
         """Navega para a página de cadastro."""
-        super().navigate("/cadastro")
+        super().navigate(self.PATH)
     
     def signup(self, name, email, password, confirm_password):
         """Realiza o cadastro."""
@@ -1,9 +1,87 @@
 """
 Page Object para o Dashboard.
+
+O calendário de vacinas é lido inteiro numa chamada de script
+(``read_calendar``): dias do mês visível, quantos eventos cada um tem e a
+cor de cada bolinha. ``calendar_from_historico`` monta o mesmo resultado a
+partir do histórico do mock, com a regra do componente, para comparar.
 """
 
+from collections import Counter
+from datetime import datetime
+
 from selenium.webdriver.common.by import By
+from selenium.webdriver.common.keys import Keys
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.support.ui import WebDriverWait
 from pages.base_page import BasePage
+from config.settings import settings
+
+MONTH_NAMES = (
+    "Janeiro", "Fevereiro", "Março", "Abril", "Maio", "Junho",
+    "Julho", "Agosto", "Setembro", "Outubro", "Novembro", "Dezembro",
+)
+
+# Grade do calendário: 42 células; as do mês visível são as clicáveis
+READ_CALENDAR_SCRIPT = """
+const grid = document.querySelector('.grid.grid-cols-7');
+if (!grid) return null;
+const title = grid.parentElement.querySelector('h3');
+const colors = ['bg-green-500', 'bg-red-500', 'bg-primary'];
+return {
+  title: title ? title.textContent.trim() : '',
+  cells: Array.from(grid.children, cell => {
+    const dots = cell.querySelectorAll('span.rounded-full');
+    return {
+      day: parseInt(cell.childNodes[0].textContent, 10),
+      current: cell.classList.contains('cursor-pointer'),
+      colors: Array.from(dots, dot => colors.find(c => dot.classList.contains(c)) || ''),
+    };
+  }),
+};
+"""
+
+CLICK_CALENDAR_DAY_SCRIPT = """
+const cells = document.querySelectorAll('.grid.grid-cols-7 > .cursor-pointer');
+const cell = Array.from(cells).find(c => parseInt(c.childNodes[0].textContent, 10) === arguments[0]);
+if (!cell) return false;
+cell.click();
+return true;
+"""
+
+# Modal aberto do dia (o que está fechando, na animação de saída, não conta)
+READ_DAY_DIALOG_SCRIPT = """
+const dialog = document.querySelector('[role="dialog"][data-state="open"]');
+if (!dialog) return null;
+const title = dialog.querySelector('h2');
+return {
+  title: title ? title.textContent.trim() : '',
+  vaccines: Array.from(dialog.querySelectorAll('.border.rounded-md'), e => e.innerText.trim()),
+};
+"""
+
+
+def calendar_from_historico(historico, year, month):
+    """Eventos por dia (``{dia: n}``) que o calendário deve mostrar no mês.
+
+    Mesma regra do componente: vale ``data_aplicacao`` e, sem ela,
+    ``data_prevista``. Datas com hora são lidas no fuso local, como no
+    browser (só data, ``AAAA-MM-DD``, o JS lê em UTC; evite no seed).
+    """
+    days = Counter()
+    for registro in historico:
+        value = registro.get("data_aplicacao") or registro.get("data_prevista")
+        if not value:
+            continue
+        try:
+            date = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+        except ValueError:
+            continue
+        if date.tzinfo is not None:
+            date = date.astimezone()
+        if (date.year, date.month) == (year, month):
+            days[date.day] += 1
+    return dict(days)
 
 
 class DashboardPage(BasePage):
@@ -16,27 +94,33 @@ class DashboardPage(BasePage):
     USER_EMAIL = (By.XPATH, "//p[@class='text-muted-foreground']")
     
     # Tabs/Menu
+    DASHBOARD_TAB = (By.XPATH, "//button[.//span[contains(text(), 'Dashboard')]]")
     SCHEDULE_TAB = (By.XPATH, "//button[.//span[contains(text(), 'Agendar Vacina')]]")
     HISTORY_TAB = (By.XPATH, "//button[.//span[contains(text(), 'Histórico')]]")
     SETTINGS_BUTTON = (By.XPATH, "//button[contains(text(), 'Configurações')]")
+    HISTORY_TITLE = (By.XPATH, "//h2[contains(., 'Histórico de Vacinação')]")
     
     # Cards de Estatísticas
-    VACCINES_UP_TO_DATE_CARD = (By.XPATH, "//div[contains(text(), 'Vacinas em Dia')]")
-    UPCOMING_VACCINES_CARD = (By.XPATH, "//div[contains(text(), 'Próximas Vacinas')]")
+    VACCINES_UP_TO_DATE_CARD = (By.XPATH, "//div[contains(text(), 'Vacinas Aplicadas')]")
+    UPCOMING_VACCINES_CARD = (By.XPATH, "//div[contains(text(), 'Pendentes')]")
     OVERDUE_VACCINES_CARD = (By.XPATH, "//div[contains(text(), 'Atrasadas')]")
     
     # Valores dos cards
-    VACCINES_UP_TO_DATE_VALUE = (By.XPATH, "//div[contains(text(), 'Vacinas em Dia')]/following-sibling::div//div[@class='text-2xl font-bold']")
-    UPCOMING_VACCINES_VALUE = (By.XPATH, "//div[contains(text(), 'Próximas Vacinas')]/following-sibling::div//div[@class='text-2xl font-bold']")
-    OVERDUE_VACCINES_VALUE = (By.XPATH, "//div[contains(text(), 'Atrasadas')]/following-sibling::div//div[@class='text-2xl font-bold']")
+    VACCINES_UP_TO_DATE_VALUE = (By.XPATH, "//p[contains(text(), 'Doses completas')]/preceding-sibling::div[contains(@class, 'text-2xl')]")
+    UPCOMING_VACCINES_VALUE = (By.XPATH, "//p[contains(text(), 'Agendadas')]/preceding-sibling::div[contains(@class, 'text-2xl')]")
+    OVERDUE_VACCINES_VALUE = (By.XPATH, "//p[contains(text(), 'Doses atrasadas')]/preceding-sibling::div[contains(@class, 'text-2xl')]")
+    
+    PATH = "/dashboard"
+    # Só renderiza no cliente, depois de ler o usuário do localStorage
+    SERVER_RENDERED = False
     
     def navigate(self):
         """Navega para o dashboard."""
-        super().navigate("/dashboard")
+        super().navigate(self.PATH)
     
-    def is_logged_in(self):
+    def is_logged_in(self, timeout=10):
         """Verifica se o usuário está logado."""
-        return self.is_visible(self.WELCOME_MESSAGE, timeout=10)
+        return self.is_visible(self.WELCOME_MESSAGE, timeout=timeout)
     
     def get_welcome_message(self):
         """Obtém mensagem de boas-vindas."""
@@ -46,6 +130,10 @@ class DashboardPage(BasePage):
         """Realiza logout."""
         self.click(self.LOGOUT_BUTTON)
     
+    def open_dashboard_tab(self):
+        """Volta para a aba inicial sem recarregar a página."""
+        self.click(self.DASHBOARD_TAB)
+    
     def navigate_to_schedule(self):
         """Navega para agendamento."""
         self.click(self.SCHEDULE_TAB)
@@ -54,6 +142,10 @@ class DashboardPage(BasePage):
         """Navega para histórico."""
         self.click(self.HISTORY_TAB)
     
+    def is_on_history_page(self, timeout=5):
+        """Verifica se a aba de histórico está aberta."""
+        return self.is_visible(self.HISTORY_TITLE, timeout=timeout)
+    
     def open_settings(self):
         """Abre configurações."""
         self.click(self.SETTINGS_BUTTON)
@@ -69,4 +161,56 @@ class DashboardPage(BasePage):
     def get_overdue_vaccines_count(self):
         """Obtém contagem de vacinas atrasadas."""
         return self.get_text(self.OVERDUE_VACCINES_VALUE)
+    
+    # Calendário
+    
+    def read_calendar(self, timeout=None):
+        """Mês visível do calendário, lido numa chamada só.
+
+        Retorna ``{"year", "month", "days": {dia: [cores]}}`` só com os
+        dias do mês (os dos meses vizinhos, apagados, ficam de fora).
+        """
+        data = WebDriverWait(self.driver, timeout or settings.EXPLICIT_WAIT).until(
+            lambda d: d.execute_script(READ_CALENDAR_SCRIPT)
+        )
+        month_name, year = data["title"].rsplit(" ", 1)
+        return {
+            "year": int(year),
+            "month": MONTH_NAMES.index(month_name) + 1,
+            "days": {cell["day"]: cell["colors"] for cell in data["cells"] if cell["current"]},
+        }
+    
+    def calendar_events(self):
+        """Eventos por dia do mês visível (``{dia: n}``, só dias com evento)."""
+        days = self.read_calendar()["days"]
+        return {day: len(colors) for day, colors in days.items() if colors}
+    
+    def wait_for_calendar_events(self, expected, timeout=None):
+        """Espera o calendário mostrar exatamente ``expected`` (o histórico chega depois da página)."""
+        wait = WebDriverWait(self.driver, timeout or settings.EXPLICIT_WAIT)
+        try:
+            wait.until(lambda d: self.calendar_events() == expected)
+        except TimeoutException:
+            raise AssertionError(
+                f"Calendário mostra {self.calendar_events()}, esperado {expected}"
+            ) from None
+    
+    def open_calendar_day(self, day, timeout=None):
+        """Abre o card do dia e retorna ``{"title", "vaccines": [texto de cada dose]}``."""
+        if not self.execute_script(CLICK_CALENDAR_DAY_SCRIPT, day):
+            raise ValueError(f"Dia {day} não está no mês visível do calendário")
+        return WebDriverWait(self.driver, timeout or settings.EXPLICIT_WAIT).until(
+            lambda d: d.execute_script(READ_DAY_DIALOG_SCRIPT)
+        )
+    
+    def close_calendar_day(self, timeout=None):
+        """Fecha o card do dia (Esc) e espera ele sair."""
+        self.close_dialog(timeout)
+    
+    def close_dialog(self, timeout=None):
+        """Fecha o modal aberto (card do dia, configurações) com Esc e espera ele sair."""
+        self.actions.send_keys(Keys.ESCAPE).perform()
+        WebDriverWait(self.driver, timeout or settings.EXPLICIT_WAIT).until(
+            lambda d: d.execute_script(READ_DAY_DIALOG_SCRIPT) is None
+        )
 
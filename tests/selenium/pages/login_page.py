@@ -19,9 +19,21 @@ class LoginPage(BasePage):
     CADASTRO_LINK = (By.CSS_SELECTOR, 'a[href="/cadastro"]')
     BACK_TO_HOME = (By.XPATH, "//a[contains(text(), 'Voltar')]")
     
+    PATH = "/login"
+    ON_DEMAND_LOCATORS = ("ERROR_MESSAGE",)
+    
+    FORM_FIELDS = {
+        "email": EMAIL_INPUT,
+        "password": PASSWORD_INPUT,
+    }
+    VALID_FORM = {
+        "email": "teste@example.com",
+        "password": "senha123",
+    }
+    
     def navigate(self):
         """Navega para a página de login."""
-        super().navigate("/login")
+        super().navigate(self.PATH)
     
     def login(self, email, password):
         """Realiza o login."""
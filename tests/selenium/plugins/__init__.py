@@ -0,0 +1 @@
+# Auto-generated\n
\ No newline at end of file
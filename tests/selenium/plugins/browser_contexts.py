@@ -0,0 +1,100 @@
+"""
+Modo de browser contexts (``BROWSER_CONTEXTS=true``).
+
+Abre um Chrome só para a execução inteira (no controlador, com xdist) e
+passa o endereço dele para os workers; a fixture ``driver`` entrega a
+cada teste um context isolado desse Chrome (``utils/browser_contexts.py``).
+
+No final mostra quanto de memória um teste custa como Chrome inteiro e
+como context, e quantos testes cabem por core em cada caso; os números
+vão também para ``reports/browser_contexts.json``.
+
+Uso:
+    BROWSER_CONTEXTS=true pytest -n 8
+"""
+
+import json
+
+import pytest
+
+from config.settings import settings
+
+REPORT_FILE = settings.REPORTS_DIR / "browser_contexts.json"
+
+
+class BrowserContextsPlugin:
+    """Dono do Chrome compartilhado e das medições de memória."""
+
+    def __init__(self, config):
+        self.config = config
+        self.shared = None
+        self.info = None
+        self.samples = []
+        self.report = None
+
+    @property
+    def is_worker(self):
+        return hasattr(self.config, "workerinput")
+
+    def shared_info(self):
+        """Endereço/PID do Chrome compartilhado; abre na primeira chamada."""
+        if self.is_worker:
+            return self.config.workerinput["shared_chrome"]
+        if self.info is None:
+            from utils.browser_contexts import SharedChrome
+
+            self.shared = SharedChrome(headless=settings.HEADLESS)
+            self.info = self.shared.start()
+            print(f"\n🧭 Chrome compartilhado em {self.info['address']}")
+        return self.info
+
+    @pytest.hookimpl(optionalhook=True)
+    def pytest_configure_node(self, node):
+        node.workerinput["shared_chrome"] = self.shared_info()
+
+    @pytest.hookimpl(optionalhook=True)
+    def pytest_testnodedown(self, node, error):
+        output = getattr(node, "workeroutput", {}) or {}
+        self.samples.extend(output.get("browser_context_samples", []))
+
+    @pytest.hookimpl(trylast=True)
+    def pytest_sessionfinish(self, session):
+        if self.is_worker:
+            self.config.workeroutput["browser_context_samples"] = self.samples
+            return
+        if self.info is None:
+            return
+        from utils.browser_contexts import memory_report
+
+        self.report = memory_report(self.info["base_kb"], self.samples)
+        if self.report:
+            REPORT_FILE.parent.mkdir(parents=True, exist_ok=True)
+            with open(REPORT_FILE, "w", encoding="utf-8") as f:
+                json.dump(self.report, f, indent=2, sort_keys=True)
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if not self.report:
+            return
+        r = self.report
+        terminalreporter.section("browser contexts")
+        terminalreporter.write_line(f"Chrome inteiro por teste: {r['chrome_per_test_kb'] / 1024:.0f} MB")
+        terminalreporter.write_line(
+            f"Context por teste:        {r['context_per_test_kb'] / 1024:.0f} MB "
+            f"(mediana de {r['samples']} medições)"
+        )
+        terminalreporter.write_line(f"Economia por teste:       {r['saved_per_test_kb'] / 1024:.0f} MB")
+        if "tests_per_core_context" in r:
+            terminalreporter.write_line(
+                f"Testes por core (só memória, {r['cores']} cores): "
+                f"{r['tests_per_core_chrome']} com um Chrome cada, "
+                f"{r['tests_per_core_context']} com contexts"
+            )
+
+    def pytest_unconfigure(self, config):
+        if self.shared is not None:
+            self.shared.stop()
+
+
+def pytest_configure(config):
+    if settings.BROWSER_CONTEXTS:
+        config.pluginmanager.register(BrowserContextsPlugin(config), "browser-contexts")
@@ -0,0 +1,113 @@
+"""
+Consumo de recursos do browser por teste.
+
+Com ``--browser-resources`` o driver do teste é amostrado antes e depois
+do corpo do teste (``utils/browser_resources.py``, com GC antes de cada
+amostra): heap JS, nós do DOM, listeners, documentos, tempo de layout e
+RSS do Chrome. Amostras e diferenças vão para
+``reports/browser_resources.json`` e para as user_properties do
+relatório; o resumo mostra os testes que mais deixaram heap e nós para
+trás.
+
+Para sessões longas (vazamento que só aparece depois de centenas de
+navegações) use o ``run_soak.py``.
+
+Uso:
+    pytest --browser-resources
+    pytest --browser-resources --browser-resources-top 20
+"""
+
+import json
+
+import pytest
+
+from config.settings import settings
+
+RESOURCES_FILE = settings.REPORTS_DIR / "browser_resources.json"
+
+
+class BrowserResourcesPlugin:
+    """Amostra o driver de cada teste e junta os resultados (inclusive do xdist)."""
+
+    def __init__(self, config):
+        self.config = config
+        self.top = config.getoption("browser_resources_top")
+        self.tests = {}
+
+    @property
+    def is_worker(self):
+        return hasattr(self.config, "workerinput")
+
+    @staticmethod
+    def sample(sampler):
+        try:
+            return sampler.sample()
+        except Exception:
+            # Browser fechado ou travado: o teste já vai falhar por conta própria
+            return None
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_call(self, item):
+        driver = item.funcargs.get("driver")
+        if driver is None:
+            yield
+            return
+        from utils.browser_resources import ResourceSampler, sample_delta
+
+        sampler = ResourceSampler(driver)
+        before = self.sample(sampler)
+        yield
+        after = self.sample(sampler)
+        if before is None or after is None:
+            return
+        delta = sample_delta(before, after)
+        self.tests[item.nodeid] = {"before": before, "after": after, "delta": delta}
+        for name in ("js_heap_used_kb", "dom_nodes", "js_event_listeners", "chrome_rss_kb"):
+            if name in delta:
+                item.user_properties.append((f"browser_{name}_delta", delta[name]))
+
+    @pytest.hookimpl(optionalhook=True)
+    def pytest_testnodedown(self, node, error):
+        output = getattr(node, "workeroutput", {}) or {}
+        self.tests.update(output.get("browser_resources", {}))
+
+    def pytest_sessionfinish(self, session):
+        if self.is_worker:
+            self.config.workeroutput["browser_resources"] = self.tests
+            return
+        if not self.tests:
+            return
+        RESOURCES_FILE.parent.mkdir(parents=True, exist_ok=True)
+        with open(RESOURCES_FILE, "w", encoding="utf-8") as f:
+            json.dump(self.tests, f, indent=2, sort_keys=True)
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if self.is_worker or not self.tests:
+            return
+        terminalreporter.section("recursos do browser")
+        terminalreporter.write_line(
+            f"{'heap Δ (KB)':>12}{'nós Δ':>8}{'listeners Δ':>13}{'layout (ms)':>13}{'RSS Δ (KB)':>12}  teste"
+        )
+        ranking = sorted(self.tests.items(), key=lambda kv: -kv[1]["delta"].get("js_heap_used_kb", 0))
+        for nodeid, entry in ranking[:self.top]:
+            d = entry["delta"]
+            rss = d.get("chrome_rss_kb")
+            terminalreporter.write_line(
+                f"{d.get('js_heap_used_kb', 0):>12.0f}{d.get('dom_nodes', 0):>8.0f}"
+                f"{d.get('js_event_listeners', 0):>13.0f}{d.get('layout_ms', 0):>13.1f}"
+                f"{'-' if rss is None else f'{rss:.0f}':>12}  {nodeid}"
+            )
+        terminalreporter.write_line(f"Amostras por teste: {RESOURCES_FILE}")
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("browser-resources", "Recursos do browser por teste")
+    group.addoption("--browser-resources", action="store_true", default=False,
+                    help="Mede heap JS, DOM, listeners, layout e RSS do Chrome por teste")
+    group.addoption("--browser-resources-top", type=int, default=10,
+                    help="Quantos testes mostrar no resumo (padrão: 10)")
+
+
+def pytest_configure(config):
+    if config.getoption("browser_resources"):
+        config.pluginmanager.register(BrowserResourcesPlugin(config), "browser-resources")
@@ -0,0 +1,120 @@
+"""
+Testes em perfis de dispositivo (CPU, rede e tela de aparelhos fracos).
+
+Os perfis ficam em ``utils/device_profiles.py``. Quem escolhe:
+
+- o marker ``@pytest.mark.device("desktop", "low_end_mobile")``, que
+  roda o teste uma vez em cada perfil;
+- senão ``--device-profile`` / ``DEVICE_PROFILE`` (um ou mais nomes
+  separados por vírgula), para todos os testes com browser.
+
+O driver do teste já sai da fixture com o perfil aplicado (antes do
+login do ``authenticated_driver``). Os tempos gravados com a fixture
+``device_timings`` voltam nos relatórios (inclusive dos workers do
+xdist), e o resumo mostra a mediana de cada fluxo por perfil e quanto
+ele piorou em relação ao primeiro perfil da tabela.
+
+Uso:
+    pytest -m device
+    pytest --device-profile low_end_mobile tests/2e2/test_agendamentoVacina.py
+    DEVICE_PROFILE=desktop,mid_tier_mobile pytest -k historico
+"""
+
+import json
+from statistics import median
+
+import pytest
+
+from config.settings import settings
+
+TIMINGS_FILE = settings.REPORTS_DIR / "device_profiles.json"
+TIMING_PREFIX = "device_timing:"
+
+
+def split_names(value):
+    return [name.strip() for name in (value or "").split(",") if name.strip()]
+
+
+class DeviceProfilesPlugin:
+    """Junta os tempos por perfil a partir dos relatórios dos testes."""
+
+    def __init__(self, config):
+        self.config = config
+        # {perfil: {fluxo: [ms, ...]}}
+        self.timings = {}
+
+    def pytest_runtest_logreport(self, report):
+        if report.when != "teardown":
+            return
+        props = dict(report.user_properties)
+        profile = props.get("device_profile")
+        if profile is None:
+            return
+        flows = self.timings.setdefault(profile, {})
+        for key, ms in props.items():
+            if key.startswith(TIMING_PREFIX):
+                flows.setdefault(key[len(TIMING_PREFIX):], []).append(ms)
+
+    def pytest_sessionfinish(self, session):
+        if hasattr(self.config, "workerinput") or not self.timings:
+            return
+        TIMINGS_FILE.parent.mkdir(parents=True, exist_ok=True)
+        with open(TIMINGS_FILE, "w", encoding="utf-8") as f:
+            json.dump(self.timings, f, indent=2, sort_keys=True)
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if hasattr(self.config, "workerinput") or not self.timings:
+            return
+        from utils.device_profiles import PROFILES
+
+        profiles = sorted(self.timings, key=lambda name: list(PROFILES).index(name) if name in PROFILES else len(PROFILES))
+        flows = sorted({flow for by_flow in self.timings.values() for flow in by_flow})
+        baseline = profiles[0]
+        terminalreporter.section(f"tempos por perfil de dispositivo (mediana, ms; piora vs {baseline})")
+        terminalreporter.write_line(f"{'fluxo':<34}" + "".join(f"{name:>22}" for name in profiles))
+        for flow in flows:
+            base = self.timings[baseline].get(flow)
+            base_ms = median(base) if base else None
+            cells = []
+            for name in profiles:
+                values = self.timings[name].get(flow)
+                if not values:
+                    cells.append(f"{'-':>22}")
+                    continue
+                ms = median(values)
+                ratio = f" (x{ms / base_ms:.1f})" if base_ms and name != baseline else ""
+                cells.append(f"{f'{ms:.0f}{ratio}':>22}")
+            terminalreporter.write_line(f"{flow:<34}" + "".join(cells))
+        terminalreporter.write_line(f"Tempos por perfil: {TIMINGS_FILE}")
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("device-profiles", "Perfis de dispositivo (CPU, rede, tela)")
+    group.addoption("--device-profile", default=None,
+                    help="Perfis (separados por vírgula) para os testes com browser; padrão: DEVICE_PROFILE")
+
+
+def selected_profiles(config):
+    option = config.getoption("device_profile")
+    return split_names(option if option is not None else settings.DEVICE_PROFILE)
+
+
+def pytest_configure(config):
+    from utils.device_profiles import resolve_profile
+
+    for name in selected_profiles(config):
+        try:
+            resolve_profile(name)
+        except ValueError as e:
+            raise pytest.UsageError(str(e))
+    config.pluginmanager.register(DeviceProfilesPlugin(config), "device-profiles")
+
+
+def pytest_generate_tests(metafunc):
+    # O driver pede device_profile: só testes com browser entram aqui
+    if "device_profile" not in metafunc.fixturenames:
+        return
+    marker = metafunc.definition.get_closest_marker("device")
+    names = list(marker.args) if marker else selected_profiles(metafunc.config)
+    if names:
+        metafunc.parametrize("device_profile", names, indirect=True)
@@ -0,0 +1,190 @@
+"""
+Agendador do pytest-xdist baseado no histórico de durações.
+
+Os testes são agrupados (mesma classe + mesma fixture cara) e os grupos
+são distribuídos pelo algoritmo LPT: do mais longo para o mais curto,
+sempre para o worker com menos carga prevista. Cada worker consome a
+própria fila; quando ela acaba, rouba um grupo do worker mais carregado,
+o que corrige estimativas erradas sem perder o balanceamento.
+"""
+
+import heapq
+from collections import deque
+
+from xdist.scheduler import LoadScheduling
+
+
+class DurationScheduling(LoadScheduling):
+    """Distribui testes entre os workers do mais longo para o mais curto."""
+
+    # Quantos testes cada worker mantém enviados (o worker precisa
+    # conhecer o próximo item para decidir o teardown das fixtures)
+    PREFETCH = 2
+
+    def __init__(self, config, log=None, store=None, expensive=()):
+        super().__init__(config, log)
+        self.store = store
+        self.expensive = set(expensive)
+        self.node2queue = {}
+
+    def add_node(self, node):
+        super().add_node(node)
+        self.node2queue[node] = deque()
+
+    def schedule(self):
+        assert self.collection_is_completed
+
+        # Distribuição inicial já feita: só reabastece os nós
+        if self.collection is not None:
+            for node in self.nodes:
+                self.check_schedule(node)
+            return
+
+        if not self._check_nodes_have_same_collection():
+            self.log("**Different tests collected, aborting run**")
+            return
+
+        self.collection = list(self.node2collection.values())[0]
+        if not self.collection:
+            return
+
+        self._plan()
+        self.pending[:] = [i for queue in self.node2queue.values() for group in queue for i in group]
+
+        for node in self.nodes:
+            self.check_schedule(node)
+
+    def check_schedule(self, node, duration=0):
+        if node.shutting_down:
+            return
+
+        node_pending = self.node2pending[node]
+        while len(node_pending) < self.PREFETCH:
+            index = self._next_index(node)
+            if index is None:
+                break
+            self.pending.remove(index)
+            node_pending.append(index)
+            node.send_runtest_some([index])
+
+        if not self.node2queue[node] and not self._steal(node):
+            node.shutdown()
+
+        self.log("num items waiting for node:", len(self.pending))
+
+    def mark_test_pending(self, item):
+        index = self.collection.index(item)
+        self.pending.insert(0, index)
+        self._least_loaded_queue().appendleft([index])
+        for node in self.node2pending:
+            self.check_schedule(node)
+
+    def remove_node(self, node):
+        queue = self.node2queue.pop(node, deque())
+        pending = self.node2pending.pop(node)
+        crashitem = self.collection[pending.pop(0)] if pending else None
+
+        # Devolve o que estava com o nó para o worker menos carregado
+        leftover = pending + [i for group in queue for i in group]
+        if leftover and self.node2queue:
+            self.pending.extend(pending)
+            self._least_loaded_queue().append(leftover)
+            for other in self.node2pending:
+                self.check_schedule(other)
+        return crashitem
+
+    # ------------------------------------------------------------------
+    # Planejamento
+    # ------------------------------------------------------------------
+
+    def _estimate(self, index):
+        return self.store.estimate(self.collection[index])
+
+    def _group_key(self, nodeid):
+        """Testes da mesma classe com a mesma fixture cara ficam juntos."""
+        fixtures = [f for f in self.store.fixtures(nodeid) if f in self.expensive]
+        if not fixtures:
+            return nodeid
+        return (nodeid.rsplit("::", 1)[0], tuple(fixtures))
+
+    def _groups(self):
+        groups = {}
+        for index, nodeid in enumerate(self.collection):
+            groups.setdefault(self._group_key(nodeid), []).append(index)
+
+        total = sum(self._estimate(i) for i in range(len(self.collection)))
+        target = total / max(len(self.nodes), 1)
+
+        # Um grupo maior que a carga ideal de um worker é quebrado, senão
+        # o worker que o recebe vira o gargalo da execução
+        result = []
+        for indices in groups.values():
+            chunk, chunk_time = [], 0.0
+            for index in indices:
+                cost = self._estimate(index)
+                if chunk and chunk_time + cost > target:
+                    result.append(chunk)
+                    chunk, chunk_time = [], 0.0
+                chunk.append(index)
+                chunk_time += cost
+            result.append(chunk)
+        return result
+
+    def _group_time(self, group):
+        return sum(self._estimate(i) for i in group)
+
+    def _plan(self):
+        """LPT: grupo mais longo vai para o worker com menor carga."""
+        groups = sorted(self._groups(), key=self._group_time, reverse=True)
+        heap = [(0.0, position, node) for position, node in enumerate(self.nodes)]
+        heapq.heapify(heap)
+
+        for group in groups:
+            load, position, node = heapq.heappop(heap)
+            self.node2queue[node].append(group)
+            heapq.heappush(heap, (load + self._group_time(group), position, node))
+
+        for node, queue in self.node2queue.items():
+            self.log(f"{node.gateway.id}: {sum(self._group_time(g) for g in queue):.1f}s previstos")
+
+    def _queue_time(self, queue):
+        return sum(self._group_time(group) for group in queue)
+
+    def _least_loaded_queue(self):
+        return min(self.node2queue.values(), key=self._queue_time)
+
+    def _next_index(self, node):
+        queue = self.node2queue[node]
+        while queue and not queue[0]:
+            queue.popleft()
+        if not queue and not self._steal(node):
+            return None
+        index = queue[0].pop(0)
+        if not queue[0]:
+            queue.popleft()
+        return index
+
+    def _steal(self, node):
+        """Rouba trabalho do worker com mais tempo previsto na fila."""
+        donors = [
+            (self._queue_time(queue), other)
+            for other, queue in self.node2queue.items()
+            if other is not node and queue and not other.shutting_down
+        ]
+        if not donors:
+            return False
+
+        _, donor = max(donors, key=lambda d: d[0])
+        donor_queue = self.node2queue[donor]
+
+        if len(donor_queue) > 1:
+            # Grupos estão em ordem decrescente: o último é o mais curto
+            self.node2queue[node].append(donor_queue.pop())
+        elif len(donor_queue[0]) > 1:
+            group = donor_queue[0]
+            half = len(group) // 2
+            self.node2queue[node].append(group[half:])
+            del group[half:]
+        else:
+            return False
+        return True
@@ -0,0 +1,158 @@
+"""
+Plugin de durações dos testes.
+
+Grava a duração de cada teste (setup + call + teardown) em
+``reports/durations.json`` ao fim da sessão e, com ``--dist-durations``,
+entrega ao pytest-xdist um agendador que usa essas durações para
+distribuir os testes do mais longo para o mais curto.
+
+Uso:
+    pytest -n 4 --dist-durations
+"""
+
+import json
+import statistics
+
+import pytest
+
+from config.settings import settings
+
+# Estimativa usada quando ainda não há histórico nenhum
+DEFAULT_DURATION = 1.0
+
+# Peso da execução mais recente na média móvel
+SMOOTHING = 0.5
+
+
+class DurationStore:
+    """Histórico de durações e fixtures caras por nodeid."""
+
+    def __init__(self, path):
+        self.path = path
+        self.data = {}
+        self.load()
+
+    def load(self):
+        """Carrega o histórico do disco (vazio se não existir)."""
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                self.data = json.load(f)
+        except (OSError, ValueError):
+            self.data = {}
+
+    def save(self):
+        """Persiste o histórico no disco."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump(self.data, f, indent=2, sort_keys=True)
+
+    def record(self, nodeid, duration):
+        """Atualiza a duração de um teste (média móvel exponencial)."""
+        entry = self.data.setdefault(nodeid, {})
+        previous = entry.get("duration")
+        if previous is None:
+            entry["duration"] = round(duration, 4)
+        else:
+            entry["duration"] = round(SMOOTHING * duration + (1 - SMOOTHING) * previous, 4)
+
+    def record_fixtures(self, nodeid, fixtures):
+        """Guarda as fixtures caras usadas pelo teste."""
+        self.data.setdefault(nodeid, {})["fixtures"] = sorted(fixtures)
+
+    def fixtures(self, nodeid):
+        return self.data.get(nodeid, {}).get("fixtures", [])
+
+    def estimate(self, nodeid):
+        """Duração esperada do teste; testes novos recebem a mediana."""
+        entry = self.data.get(nodeid)
+        if entry and "duration" in entry:
+            return entry["duration"]
+        known = [e["duration"] for e in self.data.values() if "duration" in e]
+        return statistics.median(known) if known else DEFAULT_DURATION
+
+
+class DurationsPlugin:
+    """Coleta durações durante a sessão e grava o histórico no final."""
+
+    def __init__(self, config):
+        self.config = config
+        self.store = DurationStore(config.getoption("durations_file"))
+        self.expensive = set(config.getini("expensive_fixtures"))
+        self.current = {}
+        self.fixtures = {}
+
+    @property
+    def is_worker(self):
+        return hasattr(self.config, "workerinput")
+
+    @pytest.hookimpl(trylast=True)
+    def pytest_collection_modifyitems(self, items):
+        for item in items:
+            used = self.expensive.intersection(getattr(item, "fixturenames", ()))
+            if used:
+                self.fixtures[item.nodeid] = sorted(used)
+
+    def pytest_runtest_logreport(self, report):
+        # Tentativas reexecutadas (plugins/flaky.py) não contam: só a última
+        if report.outcome == "rerun":
+            return
+        self.current[report.nodeid] = self.current.get(report.nodeid, 0.0) + report.duration
+
+    @pytest.hookimpl(optionalhook=True)
+    def pytest_testnodedown(self, node, error):
+        # Workers do xdist mandam as fixtures que coletaram
+        output = getattr(node, "workeroutput", {}) or {}
+        self.fixtures.update(output.get("expensive_fixtures", {}))
+
+    def pytest_sessionfinish(self, session):
+        if self.is_worker:
+            self.config.workeroutput["expensive_fixtures"] = self.fixtures
+            return
+
+        # Relê o arquivo: outra sessão (ex.: camadas em paralelo) pode ter gravado
+        self.store.load()
+        for nodeid, duration in self.current.items():
+            self.store.record(nodeid, duration)
+        for nodeid, fixtures in self.fixtures.items():
+            self.store.record_fixtures(nodeid, fixtures)
+        if self.current:
+            self.store.save()
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("durations", "Agendamento por duração")
+    group.addoption(
+        "--dist-durations",
+        action="store_true",
+        default=False,
+        help="Distribui os testes no xdist pelo histórico de durações (mais longos primeiro)",
+    )
+    group.addoption(
+        "--durations-file",
+        default=settings.DURATIONS_FILE,
+        type=lambda value: settings.BASE_DIR / value,
+        help="Arquivo com o histórico de durações (padrão: reports/durations.json)",
+    )
+    parser.addini(
+        "expensive_fixtures",
+        type="linelist",
+        default=["authenticated_driver"],
+        help="Fixtures caras: testes da mesma classe que as usam ficam no mesmo worker",
+    )
+
+
+def pytest_configure(config):
+    plugin = DurationsPlugin(config)
+    config.pluginmanager.register(plugin, "durations-plugin")
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_xdist_make_scheduler(config, log):
+    if not config.getoption("dist_durations"):
+        return None
+
+    from plugins.duration_scheduler import DurationScheduling
+
+    plugin = config.pluginmanager.get_plugin("durations-plugin")
+    return DurationScheduling(config, log, store=plugin.store,
+                              expensive=plugin.expensive)
@@ -0,0 +1,224 @@
+"""
+Detecção de testes instáveis (flaky) com reexecução direcionada.
+
+- Um teste que falha com uma exceção transitória (``TimeoutException``,
+  ``StaleElementReferenceException``...) é reexecutado até
+  ``--flaky-reruns`` vezes, sempre com um browser novo. Qualquer outra
+  falha (assert, erro de código) não é reexecutada.
+- O resultado final de cada teste (passed / flaky / failed) é gravado em
+  ``reports/flaky.db`` (SQLite). O score de instabilidade é a fração de
+  execuções "flaky" nas últimas ``WINDOW`` execuções.
+- Testes com score acima de ``QUARANTINE_SCORE`` entram em quarentena:
+  continuam rodando, mas como ``xfail`` não estrito, sem quebrar o build.
+
+Uso:
+    pytest --flaky-reruns 2
+    pytest --flaky-report          # mostra o ranking de instabilidade
+"""
+
+import sqlite3
+import time
+
+import pytest
+from _pytest.runner import runtestprotocol
+from selenium.common.exceptions import (
+    ElementClickInterceptedException,
+    StaleElementReferenceException,
+    TimeoutException,
+)
+
+from config.settings import settings
+
+TRANSIENT_EXCEPTIONS = (
+    TimeoutException,
+    StaleElementReferenceException,
+    ElementClickInterceptedException,
+)
+
+# Quantas execuções recentes entram no cálculo do score
+WINDOW = 20
+# Mínimo de execuções antes de colocar um teste em quarentena
+MIN_RUNS = 5
+QUARANTINE_SCORE = 0.3
+
+FLAKY_DB = settings.REPORTS_DIR / "flaky.db"
+
+
+class FlakyDatabase:
+    """Histórico de resultados por teste em SQLite."""
+
+    def __init__(self, path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(path, timeout=30)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS runs ("
+            " nodeid TEXT NOT NULL,"
+            " outcome TEXT NOT NULL,"
+            " attempts INTEGER NOT NULL,"
+            " created_at REAL NOT NULL)"
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS runs_nodeid ON runs (nodeid, created_at)")
+        self.conn.commit()
+
+    def record_many(self, rows):
+        self.conn.executemany(
+            "INSERT INTO runs (nodeid, outcome, attempts, created_at) VALUES (?, ?, ?, ?)",
+            rows,
+        )
+        self.conn.commit()
+
+    def scores(self, window=WINDOW):
+        """Retorna {nodeid: (score, execuções)} das últimas ``window`` execuções."""
+        rows = self.conn.execute(
+            "SELECT nodeid, outcome FROM ("
+            " SELECT nodeid, outcome, ROW_NUMBER() OVER ("
+            "  PARTITION BY nodeid ORDER BY created_at DESC) AS position"
+            " FROM runs)"
+            " WHERE position <= ?",
+            (window,),
+        ).fetchall()
+
+        totals = {}
+        for nodeid, outcome in rows:
+            flaky, runs = totals.get(nodeid, (0, 0))
+            totals[nodeid] = (flaky + (outcome == "flaky"), runs + 1)
+        return {nodeid: (flaky / runs, runs) for nodeid, (flaky, runs) in totals.items()}
+
+    def close(self):
+        self.conn.close()
+
+
+def report_failed(report):
+    """Falhou, inclusive em quarentena: o xfail que falha vira "skipped" com ``wasxfail``."""
+    return report.failed or (report.skipped and hasattr(report, "wasxfail"))
+
+
+def is_transient_failure(reports):
+    """True se a falha veio só de exceções transitórias."""
+    failed = [r for r in reports if report_failed(r)]
+    return bool(failed) and all(getattr(r, "transient", False) for r in failed)
+
+
+class FlakyPlugin:
+    """Reexecuta falhas transitórias e mantém o score de instabilidade."""
+
+    def __init__(self, config):
+        self.config = config
+        self.max_reruns = config.getoption("flaky_reruns")
+        self.quarantine = not config.getoption("no_quarantine")
+        self.db = FlakyDatabase(FLAKY_DB)
+        self.scores = self.db.scores()
+        self.results = []
+        # Com xdist quem executa (e registra) são os workers
+        self.is_controller = (
+            not hasattr(config, "workerinput")
+            and getattr(config.option, "dist", "no") != "no"
+        )
+
+    def is_quarantined(self, nodeid):
+        score, runs = self.scores.get(nodeid, (0.0, 0))
+        return runs >= MIN_RUNS and score >= QUARANTINE_SCORE
+
+    def pytest_collection_modifyitems(self, items):
+        if not self.quarantine:
+            return
+        for item in items:
+            if self.is_quarantined(item.nodeid):
+                score, _ = self.scores[item.nodeid]
+                item.add_marker(pytest.mark.xfail(
+                    reason=f"quarentena: flaky em {score:.0%} das últimas execuções",
+                    strict=False,
+                ))
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_makereport(self, item, call):
+        outcome = yield
+        rep = outcome.get_result()
+        rep.transient = bool(call.excinfo) and call.excinfo.errisinstance(TRANSIENT_EXCEPTIONS)
+
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_runtest_protocol(self, item, nextitem):
+        if self.max_reruns <= 0:
+            return None
+
+        item.ihook.pytest_runtest_logstart(nodeid=item.nodeid, location=item.location)
+
+        for attempt in range(self.max_reruns + 1):
+            item.flaky_attempt = attempt
+            is_last = attempt == self.max_reruns
+            # Nas tentativas que podem ser repetidas, desmonta só as fixtures
+            # da função (o browser) e mantém as de sessão (mock backend)
+            reports = runtestprotocol(item, nextitem=nextitem if is_last else item.parent, log=False)
+
+            if is_last or not is_transient_failure(reports):
+                break
+
+            for report in reports:
+                if report_failed(report):
+                    report.outcome = "rerun"
+                    item.ihook.pytest_runtest_logreport(report=report)
+
+        for report in reports:
+            item.ihook.pytest_runtest_logreport(report=report)
+        item.ihook.pytest_runtest_logfinish(nodeid=item.nodeid, location=item.location)
+
+        self._record(item.nodeid, reports, attempt)
+        return True
+
+    def _record(self, nodeid, reports, attempt):
+        if any(report_failed(r) for r in reports):
+            outcome = "failed"
+        elif attempt > 0:
+            outcome = "flaky"
+        else:
+            outcome = "passed"
+        self.results.append((nodeid, outcome, attempt + 1, time.time()))
+
+    def pytest_runtest_logreport(self, report):
+        # Sem reexecução o protocolo padrão roda: registra pelo relatório da call
+        if self.max_reruns > 0:
+            return
+        failed = report_failed(report)
+        if report.when == "call" or (report.when == "setup" and failed):
+            self.results.append((report.nodeid, "failed" if failed else "passed", 1, time.time()))
+
+    def pytest_report_teststatus(self, report):
+        if report.outcome == "rerun":
+            return "rerun", "R", ("RERUN", {"yellow": True})
+        return None
+
+    def pytest_sessionfinish(self, session):
+        if self.results and not self.is_controller:
+            self.db.record_many(self.results)
+        self.scores = self.db.scores()
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if not self.config.getoption("flaky_report"):
+            return
+        ranking = sorted(
+            ((score, runs, nodeid) for nodeid, (score, runs) in self.scores.items() if score > 0),
+            reverse=True,
+        )
+        terminalreporter.section("testes instáveis")
+        if not ranking:
+            terminalreporter.write_line("Nenhum teste instável registrado.")
+        for score, runs, nodeid in ranking:
+            flag = " [quarentena]" if self.is_quarantined(nodeid) else ""
+            terminalreporter.write_line(f"{score:6.0%}  ({runs} execuções)  {nodeid}{flag}")
+
+    def pytest_unconfigure(self, config):
+        self.db.close()
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("flaky", "Testes instáveis")
+    group.addoption("--flaky-reruns", type=int, default=settings.FLAKY_RERUNS,
+                    help="Reexecuções para falhas transitórias (padrão: FLAKY_RERUNS ou 0)")
+    group.addoption("--no-quarantine", action="store_true", default=False,
+                    help="Não coloca testes instáveis em quarentena (xfail)")
+    group.addoption("--flaky-report", action="store_true", default=False,
+                    help="Mostra o ranking de instabilidade no final")
+
+
+def pytest_configure(config):
+    config.pluginmanager.register(FlakyPlugin(config), "flaky-plugin")
@@ -0,0 +1,292 @@
+"""
+Seleção de testes pelo impacto das mudanças no frontend.
+
+Com ``--impact`` só rodam os testes afetados pelo ``git diff`` contra
+``--impact-base`` (padrão: HEAD, ou seja, as mudanças locais):
+
+- arquivo do frontend -> page objects da rota (``ROUTE_PAGES``) -> testes
+  que usam esses page objects;
+- page object alterado -> testes que o usam;
+- arquivo de teste alterado -> o próprio arquivo;
+- ``conftest.py`` dentro de ``tests/`` -> todos os testes do diretório;
+- qualquer outro arquivo da suíte (conftest da raiz, config, utils,
+  plugins, pytest.ini, requirements.txt...) ou arquivo global do
+  frontend (layout, componentes base, package.json...) -> tudo. Só a
+  documentação (``*.md``) fica de fora.
+
+Com ``--impact-learn`` a execução grava as rotas visitadas por cada teste
+em ``reports/impact_map.json``; nas próximas seleções esse mapa é usado
+junto com o estático.
+
+``--impact-files`` recebe a lista de arquivos alterados (relativos à
+suíte) no lugar do ``git diff``; é o que o ``run_daemon.py watch`` usa.
+
+Uso:
+    pytest --impact-learn                 # execução completa, aprende o mapa
+    pytest --impact                       # só o que as mudanças locais afetam
+    pytest --impact --impact-base main    # tudo que mudou desde a main
+"""
+
+import json
+import subprocess
+from pathlib import Path
+from urllib.parse import urlparse
+
+import pytest
+
+from config.settings import settings
+
+LOGIN_PAGE = "pages/login_page.py"
+CADASTRO_PAGE = "pages/cadastro_page.py"
+DASHBOARD_PAGE = "pages/dashboard_page.py"
+SCHEDULE_PAGE = "pages/agendamentoVacina_page.py"
+
+# Prefixo do arquivo no frontend -> page objects afetados
+ROUTE_PAGES = {
+    "app/login": [LOGIN_PAGE],
+    "app/cadastro": [CADASTRO_PAGE],
+    "app/dashboard": [DASHBOARD_PAGE, SCHEDULE_PAGE],
+    # authService também é usado no login e no cadastro
+    "services/api.ts": [LOGIN_PAGE, CADASTRO_PAGE, DASHBOARD_PAGE, SCHEDULE_PAGE],
+    "context/AuthContext.tsx": [LOGIN_PAGE, CADASTRO_PAGE, DASHBOARD_PAGE],
+    "components/ui/vaccine-schedule-form.tsx": [SCHEDULE_PAGE],
+    "components/ui/vaccine-calendar.tsx": [DASHBOARD_PAGE],
+    "components/ui/vaccine-list.tsx": [DASHBOARD_PAGE],
+    "components/ui/settings-modal.tsx": [DASHBOARD_PAGE],
+    "components/ui/sidebar.tsx": [DASHBOARD_PAGE, SCHEDULE_PAGE],
+    "components/ui/user-list.tsx": [DASHBOARD_PAGE],
+}
+
+# Arquivos do frontend sem rota específica: qualquer mudança roda tudo
+FRONTEND_GLOBAL = (
+    "app/layout.tsx", "app/globals.css", "components/", "context/", "hooks/",
+    "lib/", "services/", "public/",
+    "package.json", "package-lock.json", "next.config.ts", "proxy.ts", "tsconfig.json",
+    "postcss.config.mjs",
+)
+
+# Fixtures que navegam por conta própria antes do teste
+FIXTURE_PAGES = {
+    "authenticated_driver": [LOGIN_PAGE, DASHBOARD_PAGE],
+}
+
+SUITE_DIR = settings.BASE_DIR
+IMPACT_MAP_FILE = settings.REPORTS_DIR / "impact_map.json"
+
+
+def git(*args, cwd=SUITE_DIR):
+    """Saída do git; erro do git (base inválida, fora de um checkout) vira UsageError."""
+    try:
+        result = subprocess.run(["git", *args], cwd=cwd, capture_output=True, text=True, check=True)
+    except FileNotFoundError:
+        raise pytest.UsageError("--impact precisa do git instalado")
+    except subprocess.CalledProcessError as e:
+        raise pytest.UsageError(f"git {' '.join(args)} falhou: {e.stderr.strip() or e.returncode}")
+    return result.stdout
+
+
+def changed_files(base):
+    """Arquivos alterados (relativos à raiz do repositório) e a raiz."""
+    root = Path(git("rev-parse", "--show-toplevel").strip())
+    files = set(git("diff", "--name-only", base, cwd=root).split())
+    files |= set(git("ls-files", "--others", "--exclude-standard", cwd=root).split())
+    return root, files
+
+
+def route_source(url):
+    """Converte URL visitada no diretório da rota (``/login`` -> ``app/login``)."""
+    segment = urlparse(url).path.strip("/").split("/")[0]
+    return f"app/{segment}" if segment else "app/page.tsx"
+
+
+def item_pages(item):
+    """Page objects usados pelo teste (nomes referenciados + fixtures)."""
+    pages = set()
+    module_globals = vars(item.module)
+    for name in item.function.__code__.co_names:
+        module = getattr(module_globals.get(name), "__module__", "") or ""
+        if module.startswith("pages."):
+            pages.add(module.replace(".", "/") + ".py")
+    for fixture, fixture_pages in FIXTURE_PAGES.items():
+        if fixture in item.fixturenames:
+            pages.update(fixture_pages)
+    return pages
+
+
+class ImpactSelector:
+    """Decide quais testes são afetados por um conjunto de arquivos."""
+
+    def __init__(self, files, suite_prefix, learned=None):
+        self.files = files
+        self.suite_prefix = suite_prefix
+        self.learned = learned or {}
+        self.run_all = False
+        self.pages = set()
+        self.test_files = set()
+        self.test_dirs = set()
+        self.sources = set()
+        self._classify()
+
+    def _classify(self):
+        for path in self.files:
+            if self.suite_prefix and path.startswith(self.suite_prefix):
+                self._classify_suite_file(path[len(self.suite_prefix):])
+            else:
+                self._classify_frontend_file(path)
+
+    def _classify_suite_file(self, path):
+        name = Path(path).name
+        if name.endswith(".md"):
+            return
+        if path.startswith("pages/") and name.endswith("_page.py") and name != "base_page.py":
+            self.pages.add(path)
+        elif path.startswith("tests/") and name.startswith("test_") and name.endswith(".py"):
+            self.test_files.add(path)
+        elif path.startswith("tests/") and name == "conftest.py":
+            self.test_dirs.add(Path(path).parent.as_posix() + "/")
+        else:
+            # base_page, conftest da raiz, config, utils, plugins, pytest.ini...
+            self.run_all = True
+
+    def _classify_frontend_file(self, path):
+        matched = False
+        for prefix, pages in ROUTE_PAGES.items():
+            if path == prefix or path.startswith(prefix + "/"):
+                self.pages.update(pages)
+                self.sources.add(prefix)
+                matched = True
+        if matched:
+            return
+        if path.startswith(FRONTEND_GLOBAL):
+            self.run_all = True
+        elif path.startswith("app/"):
+            # Rota sem page object: só o mapa aprendido sabe quem a visita
+            self.sources.add(route_source("/" + path[len("app/"):]))
+            if not self.learned:
+                self.run_all = True
+
+    def is_affected(self, item, relpath):
+        if self.run_all:
+            return True
+        if relpath in self.test_files or relpath.startswith(tuple(self.test_dirs)):
+            return True
+        if item_pages(item) & self.pages:
+            return True
+        visited = self.learned.get(item.nodeid, [])
+        return any(route_source(url) in self.sources for url in visited)
+
+
+class ImpactLearner:
+    """Grava as URLs visitadas por cada teste durante a execução."""
+
+    def __init__(self):
+        self.visits = {}
+        self.current = None
+
+    def _wrap_get(self, driver):
+        if getattr(driver, "_impact_wrapped", False):
+            return
+        original_get = driver.get
+
+        def get(url):
+            if self.current is not None:
+                self.visits.setdefault(self.current, set()).add(url)
+            return original_get(url)
+
+        driver.get = get
+        driver._impact_wrapped = True
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_setup(self, item):
+        self.current = item.nodeid
+        yield
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_fixture_setup(self, fixturedef, request):
+        outcome = yield
+        if fixturedef.argname in ("driver", "shared_driver") and not outcome.excinfo:
+            self._wrap_get(outcome.get_result())
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_teardown(self, item):
+        # URL final cobre navegações feitas por clique (roteamento do Next)
+        driver = item.funcargs.get("driver") if hasattr(item, "funcargs") else None
+        if driver is not None:
+            try:
+                self.visits.setdefault(item.nodeid, set()).add(driver.current_url)
+            except Exception:
+                pass
+        yield
+        self.current = None
+
+    @pytest.hookimpl(optionalhook=True)
+    def pytest_testnodedown(self, node, error):
+        # Workers do xdist mandam as visitas que gravaram
+        output = getattr(node, "workeroutput", {}) or {}
+        for nodeid, urls in output.get("impact_visits", {}).items():
+            self.visits.setdefault(nodeid, set()).update(urls)
+
+    def pytest_sessionfinish(self, session):
+        if hasattr(session.config, "workerinput"):
+            session.config.workeroutput["impact_visits"] = {
+                nodeid: sorted(urls) for nodeid, urls in self.visits.items()
+            }
+        else:
+            self.save(IMPACT_MAP_FILE)
+
+    def save(self, path):
+        data = load_learned(path)
+        for nodeid, urls in self.visits.items():
+            data[nodeid] = sorted(u for u in urls if u.startswith("http"))
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2, sort_keys=True)
+
+
+def load_learned(path):
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("impact", "Seleção por impacto")
+    group.addoption("--impact", action="store_true", default=False,
+                    help="Roda só os testes afetados pelo git diff")
+    group.addoption("--impact-base", default="HEAD",
+                    help="Referência do git para o diff (padrão: HEAD)")
+    group.addoption("--impact-learn", action="store_true", default=False,
+                    help="Grava as rotas visitadas por teste em reports/impact_map.json")
+    group.addoption("--impact-files", default=None,
+                    help="Arquivos alterados, separados por vírgula (relativos à suíte), no lugar do git diff")
+
+
+def pytest_configure(config):
+    if config.getoption("impact_learn"):
+        config.pluginmanager.register(ImpactLearner(), "impact-learner")
+
+
+def pytest_collection_modifyitems(config, items):
+    impact_files = config.getoption("impact_files")
+    if not (config.getoption("impact") or impact_files):
+        return
+
+    if impact_files:
+        root = Path(git("rev-parse", "--show-toplevel").strip())
+        suite_prefix = SUITE_DIR.resolve().relative_to(root.resolve()).as_posix() + "/"
+        files = {suite_prefix + f.strip() for f in impact_files.split(",") if f.strip()}
+    else:
+        root, files = changed_files(config.getoption("impact_base"))
+        suite_prefix = SUITE_DIR.resolve().relative_to(root.resolve()).as_posix() + "/"
+    selector = ImpactSelector(files, suite_prefix, load_learned(IMPACT_MAP_FILE))
+
+    selected, deselected = [], []
+    for item in items:
+        relpath = Path(item.fspath).resolve().relative_to(SUITE_DIR.resolve()).as_posix()
+        (selected if selector.is_affected(item, relpath) else deselected).append(item)
+
+    if deselected:
+        config.hook.pytest_deselected(items=deselected)
+        items[:] = selected
@@ -0,0 +1,89 @@
+"""
+Verificação rápida do ambiente antes de abrir qualquer browser.
+
+Com ``--preflight`` a sessão é abortada em poucos segundos se o
+frontend (``FRONTEND_URL``) não responder, em vez de cada teste esperar
+``EXPLICIT_WAIT`` até estourar o timeout.
+
+Com ``--preflight-locators`` confere também os localizadores de todos os
+Page Objects sem abrir browser (``utils/locators.py``): o HTML de cada
+rota é buscado uma vez e avaliado com lxml, e o que não dá para ver assim
+é procurado no código do frontend. Localizador quebrado aborta a sessão
+em segundos, antes do primeiro teste.
+"""
+
+import time
+import urllib.error
+import urllib.request
+
+import pytest
+
+from config.settings import settings
+
+PREFLIGHT_TIMEOUT = 3
+
+
+def check_url(url, timeout=PREFLIGHT_TIMEOUT):
+    """Retorna None se a URL responder, ou a mensagem de erro."""
+    try:
+        with urllib.request.urlopen(url, timeout=timeout):
+            return None
+    except urllib.error.HTTPError as e:
+        # O servidor respondeu; status de erro não significa que está fora do ar
+        if e.code < 500:
+            return None
+        return f"HTTP {e.code}"
+    except (urllib.error.URLError, OSError) as e:
+        return str(getattr(e, "reason", e))
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--preflight",
+        action="store_true",
+        default=False,
+        help="Aborta a sessão se o frontend não estiver respondendo",
+    )
+    parser.addoption(
+        "--preflight-locators",
+        action="store_true",
+        default=False,
+        help="Confere os localizadores dos Page Objects contra o frontend antes dos testes",
+    )
+
+
+def check_locators(config):
+    """Roda o ``LocatorCheck`` e aborta a sessão se algum localizador quebrou."""
+    from utils.locators import LocatorCheck
+
+    start = time.perf_counter()
+    # Frontend gerenciado ainda não subiu: só a conferência no código
+    base_url = None if settings.FRONTEND_MANAGED else settings.FRONTEND_URL
+    results = LocatorCheck(settings.FRONTEND_DIR, base_url).run()
+    elapsed = time.perf_counter() - start
+
+    failed = [r for r in results if not r["ok"]]
+    on_dom = sum(1 for r in results if r["via"] == "dom")
+    writer = config.get_terminal_writer()
+    writer.line(
+        f"🔎 {len(results)} localizadores em {elapsed:.2f}s "
+        f"({on_dom} no DOM, {len(results) - on_dom} no código)"
+    )
+    for r in failed:
+        by, value = r["locator"]
+        writer.line(f"   ❌ {r['page']}.{r['name']} ({by}: {value}): {r['detail']}", red=True)
+    if failed:
+        pytest.exit(f"❌ {len(failed)} localizador(es) quebrado(s)", returncode=3)
+
+
+def pytest_sessionstart(session):
+    config = session.config
+    if hasattr(config, "workerinput"):
+        return
+    if config.getoption("preflight") and not settings.FRONTEND_MANAGED:
+        # Frontend gerenciado ainda não subiu; a fixture já falha rápido sozinha
+        error = check_url(settings.FRONTEND_URL)
+        if error:
+            pytest.exit(f"❌ Frontend fora do ar em {settings.FRONTEND_URL}: {error}", returncode=3)
+    if config.getoption("preflight_locators"):
+        check_locators(config)
@@ -0,0 +1,229 @@
+"""
+Profiler dos comandos WebDriver enviados pelos testes.
+
+Com ``--wd-profile`` cada comando que o driver das fixtures manda ao
+chromedriver (``RemoteConnection.execute``) é medido:
+
+- por teste, um histograma compacto por comando (quantidade, tempo total,
+  máximo, bytes enviados e contagem por faixa de latência em potências
+  de 2 ms);
+- na sessão, os pontos dos page objects (``pages/``) que mais gastam
+  tempo em comandos: o método de page object mais externo na pilha de
+  cada comando (ex.: ``DashboardPage.get_welcome_message``).
+
+Tudo vai para ``reports/webdriver_profile.json``; o resumo (comandos e
+top-N dos page objects) sai no final da execução.
+
+Uso:
+    pytest --wd-profile
+    pytest --wd-profile --wd-profile-top 25
+"""
+
+import json
+import sys
+import time
+
+import pytest
+
+from config.settings import SUITE_DIR, settings
+
+PROFILE_FILE = settings.REPORTS_DIR / "webdriver_profile.json"
+PAGES_DIR = str(SUITE_DIR / "pages")
+
+# Limites superiores das faixas do histograma (ms); a última é "acima de"
+BUCKETS_MS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024, 2048, 4096)
+
+
+def bucket_index(ms):
+    for index, limit in enumerate(BUCKETS_MS):
+        if ms <= limit:
+            return index
+    return len(BUCKETS_MS)
+
+
+def new_histogram():
+    return {"count": 0, "total_ms": 0.0, "max_ms": 0.0, "bytes": 0, "buckets": [0] * (len(BUCKETS_MS) + 1)}
+
+
+def add_sample(histogram, ms, size):
+    histogram["count"] += 1
+    histogram["total_ms"] += ms
+    histogram["max_ms"] = max(histogram["max_ms"], ms)
+    histogram["bytes"] += size
+    histogram["buckets"][bucket_index(ms)] += 1
+
+
+def merge_histogram(target, source):
+    target["count"] += source["count"]
+    target["total_ms"] += source["total_ms"]
+    target["max_ms"] = max(target["max_ms"], source["max_ms"])
+    target["bytes"] += source["bytes"]
+    target["buckets"] = [a + b for a, b in zip(target["buckets"], source["buckets"])]
+
+
+def histogram_percentile(histogram, pct):
+    """Limite superior da faixa que contém o percentil (ms)."""
+    wanted = histogram["count"] * pct / 100
+    seen = 0
+    for index, count in enumerate(histogram["buckets"]):
+        seen += count
+        if count and seen >= wanted:
+            return min(BUCKETS_MS[index], histogram["max_ms"]) if index < len(BUCKETS_MS) else histogram["max_ms"]
+    return histogram["max_ms"]
+
+
+def page_call_site():
+    """Método de page object mais externo na pilha atual (ou None)."""
+    site = None
+    frame = sys._getframe(2)
+    while frame is not None:
+        code = frame.f_code
+        if code.co_filename.startswith(PAGES_DIR):
+            site = code
+        frame = frame.f_back
+    if site is None:
+        return None
+    relpath = site.co_filename[len(str(SUITE_DIR)) + 1:]
+    return f"{relpath}:{site.co_firstlineno} {site.co_qualname}"
+
+
+class WebDriverProfiler:
+    """Mede os comandos dos drivers criados pela fixture ``driver``."""
+
+    def __init__(self, config):
+        self.config = config
+        self.top = config.getoption("wd_profile_top")
+        self.current = None
+        self.tests = {}
+        self.call_sites = {}
+
+    @property
+    def is_worker(self):
+        return hasattr(self.config, "workerinput")
+
+    def attach(self, driver):
+        executor = driver.command_executor
+        if getattr(executor, "_wd_profiled", False):
+            return
+        execute, send = executor.execute, executor._request
+        sent = [0]
+
+        # Tamanho do corpo já serializado pelo Selenium (sem serializar de novo)
+        def request(method, url, body=None):
+            sent[0] = len(body) if body else 0
+            return send(method, url, body=body)
+
+        def profiled_execute(command, params):
+            sent[0] = 0
+            start = time.perf_counter()
+            try:
+                return execute(command, params)
+            finally:
+                self.record(command, (time.perf_counter() - start) * 1000, sent[0])
+
+        executor._request = request
+        executor.execute = profiled_execute
+        executor._wd_profiled = True
+
+    def record(self, command, ms, size):
+        if self.current is None:
+            return
+        commands = self.tests.setdefault(self.current, {})
+        add_sample(commands.setdefault(command, new_histogram()), ms, size)
+        site = page_call_site()
+        if site is not None:
+            entry = self.call_sites.setdefault(site, {"commands": 0, "total_ms": 0.0})
+            entry["commands"] += 1
+            entry["total_ms"] += ms
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_protocol(self, item, nextitem):
+        self.current = item.nodeid
+        yield
+        commands = self.tests.get(item.nodeid, {})
+        item.user_properties.append(("webdriver_commands", sum(h["count"] for h in commands.values())))
+        item.user_properties.append(
+            ("webdriver_time_ms", round(sum(h["total_ms"] for h in commands.values()), 1))
+        )
+        self.current = None
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_fixture_setup(self, fixturedef, request):
+        outcome = yield
+        if fixturedef.argname == "driver" and not outcome.excinfo:
+            self.attach(outcome.get_result())
+
+    @pytest.hookimpl(optionalhook=True)
+    def pytest_testnodedown(self, node, error):
+        # Workers do xdist mandam o que mediram
+        output = (getattr(node, "workeroutput", {}) or {}).get("webdriver_profile")
+        if not output:
+            return
+        self.tests.update(output["tests"])
+        for site, entry in output["call_sites"].items():
+            total = self.call_sites.setdefault(site, {"commands": 0, "total_ms": 0.0})
+            total["commands"] += entry["commands"]
+            total["total_ms"] += entry["total_ms"]
+
+    def pytest_sessionfinish(self, session):
+        if self.is_worker:
+            self.config.workeroutput["webdriver_profile"] = {"tests": self.tests, "call_sites": self.call_sites}
+            return
+        PROFILE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        with open(PROFILE_FILE, "w", encoding="utf-8") as f:
+            json.dump({
+                "buckets_ms": list(BUCKETS_MS),
+                "commands": self.command_totals(),
+                "call_sites": self.top_call_sites(),
+                "tests": self.tests,
+            }, f, indent=2, sort_keys=True)
+
+    def command_totals(self):
+        totals = {}
+        for commands in self.tests.values():
+            for command, histogram in commands.items():
+                merge_histogram(totals.setdefault(command, new_histogram()), histogram)
+        return totals
+
+    def top_call_sites(self):
+        ranking = sorted(self.call_sites.items(), key=lambda kv: -kv[1]["total_ms"])
+        return [{"site": site, **entry} for site, entry in ranking[:self.top]]
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if self.is_worker or not self.tests:
+            return
+        totals = self.command_totals()
+        count = sum(h["count"] for h in totals.values())
+        terminalreporter.section("comandos WebDriver")
+        terminalreporter.write_line(
+            f"{count} comandos em {len(self.tests)} testes ({count / len(self.tests):.1f} por teste)"
+        )
+        terminalreporter.write_line(
+            f"{'comando':<28}{'qtd':>7}{'total (ms)':>12}{'p50≤':>8}{'p95≤':>8}{'máx':>9}{'KB env.':>9}"
+        )
+        for command, h in sorted(totals.items(), key=lambda kv: -kv[1]["total_ms"])[:self.top]:
+            terminalreporter.write_line(
+                f"{command:<28}{h['count']:>7}{h['total_ms']:>12.1f}"
+                f"{histogram_percentile(h, 50):>8.0f}{histogram_percentile(h, 95):>8.0f}"
+                f"{h['max_ms']:>9.1f}{h['bytes'] / 1024:>9.1f}"
+            )
+        terminalreporter.write_line("")
+        terminalreporter.write_line("Page objects que mais gastam em comandos:")
+        for entry in self.top_call_sites():
+            terminalreporter.write_line(
+                f"{entry['total_ms']:>10.1f} ms {entry['commands']:>6} cmds  {entry['site']}"
+            )
+        terminalreporter.write_line(f"Detalhes por teste: {PROFILE_FILE}")
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("wd-profile", "Profiler de comandos WebDriver")
+    group.addoption("--wd-profile", action="store_true", default=False,
+                    help="Mede os comandos WebDriver por teste (reports/webdriver_profile.json)")
+    group.addoption("--wd-profile-top", type=int, default=15,
+                    help="Quantos comandos/page objects mostrar no resumo (padrão: 15)")
+
+
+def pytest_configure(config):
+    if config.getoption("wd_profile"):
+        config.pluginmanager.register(WebDriverProfiler(config), "webdriver-profiler")
@@ -0,0 +1,161 @@
+"""
+Daemon local de desenvolvimento: browsers aquecidos entre execuções.
+
+``start`` sobe em segundo plano o mock, o frontend e browsers já abertos
+(metade logada); enquanto ele estiver de pé, com ``USE_DAEMON=true`` a
+fixture ``driver`` pega um browser emprestado em vez de abrir o Chrome e
+fazer login de novo (``utils/daemon.py``). O mock do daemon é um só:
+com o xdist, ou com outra execução já usando o daemon, o pytest sobe o
+próprio mock e abre os próprios browsers.
+
+``watch`` fica olhando ``pages/`` e ``tests/`` e, a cada mudança, roda só
+os testes afetados (``--impact-files``, mesma regra do ``--impact``).
+Cada rodada é um fork de um processo com pytest, Selenium e cia. já
+importados, então só o código da suíte é carregado de novo.
+
+Uso:
+    python run_daemon.py start --browsers 2
+    python run_daemon.py watch -- -x
+    python run_daemon.py status
+    python run_daemon.py stop
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+from config.settings import settings
+from utils.daemon import SOCKET_PATH, find_daemon
+
+WATCHED_DIRS = ("pages", "tests")
+POLL_INTERVAL = 0.3
+START_TIMEOUT = 180
+
+# Importados uma vez no processo do watch; os forks já nascem com eles
+PRELOAD = (
+    "pytest", "xdist.plugin", "pytest_html", "allure_pytest.plugin",
+    "selenium.webdriver", "selenium.webdriver.support.ui", "requests", "faker",
+)
+
+
+def start(browsers, foreground=False):
+    client = find_daemon()
+    if client is not None:
+        print(f"✅ Daemon já rodando (pid {client.info['pid']})")
+        return client
+
+    if foreground:
+        from utils.daemon import BrowserDaemon
+
+        settings.setup_directories()
+        daemon = BrowserDaemon(browsers=browsers)
+        print("🚀 Subindo mock, frontend e browsers...")
+        try:
+            daemon.start()
+            print(f"✅ Daemon pronto em {SOCKET_PATH}")
+            daemon.serve_forever()
+        finally:
+            print("🛑 Encerrando daemon...")
+            daemon.stop()
+        return None
+
+    settings.setup_directories()
+    log = open(settings.REPORTS_DIR / "daemon.log", "ab")
+    subprocess.Popen(
+        [sys.executable, __file__, "start", "--foreground", "--browsers", str(browsers)],
+        cwd=settings.BASE_DIR, stdout=log, stderr=subprocess.STDOUT, start_new_session=True,
+    )
+    deadline = time.monotonic() + START_TIMEOUT
+    while time.monotonic() < deadline:
+        client = find_daemon()
+        if client is not None:
+            print(f"✅ Daemon pronto (pid {client.info['pid']}, log em reports/daemon.log)")
+            return client
+        time.sleep(0.5)
+    raise SystemExit("❌ Daemon não subiu a tempo (veja reports/daemon.log)")
+
+
+def snapshot():
+    """mtime de cada .py observado."""
+    files = {}
+    for directory in WATCHED_DIRS:
+        for path in (settings.BASE_DIR / directory).rglob("*.py"):
+            try:
+                files[path.relative_to(settings.BASE_DIR).as_posix()] = path.stat().st_mtime_ns
+            except OSError:
+                pass
+    return files
+
+
+def run_affected(changed, pytest_args):
+    """Roda os testes afetados num fork do processo já aquecido."""
+    import pytest
+
+    print(f"\n🔁 {', '.join(changed)}")
+    start_time = time.perf_counter()
+    pid = os.fork()
+    if pid == 0:
+        code = pytest.main(["--impact-files", ",".join(changed), *pytest_args])
+        sys.stdout.flush()
+        os._exit(int(code))
+    _, status = os.waitpid(pid, 0)
+    code = os.waitstatus_to_exitcode(status)
+    icon = "✅" if code in (0, 5) else "❌"
+    print(f"{icon} {time.perf_counter() - start_time:.2f}s (saída {code})")
+
+
+def watch(browsers, pytest_args):
+    import importlib
+
+    start(browsers)
+    # Os forks do pytest usam o daemon que acabou de subir
+    os.environ["USE_DAEMON"] = "true"
+    for module in PRELOAD:
+        try:
+            importlib.import_module(module)
+        except ImportError:
+            pass
+
+    previous = snapshot()
+    print(f"👀 Observando {', '.join(WATCHED_DIRS)} (Ctrl+C para sair)")
+    try:
+        while True:
+            time.sleep(POLL_INTERVAL)
+            current = snapshot()
+            changed = sorted(p for p, mtime in current.items() if previous.get(p) != mtime)
+            previous = current
+            if changed:
+                run_affected(changed, pytest_args)
+    except KeyboardInterrupt:
+        pass
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("command", choices=("start", "stop", "status", "watch"))
+    parser.add_argument("--browsers", type=int, default=1, help="Browsers aquecidos de cada tipo (limpo/logado)")
+    parser.add_argument("--foreground", action="store_true", help="Roda o daemon neste processo")
+    parser.add_argument("pytest_args", nargs="*", help="Argumentos extras do pytest (watch), depois de --")
+    args = parser.parse_args(argv)
+
+    if args.command == "start":
+        start(args.browsers, args.foreground)
+    elif args.command == "watch":
+        watch(args.browsers, args.pytest_args)
+    else:
+        client = find_daemon()
+        if client is None:
+            print("Daemon não está rodando")
+            return
+        if args.command == "status":
+            print(json.dumps(client.info, indent=2))
+        else:
+            client.stop()
+            print("🛑 Daemon encerrado")
+
+
+if __name__ == "__main__":
+    main()
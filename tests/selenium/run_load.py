@@ -0,0 +1,245 @@
+"""
+Geração de carga pela interface, reaproveitando os page objects.
+
+Sobe K browsers headless em paralelo; cada um escolhe uma jornada pelo
+peso (login→dashboard→agendamento, login→histórico, cadastro...) e a
+repete até o tempo acabar. No final mostra, por passo, a latência
+p50/p95/p99, além da vazão e da taxa de erro, e grava o resultado em
+``reports/load/``.
+
+Uso:
+    python run_load.py --users 5 --duration 120
+    python run_load.py --url http://staging:3000 --weight login_history=5
+"""
+
+import argparse
+import json
+import random
+import sys
+import threading
+import time
+from datetime import datetime
+
+from selenium.webdriver.common.by import By
+
+from config.settings import settings
+from pages.agendamentoVacina_page import VaccineSchedulePage
+from pages.cadastro_page import CadastroPage
+from pages.dashboard_page import DashboardPage
+from pages.login_page import LoginPage
+from utils.browser import create_driver, reset_browser_state
+from utils.metrics import percentile
+from utils.test_data import generate_random_user
+
+HISTORY_TITLE = (By.XPATH, "//*[contains(text(), 'Histórico')]")
+
+
+# ============================================================================
+# PASSOS E JORNADAS
+# ============================================================================
+# Cada passo recebe o driver e retorna True/False (ou levanta exceção)
+
+def step_login(driver):
+    login_page = LoginPage(driver)
+    login_page.navigate()
+    login_page.login(settings.TEST_USER_EMAIL, settings.TEST_USER_PASSWORD)
+    return DashboardPage(driver).is_logged_in()
+
+
+def step_dashboard(driver):
+    dashboard = DashboardPage(driver)
+    dashboard.navigate()
+    return dashboard.is_logged_in()
+
+
+def step_schedule(driver):
+    DashboardPage(driver).navigate_to_schedule()
+    return VaccineSchedulePage(driver).is_on_schedule_page()
+
+
+def step_history(driver):
+    dashboard = DashboardPage(driver)
+    dashboard.navigate_to_history()
+    return dashboard.is_visible(HISTORY_TITLE, timeout=10)
+
+
+def step_cadastro(driver):
+    user = generate_random_user()
+    cadastro_page = CadastroPage(driver)
+    cadastro_page.navigate()
+    cadastro_page.signup(user["name"], user["email"], user["password"], user["password"])
+    return cadastro_page.has_success_message() or "/dashboard" in driver.current_url
+
+
+JOURNEYS = {
+    "login_dashboard_schedule": [
+        ("login", step_login),
+        ("dashboard", step_dashboard),
+        ("schedule", step_schedule),
+    ],
+    "login_history": [
+        ("login", step_login),
+        ("history", step_history),
+    ],
+    "cadastro": [
+        ("cadastro", step_cadastro),
+    ],
+}
+
+DEFAULT_WEIGHTS = {
+    "login_dashboard_schedule": 3,
+    "login_history": 2,
+    "cadastro": 1,
+}
+
+
+# ============================================================================
+# EXECUÇÃO
+# ============================================================================
+
+class LoadResults:
+    """Amostras coletadas pelos usuários virtuais (thread-safe)."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.samples = []  # (passo, duração, ok)
+        self.journeys = 0
+        self.failed_journeys = 0
+
+    def add_step(self, step, duration, ok):
+        with self.lock:
+            self.samples.append((step, duration, ok))
+
+    def add_journey(self, ok):
+        with self.lock:
+            self.journeys += 1
+            self.failed_journeys += not ok
+
+
+def virtual_user(user_id, deadline, weights, results, errors):
+    try:
+        driver = create_driver(headless=True)
+    except Exception as e:
+        errors.append(f"usuário {user_id}: não abriu o browser ({e})")
+        return
+
+    names = list(weights)
+    try:
+        while time.monotonic() < deadline:
+            journey = random.choices(names, weights=[weights[n] for n in names])[0]
+            ok = True
+            for step, action in JOURNEYS[journey]:
+                start = time.perf_counter()
+                try:
+                    ok = bool(action(driver))
+                except Exception:
+                    ok = False
+                results.add_step(step, time.perf_counter() - start, ok)
+                if not ok:
+                    break
+            results.add_journey(ok)
+            reset_browser_state(driver)
+    finally:
+        driver.quit()
+
+
+def summarize(results, elapsed):
+    steps = {}
+    for step, duration, ok in results.samples:
+        steps.setdefault(step, {"durations": [], "errors": 0})
+        steps[step]["durations"].append(duration)
+        steps[step]["errors"] += not ok
+
+    summary = {"elapsed": elapsed, "journeys": results.journeys, "steps": {}}
+    total_steps = len(results.samples)
+    total_errors = sum(s["errors"] for s in steps.values())
+    for step, data in steps.items():
+        durations = sorted(data["durations"])
+        summary["steps"][step] = {
+            "count": len(durations),
+            "errors": data["errors"],
+            "p50": percentile(durations, 50),
+            "p95": percentile(durations, 95),
+            "p99": percentile(durations, 99),
+        }
+    summary["journeys_per_second"] = results.journeys / elapsed if elapsed else 0.0
+    summary["steps_per_second"] = total_steps / elapsed if elapsed else 0.0
+    summary["error_rate"] = total_errors / total_steps if total_steps else 0.0
+    summary["journey_error_rate"] = (
+        results.failed_journeys / results.journeys if results.journeys else 0.0
+    )
+    return summary
+
+
+def print_summary(summary):
+    print(f"\n📊 Carga em {settings.FRONTEND_URL} ({summary['elapsed']:.0f}s)")
+    print(f"{'passo':<12}{'n':>6}{'erros':>7}{'p50 (s)':>10}{'p95 (s)':>10}{'p99 (s)':>10}")
+    for step, data in sorted(summary["steps"].items()):
+        print(f"{step:<12}{data['count']:>6}{data['errors']:>7}"
+              f"{data['p50']:>10.2f}{data['p95']:>10.2f}{data['p99']:>10.2f}")
+    print(f"\nJornadas: {summary['journeys']} ({summary['journeys_per_second']:.2f}/s)")
+    print(f"Passos/s: {summary['steps_per_second']:.2f}")
+    print(f"Taxa de erro: {summary['error_rate']:.1%} dos passos, "
+          f"{summary['journey_error_rate']:.1%} das jornadas")
+
+
+def parse_weights(values):
+    weights = dict(DEFAULT_WEIGHTS)
+    for value in values or []:
+        name, _, weight = value.partition("=")
+        if name not in JOURNEYS:
+            raise SystemExit(f"Jornada desconhecida: {name} (opções: {', '.join(JOURNEYS)})")
+        weights[name] = float(weight)
+    return {name: weight for name, weight in weights.items() if weight > 0}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=5, help="Browsers simultâneos (K)")
+    parser.add_argument("--duration", type=float, default=60, help="Duração em segundos")
+    parser.add_argument("--ramp-up", type=float, default=0, help="Segundos para subir todos os browsers")
+    parser.add_argument("--url", default=settings.FRONTEND_URL, help="FRONTEND_URL alvo")
+    parser.add_argument("--weight", action="append", metavar="JORNADA=PESO",
+                        help="Peso de uma jornada (pode repetir)")
+    args = parser.parse_args(argv)
+
+    settings.FRONTEND_URL = args.url.rstrip("/")
+    weights = parse_weights(args.weight)
+    results = LoadResults()
+    errors = []
+
+    start = time.monotonic()
+    deadline = start + args.ramp_up + args.duration
+    threads = []
+    for user_id in range(args.users):
+        thread = threading.Thread(
+            target=virtual_user,
+            args=(user_id, deadline, weights, results, errors),
+            daemon=True,
+        )
+        thread.start()
+        threads.append(thread)
+        if args.ramp_up and args.users > 1:
+            time.sleep(args.ramp_up / (args.users - 1))
+    for thread in threads:
+        thread.join()
+    elapsed = time.monotonic() - start
+
+    for error in errors:
+        print(f"⚠️  {error}")
+
+    summary = summarize(results, elapsed)
+    summary.update(users=args.users, url=settings.FRONTEND_URL, weights=weights)
+    print_summary(summary)
+
+    output_dir = settings.REPORTS_DIR / "load"
+    output_dir.mkdir(parents=True, exist_ok=True)
+    output = output_dir / f"load_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    output.write_text(json.dumps(summary, indent=2), encoding="utf-8")
+    print(f"📁 Resultado salvo em {output}")
+
+    return 1 if len(errors) == args.users else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
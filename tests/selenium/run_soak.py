@@ -0,0 +1,165 @@
+"""
+Soak do dashboard: as mesmas jornadas em loop, procurando vazamento.
+
+Faz login uma vez e repete, sem recarregar a página (vazamento de SPA
+some num reload), as jornadas do ``DashboardPage``: abrir cards do
+calendário, ir ao histórico, ao agendamento e às configurações e voltar.
+Depois de cada volta tira uma amostra de recursos
+(``utils/browser_resources.py``: heap JS após GC, nós do DOM, listeners,
+layout, RSS do Chrome). No fim aponta as métricas que cresceram de forma
+monotônica acima do limite e grava tudo em ``reports/soak/``.
+
+Uso:
+    python run_soak.py --duration 600
+    python run_soak.py --duration 1800 --threshold 5 --url http://localhost:3000
+
+Sai com código 1 se alguma métrica vazou.
+"""
+
+import argparse
+import json
+import sys
+import time
+from datetime import datetime
+
+from selenium.webdriver.common.by import By
+
+from config.settings import settings
+from pages.agendamentoVacina_page import VaccineSchedulePage
+from pages.dashboard_page import DashboardPage
+from pages.login_page import LoginPage
+from utils.browser import create_driver
+from utils.browser_resources import LEAK_WINDOWS, ResourceSampler, find_leaks
+
+SETTINGS_DIALOG = (By.XPATH, "//*[@role='dialog']//*[contains(text(), 'Configurações')]")
+CALENDAR_DAYS_PER_ROUND = 3
+
+
+# ============================================================================
+# JORNADAS (todas voltam para a aba inicial do dashboard)
+# ============================================================================
+
+def journey_calendar(dashboard):
+    days = list(dashboard.calendar_events()) or [15]
+    for day in days[:CALENDAR_DAYS_PER_ROUND]:
+        dashboard.open_calendar_day(day)
+        dashboard.close_calendar_day()
+
+
+def journey_history(dashboard):
+    dashboard.navigate_to_history()
+    dashboard.is_on_history_page(timeout=10)
+    dashboard.open_dashboard_tab()
+
+
+def journey_schedule(dashboard):
+    dashboard.navigate_to_schedule()
+    VaccineSchedulePage(dashboard.driver).is_on_schedule_page()
+    dashboard.open_dashboard_tab()
+
+
+def journey_settings(dashboard):
+    dashboard.open_settings()
+    dashboard.is_visible(SETTINGS_DIALOG, timeout=10)
+    dashboard.close_dialog()
+
+
+JOURNEYS = {
+    "calendario": journey_calendar,
+    "historico": journey_history,
+    "agendamento": journey_schedule,
+    "configuracoes": journey_settings,
+}
+
+
+# ============================================================================
+# EXECUÇÃO
+# ============================================================================
+
+def soak(driver, duration):
+    """Roda as jornadas até o tempo acabar; uma amostra por volta."""
+    login_page = LoginPage(driver)
+    login_page.navigate()
+    login_page.login(settings.TEST_USER_EMAIL, settings.TEST_USER_PASSWORD)
+    dashboard = DashboardPage(driver)
+    if not dashboard.is_logged_in():
+        raise SystemExit("❌ Login falhou; o soak precisa do dashboard")
+
+    sampler = ResourceSampler(driver)
+    samples = [{"round": 0, "elapsed_s": 0.0, "round_s": 0.0, **sampler.sample()}]
+    errors = {}
+    start = time.monotonic()
+    deadline = start + duration
+    while time.monotonic() < deadline:
+        round_start = time.monotonic()
+        for name, journey in JOURNEYS.items():
+            try:
+                journey(dashboard)
+            except Exception as e:
+                errors[name] = errors.get(name, 0) + 1
+                print(f"⚠️  {name}: {type(e).__name__}")
+                dashboard.open_dashboard_tab()
+        now = time.monotonic()
+        samples.append({
+            "round": len(samples),
+            "elapsed_s": round(now - start, 1),
+            "round_s": round(now - round_start, 3),
+            **sampler.sample(),
+        })
+    return samples, errors
+
+
+def print_report(samples, leaks, threshold):
+    print(f"\n🧪 Soak: {len(samples) - 1} voltas em {samples[-1]['elapsed_s']:.0f}s "
+          f"({', '.join(JOURNEYS)})")
+    if not leaks:
+        print(f"Poucas amostras para analisar (mínimo {LEAK_WINDOWS * 2} voltas)")
+        return
+    print(f"{'métrica':<22}{'início':>12}{'fim':>12}{'cresc.':>9}  ")
+    for metric, r in leaks.items():
+        flag = "❌ vazando" if r["leak"] else ("↗ subindo" if r["monotonic"] and r["growth"] > 0 else "✅")
+        print(f"{metric:<22}{r['first']:>12.0f}{r['last']:>12.0f}{r['growth']:>9.1%}  {flag}")
+    print(f"(mediana da primeira e da última de {LEAK_WINDOWS} janelas; limite {threshold:.0%})")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--duration", type=float, default=300, help="Duração em segundos")
+    parser.add_argument("--threshold", type=float, default=10,
+                        help="Crescimento (%%) a partir do qual uma métrica monotônica é vazamento")
+    parser.add_argument("--url", default=settings.FRONTEND_URL, help="FRONTEND_URL alvo")
+    args = parser.parse_args(argv)
+
+    settings.FRONTEND_URL = args.url.rstrip("/")
+    threshold = args.threshold / 100
+
+    driver = create_driver(headless=True)
+    try:
+        samples, errors = soak(driver, args.duration)
+    finally:
+        driver.quit()
+
+    leaks = find_leaks(samples, threshold)
+    print_report(samples, leaks, threshold)
+    for name, count in errors.items():
+        print(f"⚠️  {name}: {count} voltas com erro")
+
+    output_dir = settings.REPORTS_DIR / "soak"
+    output_dir.mkdir(parents=True, exist_ok=True)
+    output = output_dir / f"soak_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    output.write_text(json.dumps({
+        "url": settings.FRONTEND_URL,
+        "duration": args.duration,
+        "threshold": threshold,
+        "journeys": list(JOURNEYS),
+        "errors": errors,
+        "leaks": leaks,
+        "samples": samples,
+    }, indent=2), encoding="utf-8")
+    print(f"📁 Amostras salvas em {output}")
+
+    return 1 if any(r["leak"] for r in leaks.values()) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
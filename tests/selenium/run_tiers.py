@@ -0,0 +1,124 @@
+"""
+Execução da suíte em camadas (tiers).
+
+1. ``smoke`` roda primeiro, num único browser aquecido, com ``--preflight``
+   e ``-x``: se o app ou o mock estiverem fora do ar a execução termina
+   em segundos.
+2. As demais camadas (auth, dashboard, schedule e o restante) rodam em
+   paralelo, cada uma num processo do pytest.
+3. No final é exibido o tempo de parede de cada camada.
+
+Uso:
+    python run_tiers.py
+    python run_tiers.py --workers 2      # xdist dentro de cada camada
+    python run_tiers.py -- -k login      # argumentos extras para o pytest
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+from config.settings import settings
+
+SMOKE_TIER = ("smoke", "smoke")
+
+PARALLEL_TIERS = [
+    ("auth", "auth and not smoke"),
+    ("dashboard", "dashboard and not smoke"),
+    ("schedule", "schedule and not smoke"),
+    ("outros", "not (smoke or auth or dashboard or schedule)"),
+]
+
+# pytest retorna 5 quando nenhum teste foi coletado
+NO_TESTS_COLLECTED = 5
+
+
+def pytest_command(name, marker, extra_args, workers=0):
+    command = [
+        sys.executable, "-m", "pytest",
+        "-m", marker,
+        f"--html={settings.REPORTS_DIR / 'html' / f'tier_{name}.html'}",
+    ]
+    if workers:
+        command += ["-n", str(workers)]
+    return command + list(extra_args)
+
+
+def run_smoke(extra_args):
+    name, marker = SMOKE_TIER
+    env = dict(os.environ, REUSE_BROWSER="true")
+    command = pytest_command(name, marker, extra_args) + ["-x", "--preflight", "-p", "no:xdist"]
+
+    start = time.perf_counter()
+    returncode = subprocess.call(command, cwd=settings.BASE_DIR, env=env)
+    return name, returncode, time.perf_counter() - start
+
+
+def run_parallel(extra_args, workers):
+    logs_dir = settings.REPORTS_DIR / "tiers"
+    logs_dir.mkdir(parents=True, exist_ok=True)
+
+    running = []
+    for index, (name, marker) in enumerate(PARALLEL_TIERS, start=1):
+        log_file = open(logs_dir / f"{name}.log", "w", encoding="utf-8")
+        env = dict(os.environ)
+        if settings.MOCK_PORT:
+            # Camadas em paralelo não podem dividir a porta do mock
+            env["MOCK_PORT"] = str(settings.MOCK_PORT + 100 * index)
+        process = subprocess.Popen(
+            pytest_command(name, marker, extra_args, workers),
+            cwd=settings.BASE_DIR,
+            env=env,
+            stdout=log_file,
+            stderr=subprocess.STDOUT,
+        )
+        running.append((name, process, log_file, time.perf_counter()))
+        print(f"▶️  Camada '{name}' iniciada (log: {log_file.name})")
+
+    results = []
+    for name, process, log_file, start in running:
+        returncode = process.wait()
+        log_file.close()
+        results.append((name, returncode, time.perf_counter() - start))
+    return results
+
+
+def print_summary(results, total):
+    print("\n⏱️  Tempo por camada")
+    print(f"{'camada':<12}{'status':<12}{'tempo (s)':>10}")
+    for name, returncode, elapsed in results:
+        if returncode == 0:
+            status = "ok"
+        elif returncode == NO_TESTS_COLLECTED:
+            status = "vazia"
+        else:
+            status = f"falhou ({returncode})"
+        print(f"{name:<12}{status:<12}{elapsed:>10.1f}")
+    print(f"{'total':<24}{total:>10.1f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=0, help="Workers do xdist por camada")
+    parser.add_argument("pytest_args", nargs="*", help="Argumentos repassados ao pytest")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    results = [run_smoke(args.pytest_args)]
+
+    if results[0][1] not in (0, NO_TESTS_COLLECTED):
+        print("\n❌ Smoke falhou: camadas restantes canceladas.")
+        print_summary(results, time.perf_counter() - start)
+        return results[0][1]
+
+    results += run_parallel(args.pytest_args, args.workers)
+    print_summary(results, time.perf_counter() - start)
+
+    failed = [code for _, code, _ in results if code not in (0, NO_TESTS_COLLECTED)]
+    return failed[0] if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
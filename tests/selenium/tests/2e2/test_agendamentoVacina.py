@@ -3,7 +3,7 @@ Testes de Agendamento de Vacinas com Selenium.
 """
 
 import pytest
-from datetime import datetime, timedelta
+from datetime import timedelta
 from selenium.webdriver.support.ui import WebDriverWait, Select
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.by import By
@@ -11,6 +11,7 @@ from pages.dashboard_page import DashboardPage
 from pages.agendamentoVacina_page import VaccineSchedulePage
 
 
+@pytest.mark.schedule
 class TestVaccineSchedule:
     """Testes de agendamento de vacinas."""
 
@@ -33,7 +34,8 @@ class TestVaccineSchedule:
         assert len(vaccines) > 0, "Nenhuma vacina disponível"
         assert all(v.strip() for v in vaccines), "Alguma opção de vacina está vazia"
 
-    def test_agendar_vacina_sucesso(self, authenticated_driver):
+    @pytest.mark.clock("2025-06-02T10:00:00")
+    def test_agendar_vacina_sucesso(self, clock, authenticated_driver, mock_journal, frontend_uses_mock):
 
         driver = authenticated_driver
 
@@ -44,7 +46,7 @@ class TestVaccineSchedule:
         schedule_page = VaccineSchedulePage(driver)
         schedule_page.wait_for_react_to_load()
 
-        future_date = (datetime.now() + timedelta(days=30)).strftime("%d/%m/%Y")
+        future_date = (clock.today() + timedelta(days=30)).strftime("%d/%m/%Y")
 
         schedule_page.schedule_vaccine(
             vaccine="BCG",
@@ -53,11 +55,25 @@ class TestVaccineSchedule:
             notes="Teste de agendamento"
         )
 
+        if frontend_uses_mock:
+            # Confirma direto no mock que o agendamento chegou com os dados certos
+            mock_journal.assert_request(
+                "POST", "/usuarios/*/historico/",
+                payload={
+                    "vacina_id": 2,  # BCG
+                    "status": "pendente",
+                    "local_aplicacao": "Clínica Teste",
+                    "observacoes": "Teste de agendamento",
+                },
+                status=201,
+            )
+
         assert schedule_page.has_success_message(), \
             "Mensagem de sucesso não foi exibida após o agendamento"
 
 
-    def test_agendar_vacina_sem_observacoes(self, authenticated_driver):
+    @pytest.mark.clock("2025-06-02T10:00:00")
+    def test_agendar_vacina_sem_observacoes(self, clock, authenticated_driver):
         """Deve agendar vacina sem observações (campo opcional)."""
         dashboard = DashboardPage(authenticated_driver)
         dashboard.navigate_to_schedule()
@@ -65,7 +81,7 @@ class TestVaccineSchedule:
         schedule_page = VaccineSchedulePage(authenticated_driver)
         schedule_page.wait_for_react_to_load()
 
-        future_date = (datetime.now() + timedelta(days=30)).strftime("%d/%m/%Y")
+        future_date = (clock.today() + timedelta(days=30)).strftime("%d/%m/%Y")
         
         schedule_page.schedule_vaccine(
             vaccine="BCG",
@@ -6,12 +6,13 @@ import pytest
 from pages.login_page import LoginPage
 from pages.cadastro_page import CadastroPage
 from pages.dashboard_page import DashboardPage
-from utils.test_data import generate_random_user
+from utils.test_data import generate_random_user, INVALID_EMAILS, INVALID_PASSWORDS
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from config.settings import settings
 
 
+@pytest.mark.auth
 class TestAuthentication:
     """Testes de autenticação (login, cadastro, logout e navegação)."""
 
@@ -84,19 +85,42 @@ class TestAuthentication:
         assert "não coincidem" in error_msg or "não correspondem" in error_msg
 
     def test_cadastro_email_invalido(self, driver):
-        """Deve validar formato de email."""
+        """Deve validar formato de email (todos os casos numa carga só)."""
         cadastro_page = CadastroPage(driver)
         cadastro_page.navigate()
 
-        cadastro_page.type_text(cadastro_page.NAME_INPUT, "Teste")
-        cadastro_page.type_text(cadastro_page.EMAIL_INPUT, "email-invalido")
-        cadastro_page.type_text(cadastro_page.PASSWORD_INPUT, "senha123")
-        cadastro_page.type_text(cadastro_page.CONFIRM_PASSWORD_INPUT, "senha123")
-        cadastro_page.click(cadastro_page.SIGNUP_BUTTON)
+        results = cadastro_page.validate_form([{"email": email} for email in INVALID_EMAILS])
 
-        email_field = driver.find_element(*cadastro_page.EMAIL_INPUT)
-        is_valid = driver.execute_script("return arguments[0].checkValidity();", email_field)
-        assert not is_valid, "Campo email deveria ser inválido."
+        for email, fields in zip(INVALID_EMAILS, results):
+            assert not fields["email"]["valid"], f"Email {email!r} deveria ser inválido."
+            assert fields["email"]["message"], f"Email {email!r} sem mensagem de validação."
+            assert fields["name"]["valid"] and fields["password"]["valid"]
+
+    def test_cadastro_senha_invalida(self, driver):
+        """Deve recusar senhas curtas ou vazias (todos os casos numa carga só)."""
+        cadastro_page = CadastroPage(driver)
+        cadastro_page.navigate()
+
+        cases = [{"password": senha, "confirm_password": senha} for senha in INVALID_PASSWORDS]
+        results = cadastro_page.validate_form([{}] + cases)
+
+        assert all(field["valid"] for field in results[0].values()), "Dados válidos foram recusados."
+        for senha, fields in zip(INVALID_PASSWORDS, results[1:]):
+            assert not fields["password"]["valid"], f"Senha {senha!r} deveria ser inválida."
+            assert fields["email"]["valid"]
+
+    def test_login_validacao_campos(self, driver):
+        """Deve validar email e senha no login sem submeter."""
+        login_page = LoginPage(driver)
+        login_page.navigate()
+
+        cases = [{"email": email} for email in INVALID_EMAILS]
+        cases += [{"password": senha} for senha in INVALID_PASSWORDS]
+        results = login_page.validate_form(cases)
+
+        for case, fields in zip(cases, results):
+            field = next(iter(case))
+            assert not fields[field]["valid"], f"{field}={case[field]!r} deveria ser inválido."
 
     def test_navegacao_login_cadastro(self, driver):
         login_page = LoginPage(driver)
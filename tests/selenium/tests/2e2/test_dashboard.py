@@ -4,13 +4,14 @@ Testes do Dashboard com Selenium.
 
 import pytest
 from selenium.webdriver.common.by import By
-from pages.dashboard_page import DashboardPage
+from pages.dashboard_page import DashboardPage, calendar_from_historico
 from pages.agendamentoVacina_page import VaccineSchedulePage
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from config.settings import settings
-import time
 
+
+@pytest.mark.dashboard
 class TestDashboard:
     """Testes do Dashboard."""
 
@@ -54,29 +55,114 @@ class TestDashboard:
         assert dashboard.is_visible(dashboard.USER_NAME, timeout=3), "Nome do usuário não está visível"
         assert dashboard.is_visible(dashboard.USER_EMAIL, timeout=3), "Email do usuário não está visível"
 
-    def test_abrir_card_do_calendario(self, authenticated_driver):
-        driver = authenticated_driver
-        dashboard = DashboardPage(driver)
+    @pytest.mark.clock("2025-06-02T10:00:00")
+    def test_abrir_card_do_calendario(self, frontend_on_mock, clock, authenticated_driver, mock_control):
+        """Calendário mostra cada registro do histórico no dia certo e abre o card do dia."""
+        user_id = mock_control.ensure_user(settings.TEST_USER_NAME, settings.TEST_USER_EMAIL,
+                                           settings.TEST_USER_PASSWORD)["id"]
+        # Mês cheio: um a três registros em dia sim, dia não
+        mock_control.seed(historico=[
+            {
+                "usuario_id": user_id,
+                "vacina_id": 1,
+                "numero_dose": dose,
+                "status": "pendente",
+                "data_prevista": f"2025-06-{dia:02d}T12:00:00",
+            }
+            for dia in range(1, 31, 2)
+            for dose in range(1, 2 + dia % 3)
+        ])
+        historico = mock_control.state()["historico"].get(str(user_id), [])
+        esperado = calendar_from_historico(historico, 2025, 6)
 
+        dashboard = DashboardPage(authenticated_driver)
         dashboard.navigate()
+        dashboard.wait_for_calendar_events(esperado)
+
+        calendario = dashboard.read_calendar()
+        assert (calendario["year"], calendario["month"]) == (2025, 6)
+        # Dia 1 já passou (hoje é 02/06): as pendentes aparecem como atrasadas
+        assert calendario["days"][1] == ["bg-red-500"] * esperado[1]
+        assert set(calendario["days"][13]) == {"bg-primary"}
+
+        card = dashboard.open_calendar_day(13)
+        assert len(card["vaccines"]) == esperado[13], f"Card do dia 13: {card}"
+        assert all("Hepatite B" in texto for texto in card["vaccines"])
+        dashboard.close_calendar_day()
+
+    @pytest.mark.clock("2025-06-02T10:00:00")
+    def test_dose_pendente_fica_atrasada(self, frontend_on_mock, clock, authenticated_driver, mock_control,
+                                         mock_journal):
+        """Dose pendente passa a contar como atrasada quando a data prevista fica para trás."""
+        user_id = mock_control.ensure_user(settings.TEST_USER_NAME, settings.TEST_USER_EMAIL,
+                                           settings.TEST_USER_PASSWORD)["id"]
+        mock_control.seed(historico=[{
+            "usuario_id": user_id,
+            "vacina_id": 1,
+            "numero_dose": 1,
+            "status": "pendente",
+            "data_prevista": "2025-06-12T12:00:00",
+        }])
 
-        dia = "12"
+        dashboard = DashboardPage(authenticated_driver)
+        dashboard.navigate()
+        mock_journal.wait_for("GET", "/usuarios/*/historico/estatisticas")
+        # A resposta chegou, mas o React ainda pode não ter pintado o card
+        WebDriverWait(authenticated_driver, 10).until(
+            EC.text_to_be_present_in_element(dashboard.OVERDUE_VACCINES_VALUE, "0"),
+            "Dose ainda no prazo contada como atrasada",
+        )
 
-        dia_elemento = WebDriverWait(driver, 10).until(
-            EC.element_to_be_clickable((
-                By.XPATH,
-                f"//div[contains(@class, 'aspect-square') and contains(@class, 'cursor-pointer') and normalize-space(text())='{dia}']"
-            ))
+        # Duas semanas depois, sem esperar nada
+        clock.advance(days=14)
+        dashboard.refresh()
+
+        WebDriverWait(authenticated_driver, 10).until(
+            EC.text_to_be_present_in_element(dashboard.OVERDUE_VACCINES_VALUE, "1")
         )
-        dia_elemento.click()
 
-        time.sleep(2)
 
-        card_aberto = WebDriverWait(driver, 10).until(
-            EC.presence_of_element_located((
-                By.XPATH,
-                "//div[contains(@class, 'rounded-lg') and contains(@class, 'border') and .//h4]"
-            ))
+ESTATISTICAS = "/usuarios/*/historico/estatisticas"
+
+
+@pytest.mark.dashboard
+class TestDashboardComFalhasNaApi:
+    """Dashboard com a API de estatísticas lenta ou falhando (perfis do mock_faults)."""
+
+    @pytest.mark.mock_faults("slow_historico")
+    def test_estatisticas_lentas_nao_travam_dashboard(self, frontend_on_mock, authenticated_driver, mock_journal):
+        """Com as estatísticas levando 1,5 s, a tela abre na hora e os números chegam depois."""
+        dashboard = DashboardPage(authenticated_driver)
+        dashboard.refresh()
+
+        assert dashboard.is_logged_in(timeout=1), "Dashboard esperou a API lenta para aparecer"
+        assert dashboard.get_vaccines_up_to_date_count() == "0", "Números apareceram antes da resposta"
+
+        entry = mock_journal.wait_for("GET", ESTATISTICAS, timeout=10)
+        assert entry["duration_ms"] >= 1500, f"Latência do perfil não foi aplicada: {entry['duration_ms']} ms"
+        WebDriverWait(authenticated_driver, 10).until(
+            EC.text_to_be_present_in_element(dashboard.VACCINES_UP_TO_DATE_VALUE, "8"),
+            "Estatísticas não apareceram depois da resposta lenta",
         )
 
-        assert card_aberto is not None
\ No newline at end of file
+    @pytest.mark.mock_faults(routes={f"GET {ESTATISTICAS}": {"error_rate": 1.0, "error_status": 500}})
+    def test_erro_nas_estatisticas_mantem_dashboard(self, frontend_on_mock, authenticated_driver, mock_journal):
+        """Erro 500 nas estatísticas: o dashboard continua de pé, com os contadores zerados."""
+        dashboard = DashboardPage(authenticated_driver)
+        dashboard.refresh()
+
+        mock_journal.wait_for("GET", ESTATISTICAS, where=lambda e: e["status"] == 500)
+        assert dashboard.is_logged_in(), "Dashboard caiu com o erro da API"
+        assert "dashboard" in authenticated_driver.current_url
+        assert dashboard.get_vaccines_up_to_date_count() == "0"
+        assert dashboard.get_overdue_vaccines_count() == "0"
+
+    @pytest.mark.mock_faults(routes={f"GET {ESTATISTICAS}": {"error_rate": 1.0, "error_status": 401}})
+    def test_sessao_expirada_volta_para_login(self, frontend_on_mock, authenticated_driver, mock_journal):
+        """401 da API principal: o interceptor do api.ts limpa a sessão e manda para o login."""
+        dashboard = DashboardPage(authenticated_driver)
+        dashboard.refresh()
+
+        mock_journal.wait_for("GET", ESTATISTICAS, where=lambda e: e["status"] == 401)
+        dashboard.wait_for_url_contains("login")
+        assert authenticated_driver.execute_script("return localStorage.getItem('user')") is None
@@ -0,0 +1,57 @@
+"""
+Login, agendamento e histórico em cada perfil de dispositivo.
+
+Os tempos (carga de rota e interações) saem no resumo por perfil do
+plugins/device_profiles.py e em reports/device_profiles.json.
+"""
+
+import pytest
+from selenium.webdriver.support.ui import WebDriverWait
+
+from config.settings import settings
+from pages.agendamentoVacina_page import VaccineSchedulePage
+from pages.dashboard_page import DashboardPage
+from pages.login_page import LoginPage
+from utils.device_profiles import PROFILES
+
+# Rede de celular básico: a troca de rota baixa os chunks do Next a 400 kbps
+SLOW_TIMEOUT = 30
+
+
+@pytest.mark.slow
+@pytest.mark.device(*PROFILES)
+class TestPerfisDeDispositivo:
+    """Os fluxos principais medidos do desktop ao celular básico."""
+
+    def test_login(self, driver, device_timings):
+        login_page = LoginPage(driver)
+        login_page.navigate()
+        device_timings.route_load("login")
+
+        with device_timings.measure("login.entrar"):
+            login_page.login(settings.TEST_USER_EMAIL, settings.TEST_USER_PASSWORD)
+            assert DashboardPage(driver).is_logged_in(timeout=SLOW_TIMEOUT), "Dashboard não carregou"
+
+    def test_agendamento(self, authenticated_driver, device_timings):
+        dashboard = DashboardPage(authenticated_driver)
+        schedule_page = VaccineSchedulePage(authenticated_driver)
+
+        with device_timings.measure("agendamento.abrir"):
+            dashboard.navigate_to_schedule()
+            assert schedule_page.is_on_schedule_page(timeout=SLOW_TIMEOUT), "Agendamento não abriu"
+
+        with device_timings.measure("agendamento.vacinas"):
+            WebDriverWait(authenticated_driver, SLOW_TIMEOUT).until(
+                lambda d: schedule_page.get_available_vaccines()
+            )
+
+    def test_historico(self, authenticated_driver, device_timings):
+        dashboard = DashboardPage(authenticated_driver)
+
+        with device_timings.measure("historico.abrir"):
+            dashboard.navigate_to_history()
+            assert dashboard.is_on_history_page(timeout=SLOW_TIMEOUT), "Histórico não abriu"
+
+        with device_timings.measure("historico.voltar_dashboard"):
+            dashboard.open_dashboard_tab()
+            assert dashboard.is_logged_in(timeout=SLOW_TIMEOUT)
@@ -9,6 +9,7 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 
 
+@pytest.mark.dashboard
 class TestVaccineHistory:
     """Testes de histórico de vacinação."""
 
@@ -26,6 +27,7 @@ class TestVaccineHistory:
             ))
         )
 
+    @pytest.mark.slow
     def test_marcar_vacina_pendente(self, authenticated_driver):
         driver = authenticated_driver
         dashboard = DashboardPage(driver)
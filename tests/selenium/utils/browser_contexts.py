@@ -0,0 +1,185 @@
+"""
+Vários testes no mesmo Chrome, cada um no seu browser context.
+
+Um Chrome só (``SharedChrome``) é aberto por execução; cada processo de
+teste (workers do xdist inclusive) conecta nele um chromedriver próprio
+via ``debuggerAddress`` (``ContextBrowser``) e, por teste, cria com CDP
+um context isolado (``Target.createBrowserContext``: cookies, storage e
+cache separados) com uma aba, para onde o driver é trocado. No fim do
+teste o context é descartado com tudo dentro.
+
+Memória: o tamanho (PSS) da árvore de processos do Chrome é medido logo
+depois de abrir (= custo de um Chrome inteiro por teste) e a cada teste,
+junto com o número de contexts abertos, para estimar o custo de um
+context. Só em Linux (lê ``/proc``).
+"""
+
+import os
+from contextlib import contextmanager
+from pathlib import Path
+
+from selenium import webdriver
+from selenium.webdriver.chrome.service import Service as ChromeService
+
+from config.settings import settings
+from utils.browser import CHROMEDRIVER_PATH, chrome_options
+
+PROC = Path("/proc")
+
+
+def _read(path):
+    try:
+        return path.read_text()
+    except OSError:
+        return ""
+
+
+def find_browser_pid(user_data_dir):
+    """PID do processo principal do Chrome que usa o ``user_data_dir``."""
+    flag = f"--user-data-dir={user_data_dir}"
+    for entry in PROC.glob("[0-9]*"):
+        args = _read(entry / "cmdline").split("\0")
+        if flag in args and not any(a.startswith("--type=") for a in args):
+            return int(entry.name)
+    return None
+
+
+def process_tree(root_pid):
+    """O processo e todos os descendentes."""
+    children = {}
+    for entry in PROC.glob("[0-9]*"):
+        stat = _read(entry / "stat")
+        if stat:
+            # O nome do processo (2º campo) pode ter espaços: o ppid vem depois do ")"
+            ppid = int(stat.rsplit(")", 1)[1].split()[1])
+            children.setdefault(ppid, []).append(int(entry.name))
+    tree, pending = [], [root_pid]
+    while pending:
+        pid = pending.pop()
+        tree.append(pid)
+        pending.extend(children.get(pid, ()))
+    return tree
+
+
+def process_memory_kb(pid):
+    """PSS do processo (memória compartilhada dividida entre quem usa); RSS como alternativa."""
+    for name, field in (("smaps_rollup", "Pss:"), ("status", "VmRSS:")):
+        for line in _read(PROC / str(pid) / name).splitlines():
+            if line.startswith(field):
+                return int(line.split()[1])
+    return 0
+
+
+def tree_memory_kb(root_pid):
+    if root_pid is None or not PROC.exists():
+        return None
+    return sum(process_memory_kb(pid) for pid in process_tree(root_pid))
+
+
+class SharedChrome:
+    """Chrome compartilhado da execução, aberto por um chromedriver que fica vivo."""
+
+    def __init__(self, headless=False):
+        self.headless = headless
+        self.driver = None
+        self.info = None
+
+    def start(self):
+        """Abre o Chrome. Retorna ``{"address", "pid", "base_kb"}``."""
+        service = ChromeService(executable_path=CHROMEDRIVER_PATH)
+        self.driver = webdriver.Chrome(service=service, options=chrome_options(self.headless))
+        self.driver.get("about:blank")
+        capabilities = self.driver.capabilities
+        pid = find_browser_pid(capabilities.get("chrome", {}).get("userDataDir"))
+        self.info = {
+            "address": capabilities["goog:chromeOptions"]["debuggerAddress"],
+            "pid": pid,
+            "base_kb": tree_memory_kb(pid),
+        }
+        return self.info
+
+    def stop(self):
+        if self.driver is not None:
+            self.driver.quit()
+            self.driver = None
+
+
+class ContextBrowser:
+    """Chromedriver do processo conectado ao Chrome compartilhado."""
+
+    def __init__(self, info, base_url=None):
+        self.info = info
+        # Com debuggerAddress o Chrome já está aberto: nenhum argumento vale
+        options = webdriver.ChromeOptions()
+        options.debugger_address = info["address"]
+        service = ChromeService(executable_path=CHROMEDRIVER_PATH)
+        self.driver = webdriver.Chrome(service=service, options=options)
+        self.driver.base_url = base_url
+        self.home = self.driver.current_window_handle
+        self.samples = []
+
+    def cdp(self, command, **params):
+        return self.driver.execute_cdp_cmd(command, params)
+
+    @contextmanager
+    def context(self):
+        """Context isolado com uma aba; o driver fica nela durante o bloco."""
+        context_id = self.cdp("Target.createBrowserContext")["browserContextId"]
+        target_id = self.cdp(
+            "Target.createTarget",
+            url="about:blank",
+            browserContextId=context_id,
+            width=settings.WINDOW_WIDTH,
+            height=settings.WINDOW_HEIGHT,
+        )["targetId"]
+        # No chromedriver o handle da janela é o id do target
+        self.driver.switch_to.window(target_id)
+        try:
+            yield self.driver
+        finally:
+            self.sample()
+            self.driver.switch_to.window(self.home)
+            self.cdp("Target.disposeBrowserContext", browserContextId=context_id)
+
+    def sample(self):
+        """Memória do Chrome inteiro e contexts abertos (de todos os processos)."""
+        memory_kb = tree_memory_kb(self.info["pid"])
+        if memory_kb is None:
+            return
+        contexts = len(self.cdp("Target.getBrowserContexts")["browserContextIds"])
+        self.samples.append({"memory_kb": memory_kb, "contexts": contexts})
+
+    def close(self):
+        # Só encerra o chromedriver: o Chrome é de quem o abriu (SharedChrome)
+        self.driver.service.stop()
+
+
+def memory_report(base_kb, samples, available_kb=None, cores=None):
+    """Estimativa de memória por teste: Chrome inteiro x context.
+
+    Retorna None sem medições.
+    """
+    per_context = sorted(
+        (s["memory_kb"] - base_kb) / s["contexts"]
+        for s in samples if s["contexts"] and s["memory_kb"] > base_kb
+    )
+    if not base_kb or not per_context:
+        return None
+    context_kb = per_context[len(per_context) // 2]
+    cores = cores or os.cpu_count() or 1
+    if available_kb is None:
+        for line in _read(PROC / "meminfo").splitlines():
+            if line.startswith("MemAvailable:"):
+                available_kb = int(line.split()[1])
+    report = {
+        "chrome_per_test_kb": base_kb,
+        "context_per_test_kb": round(context_kb),
+        "saved_per_test_kb": round(base_kb - context_kb),
+        "samples": len(per_context),
+        "cores": cores,
+    }
+    if available_kb:
+        # Só memória: CPU e o frontend continuam limitando
+        report["tests_per_core_chrome"] = round(available_kb / base_kb / cores, 1)
+        report["tests_per_core_context"] = round((available_kb - base_kb) / context_kb / cores, 1)
+    return report
@@ -0,0 +1,116 @@
+"""
+Consumo de recursos do browser: heap JS, nós do DOM, listeners, layout e RSS.
+
+``ResourceSampler`` lê ``Performance.getMetrics`` (CDP) da aba do driver
+e soma o RSS da árvore de processos do Chrome aberto pelo chromedriver
+(só Linux; browsers emprestados pelo daemon ou contexts de um Chrome
+compartilhado ficam sem RSS, que não seria só deles).
+
+``find_leaks`` olha uma série de amostras (ex.: uma por volta do
+``run_soak.py``) e aponta as métricas que só crescem: a série é dividida
+em janelas, e a métrica vaza se a mediana de cada janela é maior ou
+igual à da anterior e o total cresceu mais que o limite.
+"""
+
+from statistics import median
+
+from utils.browser_contexts import PROC, process_tree
+
+# Performance.getMetrics -> nome na amostra e conversão
+CDP_METRICS = {
+    "JSHeapUsedSize": ("js_heap_used_kb", lambda v: round(v / 1024)),
+    "JSHeapTotalSize": ("js_heap_total_kb", lambda v: round(v / 1024)),
+    "Nodes": ("dom_nodes", int),
+    "JSEventListeners": ("js_event_listeners", int),
+    "Documents": ("documents", int),
+    "LayoutCount": ("layout_count", int),
+    # Acumulado desde que a aba abriu
+    "LayoutDuration": ("layout_ms", lambda v: round(v * 1000, 1)),
+}
+
+# Métricas que não deveriam crescer sem parar numa sessão longa
+LEAK_METRICS = ("js_heap_used_kb", "dom_nodes", "js_event_listeners", "documents", "chrome_rss_kb")
+LEAK_WINDOWS = 4
+
+
+def process_rss_kb(pid):
+    try:
+        status = (PROC / str(pid) / "status").read_text()
+    except OSError:
+        return 0
+    for line in status.splitlines():
+        if line.startswith("VmRSS:"):
+            return int(line.split()[1])
+    return 0
+
+
+def chrome_pid(driver):
+    """PID do chromedriver local do driver (o Chrome é filho dele), ou None."""
+    service = getattr(driver, "service", None)
+    process = getattr(service, "process", None)
+    return getattr(process, "pid", None)
+
+
+class ResourceSampler:
+    """Amostras de recursos de um driver."""
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.root_pid = chrome_pid(driver)
+
+    def chrome_rss_kb(self):
+        if self.root_pid is None or not PROC.exists():
+            return None
+        # Sem o próprio chromedriver (primeiro da árvore)
+        return sum(process_rss_kb(pid) for pid in process_tree(self.root_pid)[1:]) or None
+
+    def sample(self, collect_garbage=True):
+        """Métricas da aba atual. ``collect_garbage`` roda o GC antes (heap comparável)."""
+        if collect_garbage:
+            self.driver.execute_cdp_cmd("HeapProfiler.collectGarbage", {})
+        self.driver.execute_cdp_cmd("Performance.enable", {})
+        raw = self.driver.execute_cdp_cmd("Performance.getMetrics", {})["metrics"]
+        sample = {}
+        for metric in raw:
+            if metric["name"] in CDP_METRICS:
+                name, convert = CDP_METRICS[metric["name"]]
+                sample[name] = convert(metric["value"])
+        sample["chrome_rss_kb"] = self.chrome_rss_kb()
+        return sample
+
+
+def sample_delta(before, after):
+    """Diferença entre duas amostras (só as métricas presentes nas duas)."""
+    return {
+        name: round(after[name] - before[name], 1)
+        for name in after
+        if after.get(name) is not None and before.get(name) is not None
+    }
+
+
+def find_leaks(samples, threshold=0.1, windows=LEAK_WINDOWS, metrics=LEAK_METRICS):
+    """Métricas com crescimento monotônico acima de ``threshold`` (fração).
+
+    Retorna ``{métrica: {"first", "last", "growth", "monotonic", "leak"}}``
+    com as medianas da primeira e da última janela.
+    """
+    report = {}
+    if len(samples) < windows * 2:
+        return report
+    size = len(samples) // windows
+    for metric in metrics:
+        values = [s.get(metric) for s in samples]
+        if any(v is None for v in values):
+            continue
+        medians = [median(values[i * size:(i + 1) * size]) for i in range(windows)]
+        first, last = medians[0], medians[-1]
+        growth = (last - first) / first if first else (float("inf") if last > first else 0.0)
+        monotonic = all(b >= a for a, b in zip(medians, medians[1:]))
+        report[metric] = {
+            "first": first,
+            "last": last,
+            "growth": round(growth, 4),
+            "monotonic": monotonic,
+            "leak": monotonic and growth > threshold,
+        }
+    return report
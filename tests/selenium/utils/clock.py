@@ -0,0 +1,135 @@
+"""
+Relógio virtual: browser e mock na mesma data.
+
+``VirtualClock`` congela ou adianta a hora ao mesmo tempo no mock
+(``/__mock__/clock``) e no browser, onde um ``Date`` substituto é
+injetado por CDP (``Page.addScriptToEvaluateOnNewDocument``) antes de
+qualquer script da página, em toda navegação. ``Emulation.setVirtualTimePolicy``
+não serve aqui: pausa os timers da página inteira (o React e as
+requisições param junto), enquanto só a data importa para os testes.
+
+Uso (fixture ``clock`` do conftest)::
+
+    @pytest.mark.clock("2025-06-02T10:00:00")
+    def test_x(self, clock, authenticated_driver):
+        ...
+        clock.advance(days=30)
+        dashboard.refresh()   # a página já renderizada não se atualiza sozinha
+
+Datas sem fuso são interpretadas no fuso local, o mesmo do browser.
+"""
+
+import json
+import time
+from datetime import datetime, timedelta
+
+# Substitui Date por uma subclasse cuja hora "agora" vem de window.__e2eClock.
+# Rodado de novo na mesma página, só atualiza o estado.
+DATE_OVERRIDE = """
+(() => {
+  const state = %s;
+  if (window.__e2eClock) { Object.assign(window.__e2eClock, state); return; }
+  const RealDate = Date;
+  const realNow = RealDate.now.bind(RealDate);
+  const clock = window.__e2eClock = state;
+  const now = () => clock.frozenAt !== null ? clock.frozenAt : realNow() + clock.offset;
+  class VirtualDate extends RealDate {
+    constructor(...args) { if (args.length) { super(...args); } else { super(now()); } }
+    static now() { return now(); }
+  }
+  // Date() sem new devolve string, como o original
+  window.Date = new Proxy(VirtualDate, { apply: () => new VirtualDate().toString() });
+})();
+"""
+
+
+def to_timestamp(at):
+    """datetime, string ISO ou epoch -> epoch em segundos."""
+    if isinstance(at, (int, float)):
+        return float(at)
+    if isinstance(at, str):
+        at = datetime.fromisoformat(at)
+    return at.timestamp()
+
+
+class BrowserClock:
+    """``Date`` virtual numa aba do Chrome (via CDP)."""
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.script_id = None
+
+    def apply(self, frozen_at, offset):
+        state = {
+            "frozenAt": None if frozen_at is None else frozen_at * 1000,
+            "offset": offset * 1000,
+        }
+        source = DATE_OVERRIDE % json.dumps(state)
+        self.remove_script()
+        self.script_id = self.driver.execute_cdp_cmd(
+            "Page.addScriptToEvaluateOnNewDocument", {"source": source}
+        )["identifier"]
+        # Documento atual (as próximas navegações usam o script acima)
+        self.driver.execute_cdp_cmd("Runtime.evaluate", {"expression": source})
+
+    def remove_script(self):
+        if self.script_id is not None:
+            self.driver.execute_cdp_cmd(
+                "Page.removeScriptToEvaluateOnNewDocument", {"identifier": self.script_id}
+            )
+            self.script_id = None
+
+    def restore(self):
+        """Volta à hora real (o browser pode ser reaproveitado)."""
+        self.remove_script()
+        self.driver.execute_cdp_cmd("Runtime.evaluate", {
+            "expression": "if (window.__e2eClock) { window.__e2eClock.frozenAt = null; window.__e2eClock.offset = 0; }"
+        })
+
+
+class VirtualClock:
+    """Hora do teste, a mesma no browser e no mock."""
+
+    def __init__(self, driver, mock_control):
+        self.browser = BrowserClock(driver)
+        self.mock = mock_control
+        self.frozen_at = None
+        self.offset = 0.0
+
+    def _apply(self):
+        self.mock.set_clock(self.frozen_at, self.offset)
+        self.browser.apply(self.frozen_at, self.offset)
+
+    def freeze(self, at=None):
+        """Para o relógio em ``at`` (padrão: agora)."""
+        self.frozen_at = time.time() if at is None else to_timestamp(at)
+        self.offset = 0.0
+        self._apply()
+
+    def travel(self, at):
+        """Pula para ``at`` com o relógio andando a partir dali."""
+        self.frozen_at = None
+        self.offset = to_timestamp(at) - time.time()
+        self._apply()
+
+    def advance(self, delta=None, **kwargs):
+        """Adianta o relógio (``timedelta`` ou ``days=``, ``hours=``...)."""
+        seconds = (delta or timedelta(**kwargs)).total_seconds()
+        if self.frozen_at is not None:
+            self.frozen_at += seconds
+        else:
+            self.offset += seconds
+        self._apply()
+
+    def now(self):
+        timestamp = self.frozen_at if self.frozen_at is not None else time.time() + self.offset
+        return datetime.fromtimestamp(timestamp)
+
+    def today(self):
+        return self.now().date()
+
+    def restore(self):
+        self.frozen_at = None
+        self.offset = 0.0
+        self.browser.restore()
+        self.mock.reset_clock()
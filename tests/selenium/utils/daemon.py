@@ -0,0 +1,300 @@
+"""
+Daemon local com browsers aquecidos (``run_daemon.py``).
+
+O daemon fica de pé entre execuções do pytest e é dono de:
+
+- mock do backend e frontend (gerenciado ou o ``FRONTEND_URL``);
+- browsers já abertos, em dois grupos: ``fresh`` (estado limpo) e
+  ``auth`` (já logados com o usuário de teste, parados no dashboard).
+
+O pytest conversa com ele por um socket Unix (uma linha JSON por
+requisição): pega um browser emprestado (``acquire``), conecta um
+``AttachedDriver`` na sessão do chromedriver que já existe e devolve no
+fim do teste (``release``). A limpeza e o novo login acontecem no
+daemon, em segundo plano, enquanto o próximo teste já roda; essas
+requisições levam o header ``X-Mock-Background`` e o mock não as põe no
+journal nem aplica falhas nelas.
+
+É opcional (``USE_DAEMON=true``) e atende uma execução por vez, sem
+xdist: o mock é um só e o ``mock_state`` de cada teste volta o estado
+dele para o baseline (``conftest.py``).
+"""
+
+import itertools
+import json
+import os
+import socket
+import socketserver
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from queue import Empty, Queue
+
+from config.settings import settings
+
+SOCKET_PATH = settings.REPORTS_DIR / "daemon.sock"
+KINDS = ("fresh", "auth")
+
+
+class DaemonClient:
+    """Cliente do socket do daemon (uma conexão por requisição)."""
+
+    def __init__(self, path=SOCKET_PATH, timeout=60):
+        self.path = str(path)
+        self.timeout = timeout
+        self.info = None
+
+    def request(self, op, **params):
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(self.timeout)
+            sock.connect(self.path)
+            sock.sendall(json.dumps({"op": op, **params}).encode() + b"\n")
+            with sock.makefile("rb") as reader:
+                response = json.loads(reader.readline() or b"{}")
+        if "error" in response:
+            raise RuntimeError(f"daemon: {response['error']}")
+        return response
+
+    def status(self):
+        self.info = self.request("status")
+        return self.info
+
+    def acquire(self, kind):
+        return self.request("acquire", kind=kind, pid=os.getpid())
+
+    def release(self, lease):
+        self.request("release", lease=lease)
+
+    def stop(self):
+        self.request("stop")
+
+
+def find_daemon(path=SOCKET_PATH):
+    """Cliente do daemon se ele estiver rodando, senão None."""
+    if not os.path.exists(path):
+        return None
+    client = DaemonClient(path, timeout=2)
+    try:
+        client.status()
+    except (OSError, ValueError, RuntimeError):
+        return None
+    client.timeout = 60
+    return client
+
+
+def attach_driver(lease):
+    """WebDriver ligado à sessão emprestada pelo daemon."""
+    from selenium import webdriver
+    from selenium.webdriver.chromium.remote_connection import ChromiumRemoteConnection
+
+    class AttachedDriver(webdriver.Remote):
+        """Sessão que já existe no chromedriver do daemon; ``quit`` não fecha o browser."""
+
+        def start_session(self, capabilities):
+            self.session_id = lease["session_id"]
+            self.caps = lease["capabilities"]
+
+        def execute_cdp_cmd(self, cmd, cmd_args):
+            return self.execute("executeCdpCommand", {"cmd": cmd, "params": cmd_args})["value"]
+
+        def quit(self):
+            self.command_executor.close()
+
+    # Conexão do Chromium: tem os comandos goog/* (CDP) além dos do W3C
+    executor = ChromiumRemoteConnection(lease["executor"], vendor_prefix="goog", browser_name="chrome")
+    driver = AttachedDriver(command_executor=executor, options=webdriver.ChromeOptions())
+    driver.base_url = lease["mock_url"]
+    driver.daemon_kind = lease["kind"]
+    return driver
+
+
+class BrowserDaemon:
+    """Mock, frontend e browsers aquecidos, emprestados pelo socket."""
+
+    def __init__(self, browsers=1, path=SOCKET_PATH):
+        self.browsers = browsers
+        self.path = path
+        self.pools = {kind: Queue() for kind in KINDS}
+        self.leases = {}
+        self.lock = threading.Lock()
+        self.counter = itertools.count(1)
+        self.recycler = ThreadPoolExecutor(max_workers=4, thread_name_prefix="recycle")
+        self.mock = None
+        self.frontend = None
+        self.mock_url = None
+        self.frontend_url = settings.FRONTEND_URL
+        self.server = None
+
+    def start(self):
+        from mock_api.server import create_server
+
+        self.mock = create_server(settings.MOCK_MODE, workers=settings.MOCK_WORKERS,
+                                  server=settings.MOCK_SERVER, port=settings.MOCK_PORT,
+                                  log_path=settings.REPORTS_DIR / "mock.log")
+        self.mock_url = self.mock.start()
+        if settings.FRONTEND_MANAGED:
+            from utils.frontend import ManagedFrontend
+
+            self.frontend = ManagedFrontend(settings.FRONTEND_DIR, api_url=self.mock_url,
+                                            log_path=settings.REPORTS_DIR / "frontend.log")
+            self.frontend_url = self.frontend.start()
+        settings.FRONTEND_URL = settings.BASE_URL = self.frontend_url
+
+        # O grupo ``auth`` faz login com o usuário de teste: ele precisa existir no mock
+        from mock_api.control import MockControl
+
+        MockControl(self.mock_url).ensure_user(settings.TEST_USER_NAME, settings.TEST_USER_EMAIL,
+                                               settings.TEST_USER_PASSWORD)
+
+        warm_up = [self.recycler.submit(self._new_browser, kind)
+                   for kind in KINDS for _ in range(self.browsers)]
+        for future in warm_up:
+            driver, kind = future.result()
+            self.pools[kind].put(driver)
+
+    def _new_browser(self, kind):
+        from utils.browser import create_driver
+
+        return self.prepare(create_driver(self.mock_url, headless=settings.HEADLESS), kind), kind
+
+    def prepare(self, driver, kind):
+        """Deixa o browser pronto: estado limpo e, no grupo ``auth``, logado.
+
+        Roda em segundo plano enquanto o próximo teste já usa o mock: as
+        requisições saem com ``BACKGROUND_HEADER`` e ficam fora do journal
+        e das falhas injetadas desse teste.
+        """
+        from mock_api.journal import BACKGROUND_HEADER
+        from utils.browser import reset_browser_state
+
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setExtraHTTPHeaders", {"headers": {BACKGROUND_HEADER: "1"}})
+        try:
+            reset_browser_state(driver)
+            if kind == "auth":
+                from pages.login_page import LoginPage
+
+                login_page = LoginPage(driver)
+                login_page.navigate()
+                login_page.login(settings.TEST_USER_EMAIL, settings.TEST_USER_PASSWORD)
+                login_page.wait_for_url_contains("dashboard")
+        finally:
+            driver.execute_cdp_cmd("Network.setExtraHTTPHeaders", {"headers": {}})
+        return driver
+
+    def acquire(self, kind, pid):
+        if kind not in self.pools:
+            raise ValueError(f"Tipo de browser desconhecido: {kind}")
+        self.reclaim_orphans()
+        try:
+            driver = self.pools[kind].get_nowait()
+        except Empty:
+            driver, _ = self._new_browser(kind)
+        lease = next(self.counter)
+        with self.lock:
+            self.leases[lease] = (kind, driver, pid)
+        return {
+            "lease": lease,
+            "kind": kind,
+            "executor": driver.command_executor._url,
+            "session_id": driver.session_id,
+            "capabilities": driver.capabilities,
+            "mock_url": self.mock_url,
+        }
+
+    def release(self, lease):
+        with self.lock:
+            kind, driver, _ = self.leases.pop(lease)
+        self.recycler.submit(self._recycle, kind, driver)
+
+    def _recycle(self, kind, driver):
+        try:
+            self.pools[kind].put(self.prepare(driver, kind))
+        except Exception:
+            # Browser travado ou morto: troca por um novo
+            try:
+                driver.quit()
+            except Exception:
+                pass
+            self.pools[kind].put(self._new_browser(kind)[0])
+
+    def reclaim_orphans(self):
+        """Recupera browsers emprestados a processos do pytest que morreram."""
+        with self.lock:
+            orphans = [lease for lease, (_, _, pid) in self.leases.items() if not pid_alive(pid)]
+        for lease in orphans:
+            self.release(lease)
+
+    def status(self):
+        with self.lock:
+            leased = len(self.leases)
+        return {
+            "pid": os.getpid(),
+            "mock_url": self.mock_url,
+            "frontend_url": self.frontend_url,
+            "frontend_managed": self.frontend is not None,
+            "idle": {kind: pool.qsize() for kind, pool in self.pools.items()},
+            "leased": leased,
+        }
+
+    def handle(self, message):
+        op = message.get("op")
+        if op == "status":
+            return self.status()
+        if op == "acquire":
+            return self.acquire(message.get("kind", "fresh"), message.get("pid", 0))
+        if op == "release":
+            self.release(message["lease"])
+            return {"status": "ok"}
+        if op == "stop":
+            threading.Thread(target=self.server.shutdown, daemon=True).start()
+            return {"status": "ok"}
+        raise ValueError(f"Operação desconhecida: {op}")
+
+    def serve_forever(self):
+        daemon = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                try:
+                    response = daemon.handle(json.loads(self.rfile.readline()))
+                except Exception as e:
+                    response = {"error": f"{type(e).__name__}: {e}"}
+                self.wfile.write(json.dumps(response).encode() + b"\n")
+
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+        self.server = socketserver.ThreadingUnixStreamServer(str(self.path), Handler)
+        self.server.daemon_threads = True
+        try:
+            self.server.serve_forever(poll_interval=0.2)
+        finally:
+            self.server.server_close()
+            os.unlink(self.path)
+
+    def stop(self):
+        self.recycler.shutdown(wait=True)
+        with self.lock:
+            drivers = [driver for _, driver, _ in self.leases.values()]
+            self.leases.clear()
+        for pool in self.pools.values():
+            while not pool.empty():
+                drivers.append(pool.get_nowait())
+        for driver in drivers:
+            try:
+                driver.quit()
+            except Exception:
+                pass
+        if self.frontend is not None:
+            self.frontend.stop()
+        if self.mock is not None:
+            self.mock.stop()
+
+
+def pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
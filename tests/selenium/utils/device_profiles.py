@@ -0,0 +1,160 @@
+"""
+Perfis de dispositivo: CPU, rede e tela de aparelhos mais fracos.
+
+Cada perfil aplica, por CDP, na aba do driver:
+
+- ``Emulation.setCPUThrottlingRate`` (``cpu_rate`` vezes mais lento);
+- ``Network.emulateNetworkConditions`` (latência e banda, vale também
+  para o frontend e o mock locais);
+- ``Emulation.setDeviceMetricsOverride`` (+ toque nos celulares).
+
+``DeviceTimings`` mede os fluxos do teste (carga de rota pelo Navigation
+Timing e interações pelo relógio) e manda tudo para as user_properties;
+o ``plugins/device_profiles.py`` junta por perfil no final.
+
+Uso (fixtures ``device_profile``/``device_timings`` do conftest)::
+
+    @pytest.mark.device("desktop", "low_end_mobile")
+    def test_x(self, driver, device_timings):
+        login_page.navigate()
+        device_timings.route_load("login")
+        with device_timings.measure("login.entrar"):
+            ...
+"""
+
+import time
+from contextlib import contextmanager
+
+# Números de referência: Lighthouse (celular intermediário: 4x CPU,
+# 150 ms / 1,6 Mbps) e o "Slow 3G" do DevTools para o celular básico
+PROFILES = {
+    "desktop": {
+        "cpu_rate": 1,
+        "network": None,
+        # Tamanho da janela (WINDOW_WIDTH/HEIGHT), sem override
+        "viewport": None,
+    },
+    "low_end_laptop": {
+        "cpu_rate": 2,
+        "network": {"latency_ms": 40, "download_kbps": 10_000, "upload_kbps": 5_000},
+        "viewport": {"width": 1366, "height": 768, "scale": 1, "mobile": False},
+    },
+    "mid_tier_mobile": {
+        "cpu_rate": 4,
+        "network": {"latency_ms": 150, "download_kbps": 1_600, "upload_kbps": 750},
+        "viewport": {"width": 412, "height": 823, "scale": 1.75, "mobile": True},
+    },
+    "low_end_mobile": {
+        "cpu_rate": 6,
+        "network": {"latency_ms": 400, "download_kbps": 400, "upload_kbps": 400},
+        "viewport": {"width": 360, "height": 640, "scale": 2, "mobile": True},
+    },
+}
+
+# Navigation Timing da última carga completa da aba (ms desde o início da navegação)
+NAVIGATION_TIMING_SCRIPT = """
+const nav = performance.getEntriesByType('navigation')[0];
+if (!nav) { return null; }
+return {
+  ttfb: nav.responseStart,
+  dom_content_loaded: nav.domContentLoadedEventEnd,
+  load: nav.loadEventEnd,
+};
+"""
+
+
+def resolve_profile(profile):
+    """Aceita o nome de um perfil pronto ou o dict do perfil."""
+    if isinstance(profile, str):
+        if profile not in PROFILES:
+            raise ValueError(f"Perfil de dispositivo '{profile}' não existe (opções: {', '.join(PROFILES)})")
+        return PROFILES[profile]
+    return profile or {}
+
+
+def apply_profile(driver, profile):
+    profile = resolve_profile(profile)
+    driver.execute_cdp_cmd("Emulation.setCPUThrottlingRate", {"rate": profile.get("cpu_rate", 1)})
+
+    network = profile.get("network")
+    if network:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.emulateNetworkConditions", {
+            "offline": False,
+            "latency": network["latency_ms"],
+            # CDP quer bytes/s
+            "downloadThroughput": network["download_kbps"] * 1000 / 8,
+            "uploadThroughput": network["upload_kbps"] * 1000 / 8,
+        })
+
+    viewport = profile.get("viewport")
+    if viewport:
+        driver.execute_cdp_cmd("Emulation.setDeviceMetricsOverride", {
+            "width": viewport["width"],
+            "height": viewport["height"],
+            "deviceScaleFactor": viewport["scale"],
+            "mobile": viewport["mobile"],
+        })
+        driver.execute_cdp_cmd("Emulation.setTouchEmulationEnabled", {"enabled": viewport["mobile"]})
+
+
+def clear_profile(driver):
+    """Volta a aba ao normal (browser reaproveitado pelo próximo teste)."""
+    driver.execute_cdp_cmd("Emulation.setCPUThrottlingRate", {"rate": 1})
+    driver.execute_cdp_cmd("Network.emulateNetworkConditions", {
+        "offline": False, "latency": 0, "downloadThroughput": -1, "uploadThroughput": -1,
+    })
+    driver.execute_cdp_cmd("Emulation.clearDeviceMetricsOverride", {})
+    driver.execute_cdp_cmd("Emulation.setTouchEmulationEnabled", {"enabled": False})
+
+
+@contextmanager
+def emulated(driver, profile):
+    """Aplica o perfil (nome ou dict; None não faz nada) enquanto o bloco roda."""
+    if not profile:
+        yield driver
+        return
+    apply_profile(driver, profile)
+    try:
+        yield driver
+    finally:
+        try:
+            clear_profile(driver)
+        except Exception:
+            # Browser fechado ou travado: não há o que limpar
+            pass
+
+
+class DeviceTimings:
+    """Tempos dos fluxos de um teste, no perfil em que ele rodou."""
+
+    def __init__(self, driver, profile_name):
+        self.driver = driver
+        self.profile_name = profile_name
+        self.timings = {}
+
+    def record(self, flow, ms):
+        self.timings[flow] = round(ms, 1)
+
+    @contextmanager
+    def measure(self, flow):
+        """Tempo de parede do bloco (ex.: clique até o elemento aparecer)."""
+        start = time.perf_counter()
+        yield
+        self.record(flow, (time.perf_counter() - start) * 1000)
+
+    def route_load(self, flow):
+        """Navigation Timing da última carga completa: ``<flow>.ttfb``, ``.dom_content_loaded``, ``.load``."""
+        timing = self.driver.execute_script(NAVIGATION_TIMING_SCRIPT)
+        if not timing:
+            return None
+        for name, ms in timing.items():
+            # loadEventEnd fica 0 enquanto o load não termina
+            if ms:
+                self.record(f"{flow}.{name}", ms)
+        return timing
+
+    def user_properties(self):
+        return [("device_profile", self.profile_name)] + [
+            (f"device_timing:{flow}", ms) for flow, ms in self.timings.items()
+        ]
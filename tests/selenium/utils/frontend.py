@@ -0,0 +1,270 @@
+"""
+Frontend Next.js gerenciado pela suíte (``FRONTEND_MANAGED=true``).
+
+Em vez de depender de alguém ter rodado ``npm run dev`` (que compila cada
+rota no primeiro acesso), a suíte:
+
+1. gera o build de produção uma vez e guarda em ``.next-e2e/<hash>/``
+   na raiz do frontend. O hash cobre os fontes (``app/``,
+   ``components/``, ``services/``...) e o ``package-lock.json``. Se nada
+   mudou o build é reaproveitado;
+2. sobe ``next start`` numa porta livre apontando para o mock;
+3. aquece todas as rotas de ``app/`` (HTML e os chunks de JS/CSS) antes
+   do primeiro teste.
+
+O build não sabe a porta do mock: a API fica em ``/__e2e_api`` (a mesma
+origem do frontend) e o ``proxy.ts`` do frontend repassa para o
+``E2E_API_URL`` do ``next start``. Um build só serve todos os workers do
+xdist e todas as camadas do ``run_tiers.py``, cada um com seu mock.
+
+O diretório de saída é passado por ``NEXT_DIST_DIR``, sem sobrescrever
+o ``.next`` de desenvolvimento. Ele e o proxy só valem com
+``E2E_BUILD=1`` (ver ``next.config.ts``): um ``next build`` normal não
+muda.
+Quem está servindo um build segura um lock compartilhado nele; o
+``prune`` nunca apaga um build em uso.
+"""
+
+import fcntl
+import hashlib
+import os
+import re
+import shutil
+import signal
+import subprocess
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from urllib.parse import urljoin
+
+import requests
+
+from utils.net import find_free_port, wait_for_port
+
+# O que entra no hash do build (relativo à raiz do frontend)
+HASHED_PATHS = (
+    "app",
+    "components",
+    "services",
+    "context",
+    "hooks",
+    "lib",
+    "public",
+    "package-lock.json",
+    "next.config.ts",
+    "proxy.ts",
+    "tsconfig.json",
+    "postcss.config.mjs",
+)
+
+CACHE_DIRNAME = ".next-e2e"
+KEEP_BUILDS = 4
+
+BUILD_TIMEOUT = 600
+START_TIMEOUT = 60
+WARMUP_TIMEOUT = 60
+
+ASSET_PATTERN = re.compile(r'(?:src|href)="(/_next/static/[^"]+)"')
+
+
+# Caminho da API no build; o proxy.ts repassa para o E2E_API_URL do next start
+E2E_API_PREFIX = "/__e2e_api"
+
+# Variáveis do build (embutidas no bundle): iguais para qualquer porta do mock
+BUILD_ENV = {
+    "NEXT_PUBLIC_MAIN_API_BASE_URL": E2E_API_PREFIX,
+    "NEXT_PUBLIC_AUTH_API_BASE_URL": E2E_API_PREFIX,
+    "E2E_BUILD": "1",
+}
+
+
+def source_hash(root, env=None, paths=HASHED_PATHS):
+    """Hash dos fontes do frontend e das variáveis de build."""
+    root = Path(root)
+    digest = hashlib.sha256()
+    for rel in paths:
+        path = root / rel
+        if path.is_dir():
+            files = sorted(p for p in path.rglob("*") if p.is_file())
+        elif path.is_file():
+            files = [path]
+        else:
+            continue
+        for file in files:
+            digest.update(file.relative_to(root).as_posix().encode())
+            digest.update(b"\0")
+            digest.update(file.read_bytes())
+            digest.update(b"\0")
+    for key, value in sorted((env or {}).items()):
+        digest.update(f"{key}={value}\0".encode())
+    return digest.hexdigest()[:16]
+
+
+def discover_routes(app_dir):
+    """Rotas estáticas do App Router (cada ``page.tsx``), ex.: ``/dashboard``."""
+    routes = []
+    for page in sorted(Path(app_dir).rglob("page.[jt]s*")):
+        segments = page.parent.relative_to(app_dir).parts
+        # Rotas dinâmicas ([id]) não dá para aquecer sem um valor
+        if any(s.startswith("[") for s in segments):
+            continue
+        # Grupos "(nome)" não aparecem na URL
+        segments = [s for s in segments if not (s.startswith("(") and s.endswith(")"))]
+        routes.append("/" + "/".join(segments))
+    return routes
+
+
+class ManagedFrontend:
+    """Build em cache + ``next start`` numa porta livre."""
+
+    def __init__(self, root, api_url, port=0, log_path=None, keep_builds=KEEP_BUILDS):
+        self.root = Path(root)
+        self.env = dict(os.environ, **BUILD_ENV, NEXT_TELEMETRY_DISABLED="1")
+        self.api_url = api_url
+        self.key = source_hash(self.root, BUILD_ENV)
+        self.port = port
+        self.log_path = Path(log_path) if log_path else None
+        self.keep_builds = keep_builds
+        self.process = None
+        self.log_file = None
+        # Lock compartilhado no build enquanto ele é servido
+        self.in_use = None
+
+    @property
+    def cache_dir(self):
+        return self.root / CACHE_DIRNAME
+
+    @property
+    def dist_dir(self):
+        """Relativo à raiz, como o Next espera em ``distDir``."""
+        return f"{CACHE_DIRNAME}/{self.key}"
+
+    def _use_lock(self, key):
+        return open(self.cache_dir / f"{key}.lock", "a")
+
+    def _next_bin(self):
+        next_bin = self.root / "node_modules" / ".bin" / "next"
+        if not next_bin.exists():
+            raise RuntimeError(f"Dependências do frontend não instaladas: rode `npm ci` em {self.root}")
+        return str(next_bin)
+
+    def _output(self):
+        if self.log_path is None:
+            return subprocess.DEVNULL
+        if self.log_file is None:
+            self.log_path.parent.mkdir(parents=True, exist_ok=True)
+            self.log_file = open(self.log_path, "a", encoding="utf-8")
+        return self.log_file
+
+    def ensure_build(self):
+        """Gera o build se não houver um para esta chave. Retorna True se buildou."""
+        self.cache_dir.mkdir(exist_ok=True)
+        # O cache nunca vai para o git
+        ignore = self.cache_dir / ".gitignore"
+        if not ignore.exists():
+            ignore.write_text("*\n")
+
+        build_dir = self.root / self.dist_dir
+        # Lock: workers do xdist não buildam a mesma chave ao mesmo tempo
+        with open(self.cache_dir / ".lock", "w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            if self.in_use is None:
+                # Antes de soltar o lock geral: nenhum prune apaga o build daqui em diante
+                self.in_use = self._use_lock(self.key)
+                fcntl.flock(self.in_use, fcntl.LOCK_SH)
+            if (build_dir / "BUILD_ID").exists():
+                os.utime(build_dir)
+                return False
+
+            shutil.rmtree(build_dir, ignore_errors=True)
+            try:
+                returncode = subprocess.call(
+                    [self._next_bin(), "build"],
+                    cwd=self.root,
+                    env=dict(self.env, NEXT_DIST_DIR=self.dist_dir),
+                    stdout=self._output(),
+                    stderr=subprocess.STDOUT,
+                    timeout=BUILD_TIMEOUT,
+                )
+            except subprocess.TimeoutExpired:
+                returncode = "timeout"
+            if returncode != 0 or not (build_dir / "BUILD_ID").exists():
+                shutil.rmtree(build_dir, ignore_errors=True)
+                raise RuntimeError(f"next build falhou ({returncode}); veja {self.log_path or 'a saída do next'}")
+            self.prune()
+            return True
+
+    def prune(self):
+        """Mantém só os ``keep_builds`` builds usados mais recentemente (e os em uso)."""
+        builds = sorted(
+            (p for p in self.cache_dir.iterdir() if p.is_dir()),
+            key=lambda p: p.stat().st_mtime,
+            reverse=True,
+        )
+        for old in builds[self.keep_builds:]:
+            if old.name == self.key:
+                continue
+            with self._use_lock(old.name) as lock:
+                try:
+                    fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except BlockingIOError:
+                    # Outro next start ainda serve este build
+                    continue
+                shutil.rmtree(old, ignore_errors=True)
+                os.unlink(lock.name)
+
+    def start(self):
+        """Builda (se preciso), sobe o servidor e aquece as rotas. Retorna a URL."""
+        self.ensure_build()
+        self.port = self.port or find_free_port()
+        self.process = subprocess.Popen(
+            [self._next_bin(), "start", "-p", str(self.port)],
+            cwd=self.root,
+            env=dict(self.env, NEXT_DIST_DIR=self.dist_dir, E2E_API_URL=self.api_url),
+            stdout=self._output(),
+            stderr=subprocess.STDOUT,
+            # Grupo próprio: o stop() derruba o next e os filhos dele
+            start_new_session=True,
+        )
+        if not wait_for_port(self.port, timeout=START_TIMEOUT, alive=lambda: self.process.poll() is None):
+            self.stop()
+            raise RuntimeError(f"next start não respondeu na porta {self.port}")
+
+        url = f"http://localhost:{self.port}"
+        self.warm_up(url)
+        return url
+
+    def warm_up(self, url, routes=None):
+        """Primeiro acesso a cada rota e aos assets dela. Retorna {rota: segundos}."""
+        routes = routes or discover_routes(self.root / "app")
+        timings = {}
+
+        def fetch(path):
+            start = time.perf_counter()
+            response = session.get(urljoin(url, path), timeout=WARMUP_TIMEOUT)
+            return path, response, time.perf_counter() - start
+
+        with requests.Session() as session, ThreadPoolExecutor(max_workers=8) as pool:
+            assets = set()
+            for path, response, elapsed in pool.map(fetch, routes):
+                timings[path] = elapsed
+                assets.update(ASSET_PATTERN.findall(response.text))
+            list(pool.map(fetch, sorted(assets)))
+        return timings
+
+    def stop(self):
+        if self.process is not None and self.process.poll() is None:
+            try:
+                os.killpg(self.process.pid, signal.SIGTERM)
+                self.process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                os.killpg(self.process.pid, signal.SIGKILL)
+                self.process.wait()
+            except ProcessLookupError:
+                pass
+        if self.log_file is not None:
+            self.log_file.close()
+            self.log_file = None
+        if self.in_use is not None:
+            self.in_use.close()
+            self.in_use = None
@@ -0,0 +1,191 @@
+"""
+Conferência dos localizadores dos Page Objects sem browser.
+
+Junta todas as subclasses de ``BasePage``, pega os localizadores
+(atributos ``(By.X, "...")``) e confere cada um de dois jeitos:
+
+- **DOM**: o HTML de cada rota (``PATH`` da página) é buscado uma vez no
+  frontend, já renderizado no servidor pelo Next, e o localizador vira
+  XPath avaliado com lxml. Vale para o que aparece ao abrir a página.
+- **Código**: os textos do localizador (ids, names, trechos em
+  ``contains(...)``) precisam existir no código do frontend (``app/`` e
+  ``components/``). É o que sobra para páginas que só renderizam no
+  cliente (``SERVER_RENDERED = False``, ex.: dashboard, que depende do
+  login no localStorage) e para os ``ON_DEMAND_LOCATORS`` (mensagens e
+  modais que só aparecem depois de uma ação).
+
+lxml e cssselect são opcionais: sem eles só a conferência no código roda.
+"""
+
+import importlib
+import pkgutil
+import re
+import urllib.error
+import urllib.request
+
+from selenium.webdriver.common.by import By
+
+import pages
+from pages.base_page import BasePage
+
+FETCH_TIMEOUT = 5
+SOURCE_DIRS = ("app", "components")
+SOURCE_SUFFIXES = {".tsx", ".ts", ".jsx", ".js"}
+STRATEGIES = {value for name, value in vars(By).items() if name.isupper()}
+
+# Strings entre aspas dentro de XPath/CSS
+QUOTED = re.compile(r"""'([^']*)'|"([^"]*)\"""")
+
+
+def page_classes():
+    """Todas as subclasses de ``BasePage`` do pacote ``pages``."""
+    for module in pkgutil.iter_modules(pages.__path__):
+        importlib.import_module(f"pages.{module.name}")
+    found, pending = [], list(BasePage.__subclasses__())
+    while pending:
+        cls = pending.pop(0)
+        found.append(cls)
+        pending.extend(cls.__subclasses__())
+    return found
+
+
+def page_locators(cls):
+    """``{nome: (by, valor)}`` declarados na página (e nas mães)."""
+    locators = {}
+    for name in dir(cls):
+        value = getattr(cls, name, None)
+        if (isinstance(value, tuple) and len(value) == 2 and value[0] in STRATEGIES
+                and isinstance(value[1], str)):
+            locators[name] = value
+    return locators
+
+
+def to_xpath(by, value):
+    """XPath equivalente ao localizador do Selenium."""
+    if by == By.XPATH:
+        return value
+    if by == By.ID:
+        return f"//*[@id={xpath_literal(value)}]"
+    if by == By.NAME:
+        return f"//*[@name={xpath_literal(value)}]"
+    if by == By.TAG_NAME:
+        return f"//{value}"
+    if by == By.LINK_TEXT:
+        return f"//a[normalize-space(.)={xpath_literal(value)}]"
+    if by == By.PARTIAL_LINK_TEXT:
+        return f"//a[contains(., {xpath_literal(value)})]"
+    from cssselect import HTMLTranslator
+
+    css = f".{value}" if by == By.CLASS_NAME else value
+    return HTMLTranslator().css_to_xpath(css)
+
+
+def xpath_literal(text):
+    if "'" not in text:
+        return f"'{text}'"
+    if '"' not in text:
+        return f'"{text}"'
+    parts = "', \"'\", '".join(text.split("'"))
+    return f"concat('{parts}')"
+
+
+def literals(by, value):
+    """Textos do localizador que o código do frontend precisa conter."""
+    if by in (By.XPATH, By.CSS_SELECTOR):
+        found = [single or double for single, double in QUOTED.findall(value)]
+        return [text for text in found if text.strip()]
+    return [value]
+
+
+def load_sources(frontend_dir):
+    """Código do frontend concatenado (para busca de texto)."""
+    chunks = []
+    for directory in SOURCE_DIRS:
+        root = frontend_dir / directory
+        if not root.is_dir():
+            continue
+        for path in sorted(root.rglob("*")):
+            if path.suffix in SOURCE_SUFFIXES and path.is_file():
+                chunks.append(path.read_text(encoding="utf-8", errors="replace"))
+    return "\n".join(chunks)
+
+
+def fetch_html(url, timeout=FETCH_TIMEOUT):
+    """HTML da rota, ou None se o frontend não responder."""
+    try:
+        with urllib.request.urlopen(url, timeout=timeout) as response:
+            return response.read().decode("utf-8", errors="replace")
+    except (urllib.error.URLError, OSError):
+        return None
+
+
+class LocatorCheck:
+    """Confere os localizadores de todas as páginas; ``run()`` devolve os resultados.
+
+    Cada resultado é um dict com ``page``, ``name``, ``locator``, ``via``
+    (``"dom"`` ou ``"source"``) e ``ok``; ``detail`` explica a falha.
+    """
+
+    def __init__(self, frontend_dir, base_url=None):
+        self.frontend_dir = frontend_dir
+        self.base_url = base_url.rstrip("/") if base_url else None
+        self.sources = None
+        self.documents = {}
+
+    def document(self, path):
+        """Árvore lxml da rota (buscada uma vez), ou None sem servidor/lxml."""
+        if self.base_url is None or path is None:
+            return None
+        if path not in self.documents:
+            try:
+                import lxml.html
+            except ImportError:
+                self.documents[path] = None
+                return None
+            html = fetch_html(f"{self.base_url}{path}")
+            self.documents[path] = lxml.html.fromstring(html) if html else None
+        return self.documents[path]
+
+    def check_dom(self, tree, locator):
+        try:
+            xpath = to_xpath(*locator)
+        except ImportError:
+            return None
+        try:
+            return bool(tree.xpath(xpath)), None
+        except Exception as e:
+            return False, f"XPath inválido ({e})"
+
+    def check_source(self, locator):
+        if self.sources is None:
+            self.sources = load_sources(self.frontend_dir)
+        missing = [text for text in literals(*locator) if text not in self.sources]
+        if missing:
+            return False, f"texto fora do código do frontend: {', '.join(map(repr, missing))}"
+        return True, None
+
+    def run(self):
+        results = []
+        for cls in page_classes():
+            on_demand = set(cls.ON_DEMAND_LOCATORS)
+            tree = self.document(cls.PATH) if cls.SERVER_RENDERED else None
+            for name, locator in sorted(page_locators(cls).items()):
+                outcome = None
+                if tree is not None and name not in on_demand:
+                    outcome = self.check_dom(tree, locator)
+                    via = "dom"
+                    if outcome is not None and not outcome[0] and outcome[1] is None:
+                        outcome = (False, f"não encontrado em {cls.PATH}")
+                if outcome is None:
+                    outcome = self.check_source(locator)
+                    via = "source"
+                ok, detail = outcome
+                results.append({
+                    "page": cls.__name__,
+                    "name": name,
+                    "locator": locator,
+                    "via": via,
+                    "ok": ok,
+                    "detail": detail,
+                })
+        return results
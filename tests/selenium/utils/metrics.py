@@ -0,0 +1,23 @@
+"""
+Funções auxiliares para métricas de desempenho (latência, percentis).
+"""
+
+import math
+
+
+def percentile(values, p: float) -> float:
+    """
+    Percentil pelo método da posição mais próxima.
+
+    Args:
+        values: Amostras (não precisam estar ordenadas).
+        p (float): Percentil desejado (0-100).
+
+    Returns:
+        float: Valor do percentil, ou 0.0 sem amostras.
+    """
+    values = sorted(values)
+    if not values:
+        return 0.0
+    index = max(0, min(len(values) - 1, math.ceil(p / 100 * len(values)) - 1))
+    return values[index]
@@ -0,0 +1,31 @@
+"""Portas e espera por servidores locais (mock, frontend)."""
+
+import socket
+import time
+
+
+def find_free_port():
+    """Encontra uma porta livre."""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.bind(('', 0))
+        s.listen(1)
+        port = s.getsockname()[1]
+    return port
+
+
+def wait_for_port(port, host="localhost", timeout=5.0, alive=None):
+    """Espera a porta aceitar conexões. Retorna False se estourar o tempo.
+
+    ``alive`` (opcional) é chamado a cada tentativa; se retornar False
+    (ex.: o processo do servidor morreu) a espera termina na hora.
+    """
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection((host, port), timeout=0.2):
+                return True
+        except OSError:
+            if alive is not None and not alive():
+                return False
+            time.sleep(0.05)
+    return False
@@ -3,12 +3,17 @@ Módulo utilitário para geração de dados de teste usados nos testes Selenium.
 Local: tests/selenium/utils/test_data.py
 """
 
-from faker import Faker
 import random
 import string
 from datetime import datetime, timedelta
+from functools import lru_cache
 
-fake = Faker("pt_BR")
+
+@lru_cache(maxsize=1)
+def get_faker():
+    """Faker pt_BR, criado no primeiro uso (carregar o locale é caro)."""
+    from faker import Faker
+    return Faker("pt_BR")
 
 
 def generate_random_email() -> str:
@@ -27,7 +32,7 @@ def generate_random_user() -> dict:
         dict: {"name": str, "email": str, "password": str}
     """
     return {
-        "name": fake.name(),
+        "name": get_faker().name(),
         "email": generate_random_email(),
         "password": "senha123"
     }